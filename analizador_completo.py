@@ -8,9 +8,16 @@ Incluye análisis léxico, sintáctico y semántico
 
 import re
 import sys
+import time
+from contextlib import nullcontext, redirect_stdout
 from tabla_simbolos import TablaSimbolos
-from nodo_ast import (NodoAST, crear_nodo_operacion, crear_nodo_numero, 
-                      crear_nodo_identificador)
+from tabla_persistente import TablaSimbolosPersistente
+from estadisticas import Estadisticas
+from referencias import IndiceReferencias
+from diagnosticos import Diagnostico, ErrorSintactico, LimiteErroresAlcanzado
+from nodo_ast import (NodoAST, ConstructorDAG, LimitesConstantes, LIMITES_POR_DEFECTO,
+                      crear_nodo_operacion, crear_nodo_numero, crear_nodo_identificador,
+                      valor_asignado)
 
 class AnalizadorLexico:
     """Analizador léxico para tokenizar la entrada"""
@@ -19,6 +26,8 @@ class AnalizadorLexico:
         self.cadena = cadena
         self.pos = 0
         self.linea_actual = 1
+        self.inicio_linea = 0     # posición donde empieza la línea actual
+        self.errores = []         # [Diagnostico] caracteres no reconocidos
         
         # Definición de tokens
         self.tokens_pattern = [
@@ -43,33 +52,42 @@ class AnalizadorLexico:
     
     def siguiente_token(self):
         """Obtiene el siguiente token de la entrada"""
-        if self.pos >= len(self.cadena):
-            return None
-        
-        # Intentar emparejar cada patrón
-        for nombre, regex in self.regex_tokens:
-            match = regex.match(self.cadena, self.pos)
-            if match:
-                lexema = match.group(0)
-                self.pos = match.end()
-                
-                # Ignorar espacios
-                if nombre == 'ESPACIOS':
-                    return self.siguiente_token()
-                
-                # Incrementar contador de líneas
-                if nombre == 'NEWLINE':
-                    self.linea_actual += 1
-                    return self.siguiente_token()
-                
-                return {
-                    'tipo': nombre,
-                    'lexema': lexema,
-                    'linea': self.linea_actual
-                }
-        
-        # Carácter no reconocido
-        raise ValueError(f"Línea {self.linea_actual}: Carácter no reconocido '{self.cadena[self.pos]}'")
+        # Iterativo: los espacios y saltos de línea no consumen pila
+        while self.pos < len(self.cadena):
+            # Intentar emparejar cada patrón
+            for nombre, regex in self.regex_tokens:
+                match = regex.match(self.cadena, self.pos)
+                if match:
+                    break
+            else:
+                # Carácter no reconocido: registrarlo, saltarlo y continuar
+                self.errores.append(Diagnostico('L001', self.linea_actual,
+                                                self.pos - self.inicio_linea + 1,
+                                                (self.cadena[self.pos],)))
+                self.pos += 1
+                continue
+            
+            lexema = match.group(0)
+            self.pos = match.end()
+            
+            # Ignorar espacios
+            if nombre == 'ESPACIOS':
+                continue
+            
+            # Incrementar contador de líneas
+            if nombre == 'NEWLINE':
+                self.linea_actual += 1
+                self.inicio_linea = self.pos
+                continue
+            
+            return {
+                'tipo': nombre,
+                'lexema': lexema,
+                'linea': self.linea_actual,
+                'columna': match.start() - self.inicio_linea + 1
+            }
+        
+        return None
     
     def tokenizar(self):
         """Tokeniza toda la entrada"""
@@ -107,14 +125,54 @@ class GeneradorCodigo:
         self.codigo_generado = []
 
 
+class GeneradorCodigoMedido(GeneradorCodigo):
+    """Generador que acumula el tiempo dedicado a emitir código (modo --stats)"""
+    
+    def __init__(self):
+        super().__init__()
+        self.segundos = 0.0
+    
+    def nuevo_temporal(self):
+        inicio = time.perf_counter()
+        temporal = super().nuevo_temporal()
+        self.segundos += time.perf_counter() - inicio
+        return temporal
+    
+    def generar(self, instruccion):
+        inicio = time.perf_counter()
+        super().generar(instruccion)
+        self.segundos += time.perf_counter() - inicio
+
+
 class AnalizadorSintactico:
     """Analizador sintáctico con ETDS"""
     
-    def __init__(self, tokens):
+    def __init__(self, tokens, dag=False, max_errores=None, recuperar=True, persistente=False,
+                 limites=None, referencias=False):
         self.tokens = tokens
         self.pos = 0
-        self.tabla_simbolos = TablaSimbolos()
+        
+        # Tabla persistente: instantáneas O(1) con tabla_simbolos.instantanea()
+        if persistente:
+            self.tabla_simbolos = TablaSimbolosPersistente(max_errores)
+        else:
+            self.tabla_simbolos = TablaSimbolos(max_errores)
         self.generador = GeneradorCodigo()
+        
+        # Recuperación en modo pánico: sincronizar en PUNTOCOMA tras un error
+        self.recuperar = recuperar
+        
+        # Plegado de constantes acotado (LimitesConstantes); sus advertencias
+        # van a la tabla de símbolos
+        self.limites = limites or LIMITES_POR_DEFECTO
+        
+        # Modo DAG: subexpresiones idénticas comparten nodo y temporal
+        self.dag = ConstructorDAG(self.limites, self.reportar_advertencia) if dag else None
+        
+        # Índice de referencias cruzadas y cadenas definición-uso (o uno existente)
+        if referencias is True:
+            referencias = IndiceReferencias()
+        self.referencias = referencias or None
     
     def actual(self):
         """Retorna el token actual sin consumirlo"""
@@ -130,54 +188,99 @@ class AnalizadorSintactico:
             self.pos += 1
             return token
         
-        raise SyntaxError(f"Línea {token['linea']}: Se esperaba {tipo_esperado}, se encontró {token['tipo']}")
+        self.error_sintactico('S001', token, tipo_esperado, token['tipo'])
+    
+    def error_sintactico(self, codigo, token, *args):
+        """Lanza un error sintáctico con su diagnóstico"""
+        linea = token['linea'] if token else 0
+        columna = token.get('columna', 0) if token else 0
+        raise ErrorSintactico(Diagnostico(codigo, linea, columna, args))
+    
+    def reportar_advertencia(self, codigo, linea, *args):
+        """Registra una advertencia del análisis en la tabla de símbolos"""
+        self.tabla_simbolos.reportar_advertencia(codigo, linea, *args)
+    
+    def sincronizar(self, pos_inicio):
+        """Modo pánico: descarta tokens hasta después del siguiente PUNTOCOMA"""
+        # Garantizar avance aunque el error ocurra en el primer token
+        if self.pos == pos_inicio:
+            self.pos += 1
+            if self.tokens[pos_inicio]['tipo'] == 'PUNTOCOMA':
+                return
+        
+        while self.actual():
+            token = self.consumir()
+            if token['tipo'] == 'PUNTOCOMA':
+                return
     
     def parsear(self):
         """Punto de entrada del analizador - S"""
         nodos = []
         
-        while self.actual():
-            token = self.actual()
-            
-            # Declaración: tipo id ;
-            if token['tipo'] == 'TIPO':
-                nodo = self.parsear_declaracion()
-                if nodo:
-                    nodos.append(nodo)
-            
-            # Asignación o expresión: id = E ; o E
-            elif token['tipo'] in ['ID', 'NUM', 'PARI']:
-                nodo = self.parsear_asignacion_o_expresion()
+        try:
+            while self.actual():
+                pos_inicio = self.pos
+                try:
+                    nodo = self.parsear_sentencia()
+                except ErrorSintactico as e:
+                    if not self.recuperar:
+                        raise
+                    self.tabla_simbolos.reportar_error(
+                        e.diagnostico.codigo, e.diagnostico.linea, *e.diagnostico.args,
+                        columna=e.diagnostico.columna
+                    )
+                    self.sincronizar(pos_inicio)
+                    continue
+                
                 if nodo:
                     nodos.append(nodo)
-            
-            else:
-                raise SyntaxError(f"Línea {token['linea']}: Token inesperado {token['tipo']}")
+        except LimiteErroresAlcanzado:
+            # Se alcanzó el máximo de errores: detener el análisis
+            pass
         
         # Crear nodo raíz del programa
         return NodoAST("Programa", hijos=nodos, tipo='void')
     
+    def parsear_sentencia(self):
+        """Sentencia: declaración, asignación o expresión"""
+        token = self.actual()
+        
+        # Declaración: tipo id ;
+        if token['tipo'] == 'TIPO':
+            return self.parsear_declaracion()
+        
+        # Asignación o expresión: id = E ; o E
+        if token['tipo'] in ['ID', 'NUM', 'PARI']:
+            return self.parsear_asignacion_o_expresion()
+        
+        self.error_sintactico('S002', token, token['tipo'])
+    
     def parsear_declaracion(self):
         """D → tipo id ;"""
         token_tipo = self.consumir('TIPO')
-        tipo = token_tipo['lexema']
-        linea = token_tipo['linea']
         
         token_id = self.consumir('ID')
         if not token_id:
-            raise SyntaxError(f"Línea {linea}: Se esperaba un identificador después del tipo")
-        
-        nombre = token_id['lexema']
+            self.error_sintactico('S004', token_tipo)
         
         self.consumir('PUNTOCOMA')
         
+        return self.accion_declaracion(token_tipo, token_id)
+    
+    def accion_declaracion(self, token_tipo, token_id):
+        """Acción semántica de D → tipo id ;"""
+        tipo = token_tipo['lexema']
+        linea = token_tipo['linea']
+        nombre = token_id['lexema']
+        
         # Acción semántica: insertar en tabla de símbolos
-        self.tabla_simbolos.insertar(nombre, tipo, linea)
+        columna = token_id.get('columna', 0)
+        insertado = self.tabla_simbolos.insertar(nombre, tipo, linea, columna=columna)
         
         # Generar código intermedio
         self.generador.generar(f"declare {nombre} : {tipo}")
         
-        return NodoAST(
+        nodo = NodoAST(
             "Declaracion",
             hijos=[
                 NodoAST(tipo, tipo='tipo'),
@@ -186,6 +289,10 @@ class AnalizadorSintactico:
             tipo='void',
             linea=linea
         )
+        # Una redeclaración rechazada no crea una definición nueva
+        if self.referencias is not None and insertado:
+            self.referencias.declarar(nombre, tipo, linea, columna, nodo)
+        return nodo
     
     def parsear_asignacion_o_expresion(self):
         """Detecta si es asignación (id = E ;) o solo expresión (E)"""
@@ -195,46 +302,19 @@ class AnalizadorSintactico:
         # Intentar parsear como asignación
         token = self.actual()
         if token and token['tipo'] == 'ID':
-            nombre = token['lexema']
-            linea = token['linea']
             self.consumir('ID')
             
             # Si viene '=', es asignación
             if self.actual() and self.actual()['tipo'] == 'IGUAL':
                 self.consumir('IGUAL')
-                
-                # Validar que la variable esté declarada
-                if not self.tabla_simbolos.validar_declaracion(nombre, linea):
-                    # Continuar parseando pero marcar error
-                    pass
+                self.accion_destino(token)
                 
                 # Parsear la expresión
                 nodo_expr = self.parsear_E()
                 
                 self.consumir('PUNTOCOMA')
                 
-                # Actualizar valor en tabla de símbolos
-                if nodo_expr.val is not None:
-                    self.tabla_simbolos.actualizar_valor(nombre, nodo_expr.val)
-                
-                # Generar código intermedio
-                if nodo_expr.lugar:
-                    self.generador.generar(f"{nombre} = {nodo_expr.lugar}")
-                elif nodo_expr.val is not None:
-                    self.generador.generar(f"{nombre} = {nodo_expr.val}")
-                
-                tipo_var = self.tabla_simbolos.obtener_tipo(nombre)
-                
-                return NodoAST(
-                    "Asignacion",
-                    hijos=[
-                        crear_nodo_identificador(nombre, tipo_var, linea=linea),
-                        nodo_expr
-                    ],
-                    tipo=tipo_var,
-                    val=nodo_expr.val,
-                    linea=linea
-                )
+                return self.accion_asignacion(token, nodo_expr)
         
         # Si no es asignación, retroceder y parsear como expresión
         self.pos = pos_guardada
@@ -246,29 +326,54 @@ class AnalizadorSintactico:
         
         return nodo_expr
     
+    def accion_destino(self, token):
+        """Valida la variable destino de una asignación antes de su expresión"""
+        # Continuar parseando aunque no esté declarada: el error queda registrado
+        self.tabla_simbolos.validar_declaracion(token['lexema'], token['linea'], token.get('columna', 0))
+    
+    def accion_asignacion(self, token, nodo_expr):
+        """Acción semántica de id = E ;"""
+        nombre = token['lexema']
+        linea = token['linea']
+        
+        # Actualizar valor en tabla de símbolos (None si deja de ser constante),
+        # convertido al tipo declarado como en la máquina virtual
+        tipo_var = self.tabla_simbolos.obtener_tipo(nombre)
+        valor = valor_asignado(nodo_expr.val, tipo_var)
+        self.tabla_simbolos.actualizar_valor(nombre, valor)
+        if self.dag:
+            self.dag.nueva_version(nombre)
+        
+        # Generar código intermedio
+        if nodo_expr.lugar:
+            self.generador.generar(f"{nombre} = {nodo_expr.lugar}")
+        elif nodo_expr.val is not None:
+            self.generador.generar(f"{nombre} = {nodo_expr.val}")
+        else:
+            self.generador.generar(f"{nombre} = {nodo_expr.etiqueta}")
+        
+        nodo = NodoAST(
+            "Asignacion",
+            hijos=[
+                crear_nodo_identificador(nombre, tipo_var, linea=linea),
+                nodo_expr
+            ],
+            tipo=tipo_var,
+            val=valor,
+            linea=linea
+        )
+        if self.referencias is not None:
+            self.referencias.asignar(nombre, linea, token.get('columna', 0), nodo)
+        return nodo
+    
     def parsear_E(self):
         """E → E + T | E - T | T"""
         nodo = self.parsear_T()
         
         while self.actual() and self.actual()['tipo'] in ['MAS', 'MENOS']:
             token_op = self.consumir()
-            operador = token_op['lexema']
-            linea = token_op['linea']
-            
             nodo_derecho = self.parsear_T()
-            
-            # Crear nodo de operación con atributos calculados
-            nodo_nuevo = crear_nodo_operacion(operador, nodo, nodo_derecho, linea)
-            
-            # Generar código intermedio
-            temp = self.generador.nuevo_temporal()
-            izq_lugar = nodo.lugar if nodo.lugar else nodo.val if nodo.val is not None else nodo.etiqueta
-            der_lugar = nodo_derecho.lugar if nodo_derecho.lugar else nodo_derecho.val if nodo_derecho.val is not None else nodo_derecho.etiqueta
-            
-            self.generador.generar(f"{temp} = {izq_lugar} {operador} {der_lugar}")
-            nodo_nuevo.lugar = temp
-            
-            nodo = nodo_nuevo
+            nodo = self.accion_operacion(token_op, nodo, nodo_derecho)
         
         return nodo
     
@@ -278,40 +383,58 @@ class AnalizadorSintactico:
         
         while self.actual() and self.actual()['tipo'] in ['MUL', 'DIV']:
             token_op = self.consumir()
-            operador = token_op['lexema']
-            linea = token_op['linea']
-            
             nodo_derecho = self.parsear_F()
-            
-            # Verificar división por cero
-            if operador == '/' and nodo_derecho.val == 0:
-                self.tabla_simbolos.errores.append(
-                    f"Línea {linea}: Error semántico - División por cero"
-                )
-            
-            # Crear nodo de operación
-            nodo_nuevo = crear_nodo_operacion(operador, nodo, nodo_derecho, linea)
-            
-            # Generar código intermedio
-            temp = self.generador.nuevo_temporal()
-            izq_lugar = nodo.lugar if nodo.lugar else nodo.val if nodo.val is not None else nodo.etiqueta
-            der_lugar = nodo_derecho.lugar if nodo_derecho.lugar else nodo_derecho.val if nodo_derecho.val is not None else nodo_derecho.etiqueta
-            
-            self.generador.generar(f"{temp} = {izq_lugar} {operador} {der_lugar}")
-            nodo_nuevo.lugar = temp
-            
-            nodo = nodo_nuevo
+            nodo = self.accion_operacion(token_op, nodo, nodo_derecho)
         
         return nodo
     
+    def accion_operacion(self, token_op, nodo, nodo_derecho):
+        """Acción semántica de E op T y T op F"""
+        operador = token_op['lexema']
+        linea = token_op['linea']
+        
+        # Verificar división por cero
+        if operador == '/' and nodo_derecho.val == 0:
+            self.tabla_simbolos.reportar_error(
+                'E003', linea, columna=token_op.get('columna', 0)
+            )
+        
+        return self.crear_operacion(operador, nodo, nodo_derecho, linea)
+    
+    def crear_operacion(self, operador, nodo, nodo_derecho, linea):
+        """Crea el nodo de una operación binaria y genera su código intermedio"""
+        # En modo DAG, una subexpresión ya calculada reutiliza nodo y temporal
+        if self.dag:
+            nodo_nuevo = self.dag.operacion(operador, nodo, nodo_derecho, linea)
+            if nodo_nuevo.lugar:
+                return nodo_nuevo
+        else:
+            # Crear nodo de operación con atributos calculados
+            nodo_nuevo = crear_nodo_operacion(operador, nodo, nodo_derecho, linea,
+                                              self.limites, self.reportar_advertencia)
+        
+        # Generar código intermedio
+        temp = self.generador.nuevo_temporal()
+        if nodo_nuevo.obtener_atributo('acotado'):
+            # Valor envuelto o saturado: el temporal recibe el valor acotado, el
+            # mismo que se sustituye después, en lugar del resultado exacto
+            self.generador.generar(f"{temp} = {nodo_nuevo.val}")
+            nodo_nuevo.lugar = temp
+            return nodo_nuevo
+        izq_lugar = nodo.lugar if nodo.lugar else nodo.val if nodo.val is not None else nodo.etiqueta
+        der_lugar = nodo_derecho.lugar if nodo_derecho.lugar else nodo_derecho.val if nodo_derecho.val is not None else nodo_derecho.etiqueta
+        
+        self.generador.generar(f"{temp} = {izq_lugar} {operador} {der_lugar}")
+        nodo_nuevo.lugar = temp
+        
+        return nodo_nuevo
+    
     def parsear_F(self):
         """F → ( E ) | num | id"""
         token = self.actual()
         
         if not token:
-            raise SyntaxError("Fin inesperado de entrada")
-        
-        linea = token['linea']
+            self.error_sintactico('S003', self.tokens[-1] if self.tokens else None)
         
         # ( E )
         if token['tipo'] == 'PARI':
@@ -323,38 +446,160 @@ class AnalizadorSintactico:
         # num
         if token['tipo'] == 'NUM':
             self.consumir('NUM')
-            return crear_nodo_numero(token['lexema'], linea)
+            return self.accion_numero(token)
         
         # id
         if token['tipo'] == 'ID':
-            nombre = token['lexema']
             self.consumir('ID')
-            
-            # Validar que esté declarada
-            if not self.tabla_simbolos.validar_declaracion(nombre, linea):
-                # Retornar nodo con tipo desconocido
-                return NodoAST(nombre, tipo=None, linea=linea)
-            
+            return self.accion_identificador(token)
+        
+        self.error_sintactico('S002', token, token['tipo'])
+    
+    def accion_numero(self, token):
+        """Acción semántica de F → num"""
+        if self.dag:
+            return self.dag.numero(token['lexema'], token['linea'])
+        return crear_nodo_numero(token['lexema'], token['linea'],
+                                 self.limites, self.reportar_advertencia)
+    
+    def accion_identificador(self, token):
+        """Acción semántica de F → id"""
+        nombre = token['lexema']
+        linea = token['linea']
+        
+        # Validar que esté declarada
+        if not self.tabla_simbolos.validar_declaracion(nombre, linea, token.get('columna', 0)):
+            # Retornar nodo con tipo desconocido
+            nodo = NodoAST(nombre, tipo=None, linea=linea)
+        else:
             tipo_var = self.tabla_simbolos.obtener_tipo(nombre)
             valor = self.tabla_simbolos.obtener_valor(nombre)
             
-            return crear_nodo_identificador(nombre, tipo_var, valor, linea)
+            if self.dag:
+                nodo = self.dag.identificador(nombre, tipo_var, valor, linea)
+            else:
+                nodo = crear_nodo_identificador(nombre, tipo_var, valor, linea)
         
-        raise SyntaxError(f"Línea {linea}: Token inesperado {token['tipo']}")
+        if self.referencias is not None:
+            self.referencias.leer(nombre, linea, token.get('columna', 0), nodo)
+        return nodo
+
+
+def reportar_errores_lexicos(sintactico, errores):
+    """
+    Registra en la tabla de símbolos del analizador los errores del léxico. Si
+    alcanzan el máximo de errores, el analizador se queda sin tokens que analizar.
+    """
+    tabla = sintactico.tabla_simbolos
+    try:
+        for error in errores:
+            tabla.reportar_error(error.codigo, error.linea, *error.args, columna=error.columna)
+    except LimiteErroresAlcanzado:
+        sintactico.tokens = []
+
+
+def analizar(entrada, dag=False, max_errores=None, estadisticas=None, persistente=False,
+             lr=False, limites=None, referencias=False, perezoso=False):
+    """
+    Ejecuta el análisis léxico, sintáctico/semántico y la generación de código.
+    
+    Retorna (sintactico, ast, codigo). Si se pasa un objeto Estadisticas, se
+    registran el tiempo y la memoria pico de cada fase y los contadores.
+    Con lr=True se usa el analizador LALR(1) dirigido por tabla.
+    limites (LimitesConstantes) acota el plegado de constantes. Con referencias=True
+    se construye el índice de referencias cruzadas (sintactico.referencias).
+    Con perezoso=True los atributos tipo, val y lugar se evalúan al consultarlos
+    (analizador_perezoso): codigo es None hasta llamar a sintactico.completar().
+    Los caracteres no reconocidos se reportan (L001) antes que los demás errores.
+    """
+    clase = AnalizadorSintactico
+    if perezoso:
+        # Importaciones diferidas: ambos módulos dependen de este
+        from analizador_perezoso import AnalizadorPerezoso, AnalizadorPerezosoLR
+        clase = AnalizadorPerezosoLR if lr else AnalizadorPerezoso
+    elif lr:
+        from analizador_lr import AnalizadorSintacticoLR as clase
+    
+    if estadisticas is None:
+        lexico = AnalizadorLexico(entrada)
+        tokens = lexico.tokenizar()
+        sintactico = clase(tokens, dag=dag, max_errores=max_errores,
+                           persistente=persistente, limites=limites,
+                           referencias=referencias)
+        reportar_errores_lexicos(sintactico, lexico.errores)
+        ast = sintactico.parsear()
+        return sintactico, ast, None if perezoso else sintactico.generador.obtener_codigo()
+    
+    with estadisticas.fase('lexico'):
+        lexico = AnalizadorLexico(entrada)
+        tokens = lexico.tokenizar()
+    
+    sintactico = clase(tokens, dag=dag, max_errores=max_errores,
+                       persistente=persistente, limites=limites,
+                       referencias=referencias)
+    reportar_errores_lexicos(sintactico, lexico.errores)
+    sintactico.generador = GeneradorCodigoMedido()
+    with estadisticas.fase('sintactico_semantico'):
+        ast = sintactico.parsear()
+    
+    # La emisión de código ocurre durante el parseo: se traslada a su propia fase
+    emision = sintactico.generador.segundos
+    estadisticas.agregar_tiempo('sintactico_semantico', -emision)
+    estadisticas.agregar_tiempo('generacion_codigo', emision)
+    with estadisticas.fase('generacion_codigo'):
+        codigo = None if perezoso else sintactico.generador.obtener_codigo()
+    
+    registrar_contadores(estadisticas, sintactico)
+    return sintactico, ast, codigo
+
+
+def registrar_contadores(estadisticas, sintactico):
+    """Copia los contadores del análisis en las estadísticas"""
+    tabla = sintactico.tabla_simbolos
+    generador = sintactico.generador
+    estadisticas.contadores.update({
+        'tokens': len(sintactico.tokens),
+        'busquedas_tabla': tabla.busquedas,
+        'fallos_busqueda_tabla': tabla.fallos_busqueda,
+        'entradas_alcance': tabla.entradas_alcance,
+        'salidas_alcance': tabla.salidas_alcance,
+        'temporales': generador.contador_temporal,
+        'instrucciones': len(generador.codigo_generado),
+    })
 
 
 def main():
     """Función principal"""
+    # Opciones (--dag, --persistente, --lr, --max-errores=N, --bits=N,
+    # --desborde=envolver|saturar|abandonar, --referencias, --perezoso, --stats[=json]) y
+    # argumentos posicionales
+    opciones = {}
+    for argumento in sys.argv[1:]:
+        if argumento.startswith('--'):
+            nombre, _, valor = argumento[2:].partition('=')
+            opciones[nombre] = valor
+    argumentos = [a for a in sys.argv if not a.startswith('--')]
+    
+    if opciones.get('stats') != 'json':
+        return ejecutar(opciones, argumentos)
+    # Con --stats=json la salida estándar lleva solo el JSON; el reporte va a stderr
+    salida_json = sys.stdout
+    with redirect_stdout(sys.stderr):
+        return ejecutar(opciones, argumentos, salida_json)
+
+
+def ejecutar(opciones, argumentos, salida_json=None):
+    """Analiza la entrada indicada en los argumentos e imprime el reporte"""
     print("="*80)
     print(" ANALIZADOR CON ETDS - EXPRESIONES ARITMÉTICAS ".center(80, "="))
     print("="*80)
     
     # Leer entrada
-    if len(sys.argv) > 2:
+    if len(argumentos) > 2:
         # Leer desde archivo
-        with open(sys.argv[2], 'r', encoding='utf-8') as f:
+        with open(argumentos[2], 'r', encoding='utf-8') as f:
             entrada = f.read()
-        print(f"\n📄 Archivo: {sys.argv[2]}")
+        print(f"\n📄 Archivo: {argumentos[2]}")
     else:
         # Leer desde consola
         print("\nIngrese el código (termine con una línea vacía):")
@@ -374,49 +619,69 @@ def main():
     print(entrada)
     print("-"*80)
     
+    estadisticas = Estadisticas() if 'stats' in opciones else None
+    
     try:
-        # Análisis léxico
-        lexico = AnalizadorLexico(entrada)
-        tokens = lexico.tokenizar()
-        
-        print(f"\n🔤 Tokens generados: {len(tokens)}")
-        
-        # Análisis sintáctico y semántico
-        sintactico = AnalizadorSintactico(tokens)
-        ast = sintactico.parsear()
-        
-        # Verificar errores semánticos
+        # Análisis léxico, sintáctico, semántico y generación de código
+        max_errores = int(opciones['max-errores']) if opciones.get('max-errores') else None
+        limites = None
+        if 'bits' in opciones or 'desborde' in opciones:
+            limites = LimitesConstantes(
+                int(opciones['bits']) if opciones.get('bits') else LIMITES_POR_DEFECTO.bits,
+                opciones.get('desborde') or LIMITES_POR_DEFECTO.politica
+            )
+        sintactico, ast, codigo = analizar(entrada, dag='dag' in opciones,
+                                           max_errores=max_errores,
+                                           estadisticas=estadisticas,
+                                           persistente='persistente' in opciones,
+                                           lr='lr' in opciones,
+                                           limites=limites,
+                                           referencias='referencias' in opciones,
+                                           perezoso='perezoso' in opciones)
+        if codigo is None:
+            # Modo perezoso: evaluar los atributos que se van a mostrar
+            with estadisticas.fase('atributos') if estadisticas else nullcontext():
+                codigo = sintactico.completar()
+        
+        print(f"\n🔤 Tokens generados: {len(sintactico.tokens)}")
+        
+        renderizado = estadisticas.fase('renderizado') if estadisticas else nullcontext()
+        
+        # Verificar errores sintácticos y semánticos
         if sintactico.tabla_simbolos.tiene_errores():
-            print("\n❌ ANÁLISIS FALLIDO - Errores semánticos encontrados")
-            sintactico.tabla_simbolos.imprimir_errores()
+            print("\n❌ ANÁLISIS FALLIDO - Errores encontrados")
+            with renderizado:
+                sintactico.tabla_simbolos.imprimir_errores()
         else:
             print("\n✅ ANÁLISIS EXITOSO")
             
-            # Mostrar tabla de símbolos
-            sintactico.tabla_simbolos.imprimir()
-            
-            # Mostrar AST decorado
-            print("\n" + "="*80)
-            print(" AST DECORADO ".center(80, "="))
-            print("="*80)
-            ast.imprimir_decorado()
-            print("="*80)
-            
-            # Mostrar código intermedio
-            print("\n" + "="*80)
-            print(" CÓDIGO INTERMEDIO (3 DIRECCIONES) ".center(80, "="))
-            print("="*80)
-            codigo = sintactico.generador.obtener_codigo()
-            if codigo:
-                print(codigo)
-            else:
-                print("(sin código generado)")
-            print("="*80)
-            
-            # Mostrar estadísticas del AST
-            print(f"\n📊 Estadísticas del AST:")
-            print(f"   - Nodos totales: {ast.contar_nodos()}")
-            print(f"   - Profundidad máxima: {ast.calcular_profundidad()}")
+            with renderizado:
+                # Mostrar tabla de símbolos
+                sintactico.tabla_simbolos.imprimir()
+                if sintactico.referencias:
+                    sintactico.referencias.imprimir()
+                
+                # Mostrar AST decorado
+                print("\n" + "="*80)
+                print(" AST DECORADO ".center(80, "="))
+                print("="*80)
+                ast.imprimir_decorado()
+                print("="*80)
+                
+                # Mostrar código intermedio
+                print("\n" + "="*80)
+                print(" CÓDIGO INTERMEDIO (3 DIRECCIONES) ".center(80, "="))
+                print("="*80)
+                if codigo:
+                    print(codigo)
+                else:
+                    print("(sin código generado)")
+                print("="*80)
+                
+                # Mostrar estadísticas del AST
+                print(f"\n📊 Estadísticas del AST:")
+                print(f"   - Nodos totales: {ast.contar_nodos()}")
+                print(f"   - Profundidad máxima: {ast.calcular_profundidad()}")
         
         # Mostrar advertencias
         sintactico.tabla_simbolos.salir_alcance()  # Para detectar variables no usadas
@@ -426,6 +691,15 @@ def main():
         print(f"\n❌ ERROR: {e}")
         return 1
     
+    # Reporte de estadísticas (--stats o --stats=json)
+    if estadisticas:
+        estadisticas.finalizar()
+        registrar_contadores(estadisticas, sintactico)
+        if salida_json:
+            print(estadisticas.a_json(), file=salida_json)
+        else:
+            estadisticas.imprimir()
+    
     print("\n" + "="*80)
     return 0
 
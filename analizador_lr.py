@@ -0,0 +1,361 @@
+#!/usr/bin/env python3
+# analizador_lr.py
+"""
+Analizador sintáctico LALR(1) dirigido por tabla
+
+Usa la tabla de calculador_conjuntos.construir_lalr sobre la gramática tal como
+está escrita (con recursión izquierda) y una pila explícita: sin límite de
+recursión y trabajo constante por token. Las reducciones llaman a las mismas
+acciones semánticas que AnalizadorSintactico, así que el AST, la tabla de
+símbolos y el código intermedio son idénticos.
+"""
+
+import os
+import sys
+from collections import deque
+
+from calculador_conjuntos import leer_gramatica, construir_lalr
+from analizador_completo import (AnalizadorLexico, AnalizadorSintactico,
+                                 reportar_errores_lexicos)
+from diagnosticos import ErrorSintactico, LimiteErroresAlcanzado
+from nodo_ast import NodoAST
+
+# Gramática del lenguaje completo (P -> P L | ε ...)
+GRAMATICA_LR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'gramatica_lr.txt')
+
+# Terminales de la gramática que no coinciden con el lexema del token
+_TERMINALES = {'ID': 'id', 'NUM': 'num'}
+
+# Tipo de token de cada terminal, para los mensajes "Se esperaba ..."
+_TIPOS = {
+    'id': 'ID', 'num': 'NUM', 'int': 'TIPO', 'float': 'TIPO',
+    '+': 'MAS', '-': 'MENOS', '*': 'MUL', '/': 'DIV',
+    '(': 'PARI', ')': 'PARD', ';': 'PUNTOCOMA', '=': 'IGUAL',
+}
+
+# Tablas ya construidas y descripciones de sus producciones, por ruta de la gramática
+_tablas = {}
+_descripciones = {}
+
+
+def cargar_tabla(ruta=GRAMATICA_LR):
+    """Construye (una sola vez por archivo) la tabla LALR(1) de una gramática"""
+    if ruta not in _tablas:
+        gramatica, inicial = leer_gramatica(ruta)
+        tabla = construir_lalr(gramatica, inicial)
+        if not tabla.es_lalr1():
+            raise ValueError(f"La gramática '{ruta}' no es LALR(1): "
+                             f"{len(tabla.conflictos)} conflictos")
+        _tablas[ruta] = tabla
+        _descripciones[ruta] = [tabla.describir(p) for p in range(len(tabla.producciones))]
+    return _tablas[ruta]
+
+
+def terminal_de(token):
+    """Símbolo terminal de la gramática para un token ('$' al final)"""
+    if token is None:
+        return '$'
+    return _TERMINALES.get(token['tipo']) or token['lexema']
+
+
+def _propagar(valor):
+    """Acción de las producciones unitarias sin acción propia"""
+    return valor
+
+
+class AnalizadorSintacticoLR(AnalizadorSintactico):
+    """Analizador desplazamiento-reducción con pila explícita"""
+
+    def __init__(self, tokens, gramatica=GRAMATICA_LR, **opciones):
+        super().__init__(tokens, **opciones)
+        self.tabla = cargar_tabla(gramatica)
+
+        # Acciones de reducción por producción; reciben los valores de la
+        # derecha como argumentos posicionales (sin una lista por reducción)
+        operacion = lambda izq, op, der: self.accion_operacion(op, izq, der)
+        declaracion = lambda tipo, nombre, _: self.accion_declaracion(tipo, nombre)
+        acciones = {
+            # gramatica_lr.txt
+            'P -> P L': self.reducir_lista,
+            'P -> ε': lambda: [],
+            'L -> E ;': lambda expresion, _: expresion,
+            'D -> int id ;': declaracion,
+            'D -> float id ;': declaracion,
+            'A -> I E ;': lambda destino, expresion, _: self.accion_asignacion(destino, expresion),
+            'I -> id =': self.reducir_destino,
+            'E -> E + T': operacion,
+            'E -> E - T': operacion,
+            'T -> T * F': operacion,
+            'T -> T / F': operacion,
+            'F -> ( E )': lambda _, expresion, __: expresion,
+            'F -> num': self.accion_numero,
+            'F -> id': self.accion_identificador,
+            # gramatica.txt
+            # S es recursiva por la derecha: las sentencias llegan de la última a
+            # la primera, y appendleft agrega cada una en O(1)
+            'S -> D S': lambda sentencia, resto: resto.appendleft(sentencia) or resto,
+            'S -> E': lambda expresion: deque([expresion]),
+        }
+
+        # Indexadas por número de producción; las unitarias sin acción propagan el valor
+        self.reducciones = []
+        for descripcion, (nt, derecha) in zip(_descripciones[gramatica], self.tabla.producciones):
+            accion = acciones.get(descripcion)
+            if accion is None:
+                if len(derecha) != 1:
+                    raise ValueError(f"Producción sin acción de reducción: {descripcion}")
+                accion = _propagar
+            self.reducciones.append(accion)
+
+    def reducir_lista(self, programa, sentencia):
+        """P → P L: agrega la sentencia al programa"""
+        programa.append(sentencia)
+        return programa
+
+    def reducir_destino(self, token, _):
+        """I → id =: valida el destino antes de analizar la expresión"""
+        self.accion_destino(token)
+        return token
+
+    def reduccion_por_defecto(self, estado):
+        """
+        Producción que el estado reduce con cualquier lookahead válido (None si
+        hay varias o ninguna). Al aplicarla ante un error, como las reducciones
+        por defecto de yacc, se completa lo que el analizador recursivo ya había
+        construido al detectarlo: el destino de 'x = ;' se valida (E001) y la
+        sentencia anterior a un token inesperado no se pierde.
+        """
+        reducciones = {argumento for tipo, argumento in self.tabla.acciones[estado].values()
+                       if tipo == 'r'}
+        return reducciones.pop() if len(reducciones) == 1 else None
+
+    def terminal_implicito(self, estado):
+        """
+        Al final de la entrada ')' y ';' son opcionales, como en el analizador
+        recursivo: retorna el que el estado puede desplazar (None si ninguno)
+        """
+        for terminal in (')', ';'):
+            accion = self.tabla.acciones[estado].get(terminal)
+            if accion is not None:
+                return accion
+        return None
+
+    def error_en_estado(self, estado, token, valores):
+        """Lanza el error sintáctico de un token sin acción en el estado"""
+        if token is None:
+            # Declaración sin identificador: 'int' al final de la entrada
+            anterior = valores[-1]
+            if isinstance(anterior, dict) and anterior['tipo'] == 'TIPO':
+                self.error_sintactico('S004', anterior)
+            self.error_sintactico('S003', self.tokens[-1] if self.tokens else None)
+
+        esperados = self.tabla.acciones[estado]
+        if len(esperados) == 1:
+            esperado = next(iter(esperados))
+            self.error_sintactico('S001', token, _TIPOS.get(esperado, esperado), token['tipo'])
+        # Tras las reducciones por defecto, un estado que puede cerrar un
+        # paréntesis o la sentencia es donde el analizador recursivo los exige
+        for cierre in (')', ';'):
+            if cierre in esperados:
+                self.error_sintactico('S001', token, _TIPOS[cierre], token['tipo'])
+        self.error_sintactico('S002', token, token['tipo'])
+
+    def parsear(self):
+        """Ciclo desplazamiento-reducción; retorna el nodo Programa"""
+        acciones = self.tabla.acciones
+        ir_a = self.tabla.ir_a
+        producciones = self.tabla.producciones
+        inicial = self.tabla.inicial
+
+        estados = [0]
+        valores = [None]
+
+        # (altura de la pila, posición) tras la última reducción al símbolo inicial:
+        # punto de sincronización para la recuperación en modo pánico
+        control = None
+        nodos = []
+
+        try:
+            while True:
+                token = self.tokens[self.pos] if self.pos < len(self.tokens) else None
+                accion = acciones[estados[-1]].get(terminal_de(token))
+
+                if accion is None:
+                    accion = self.reduccion_por_defecto(estados[-1])
+                    if accion is not None:
+                        accion = ('r', accion)
+                    elif token is None:
+                        accion = self.terminal_implicito(estados[-1])
+
+                if accion is None:
+                    try:
+                        self.error_en_estado(estados[-1], token, valores)
+                    except ErrorSintactico as e:
+                        if not self.recuperar:
+                            raise
+                        self.tabla_simbolos.reportar_error(
+                            e.diagnostico.codigo, e.diagnostico.linea, *e.diagnostico.args,
+                            columna=e.diagnostico.columna
+                        )
+
+                    # Sin sentencias completas no hay dónde sincronizar (S -> D S)
+                    if control is None:
+                        break
+
+                    # Descartar la sentencia incompleta y sincronizar en PUNTOCOMA
+                    altura, pos_inicio = control
+                    del estados[altura:]
+                    del valores[altura:]
+                    self.sincronizar(pos_inicio)
+                    control = (altura, self.pos)
+                    continue
+
+                tipo, argumento = accion
+                if tipo == 'd':
+                    estados.append(argumento)
+                    valores.append(token)
+                    # El terminal implícito del final no consume ningún token
+                    if token is not None:
+                        self.pos += 1
+                elif tipo == 'r':
+                    nt, derecha = producciones[argumento]
+                    n = len(derecha)
+                    if n:
+                        hijos = valores[-n:]
+                        del estados[-n:]
+                        del valores[-n:]
+                    else:
+                        hijos = []
+                    valores.append(self.reducciones[argumento](*hijos))
+                    estados.append(ir_a[estados[-1]][nt])
+                    if nt == inicial:
+                        control = (len(estados), self.pos)
+                else:
+                    nodos = valores[-1]
+                    break
+        except LimiteErroresAlcanzado:
+            # Se alcanzó el máximo de errores: conservar las sentencias completas
+            if control is not None:
+                nodos = valores[control[0] - 1]
+
+        # Crear nodo raíz del programa (con gramatica.txt las sentencias son un deque)
+        return NodoAST("Programa", hijos=list(nodos), tipo='void')
+
+
+# Casos límite de la verificación cruzada con el analizador recursivo:
+# errores antes de completar una reducción y sentencias finales sin ';'
+CASOS_VERIFICACION = [
+    "int a;\nfloat b;\na = 1 + 2 * 3;\nb = a / 2.0;\n",
+    "x = ;\n",
+    "int a;\na = ;\n",
+    "a =",
+    "int a;\na = 1",
+    "int a",
+    "int",
+    "int a;\na = (1 + 2",
+    "int a;\n;\nint b;\n",
+    "int a;\na = 1 2;\n",
+    "int a;\na = (1 ;\n",
+    "1 )\nint a;\n",
+    "int a;\na = 1 + ;\na = 2;\n",
+    "int a;\na = 1 $ 2;\nb = ;\n",
+]
+
+
+def resultado_analisis(clase, entrada, **opciones):
+    """AST (en preorden), código, diagnósticos y símbolos de un análisis"""
+    lexico = AnalizadorLexico(entrada)
+    sintactico = clase(lexico.tokenizar(), **opciones)
+    reportar_errores_lexicos(sintactico, lexico.errores)
+    ast = sintactico.parsear()
+
+    nodos = []
+    pendientes = [(ast, 0)]
+    while pendientes:
+        nodo, nivel = pendientes.pop()
+        nodos.append((nivel, str(nodo), nodo.lugar))
+        pendientes.extend((hijo, nivel + 1) for hijo in reversed(nodo.hijos))
+
+    tabla = sintactico.tabla_simbolos
+    diagnosticos = [(d.codigo, d.linea, d.columna, d.args) for d in tabla.errores + tabla.warnings]
+    simbolos = [(s.nombre, s.tipo, s.alcance, s.valor, s.usado)
+                for simbolos in tabla.tabla.values() for s in simbolos]
+    return nodos, sintactico.generador.obtener_codigo(), diagnosticos, simbolos
+
+
+def verificar_equivalencia(entradas, gramatica=GRAMATICA_LR):
+    """Retorna las entradas en que el LR y el recursivo difieren, con y sin recuperación"""
+    diferencias = []
+    for entrada in entradas:
+        for recuperar in (True, False):
+            try:
+                recursivo = resultado_analisis(AnalizadorSintactico, entrada, recuperar=recuperar)
+            except ErrorSintactico as e:
+                recursivo = e.diagnostico.codigo
+            try:
+                lr = resultado_analisis(AnalizadorSintacticoLR, entrada, recuperar=recuperar,
+                                        gramatica=gramatica)
+            except ErrorSintactico as e:
+                lr = e.diagnostico.codigo
+            if recursivo != lr:
+                diferencias.append((entrada, recuperar))
+    return diferencias
+
+
+def main():
+    """Función principal"""
+    print("="*80)
+    print(" ANALIZADOR LALR(1) DIRIGIDO POR TABLA ".center(80, "="))
+    print("="*80)
+
+    argumentos = [a for a in sys.argv if not a.startswith('--')]
+
+    # --verificar [programa.txt ...]: comparar con el analizador recursivo
+    if '--verificar' in sys.argv:
+        entradas = list(CASOS_VERIFICACION)
+        for ruta in argumentos[1:]:
+            with open(ruta, 'r', encoding='utf-8') as f:
+                entradas.append(f.read())
+        diferencias = verificar_equivalencia(entradas)
+        for entrada, recuperar in diferencias:
+            print(f"❌ Difiere (recuperar={recuperar}): {entrada!r}")
+        if diferencias:
+            return 1
+        print(f"\n✅ {len(entradas)} entradas: mismo AST, código, diagnósticos y símbolos")
+        return 0
+
+    if len(argumentos) < 2:
+        print("Uso: python analizador_lr.py programa.txt [gramatica_lr.txt] [--dag]")
+        print("     python analizador_lr.py --verificar [programa.txt ...]")
+        return 1
+
+    with open(argumentos[1], 'r', encoding='utf-8') as f:
+        entrada = f.read()
+    gramatica = argumentos[2] if len(argumentos) > 2 else GRAMATICA_LR
+
+    lexico = AnalizadorLexico(entrada)
+    sintactico = AnalizadorSintacticoLR(lexico.tokenizar(), gramatica, dag='--dag' in sys.argv)
+    reportar_errores_lexicos(sintactico, lexico.errores)
+    ast = sintactico.parsear()
+
+    tabla = sintactico.tabla
+    print(f"\n📐 Gramática: {gramatica} ({len(tabla.producciones) - 1} producciones, "
+          f"{len(tabla.nucleos)} estados)")
+
+    if sintactico.tabla_simbolos.tiene_errores():
+        print("\n❌ ANÁLISIS FALLIDO - Errores encontrados")
+        sintactico.tabla_simbolos.imprimir_errores()
+        return 1
+
+    print("\n✅ ANÁLISIS EXITOSO")
+    ast.imprimir_decorado()
+    print("\n" + "="*80)
+    print(" CÓDIGO INTERMEDIO (3 DIRECCIONES) ".center(80, "="))
+    print("="*80)
+    print(sintactico.generador.obtener_codigo() or "(sin código generado)")
+    print("="*80)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
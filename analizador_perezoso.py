@@ -0,0 +1,333 @@
+#!/usr/bin/env python3
+# analizador_perezoso.py
+"""
+Evaluación perezosa (por demanda) de los atributos del AST decorado
+
+En el ETDS los atributos tipo, val y lugar se calculan durante el análisis,
+aunque nadie los consulte. En este modo el análisis solo resuelve los nombres
+(E001, E002 y errores sintácticos). Los nodos se crean como NodoPerezoso, con
+reglas por producción, y cada atributo se evalúa y memoriza al consultarlo:
+
+- tipo: coerción de los tipos de los operandos
+- val: plegado de constantes. Al evaluarlo se reportan E003, W002, W003 y
+  W004. El valor de un identificador es el val de la definición que lo alcanza.
+- lugar: temporal de una operación (solo el nombre, sin emitir código)
+- codigo: instrucción propia del nodo (operación, declaración o asignación)
+
+Una verificación de tipos solo paga por tipo: no pliega constantes ni crea
+temporales. completar() evalúa val y lugar en el orden del programa y arma el
+código recorriendo el AST en ese orden, así que leer antes un lugar o un
+codigo suelto no desordena las instrucciones (solo la numeración de esos
+temporales). Deja el mismo código, advertencias y valores de la tabla que el
+análisis normal.
+Los errores son los mismos, pero los de evaluación (E003) van después de los
+del análisis. Las sentencias que un error sintáctico descarta no se evalúan.
+"""
+
+import sys
+import time
+
+from analizador_completo import (AnalizadorLexico, AnalizadorSintactico, analizar,
+                                 reportar_errores_lexicos)
+from analizador_lr import AnalizadorSintacticoLR
+from diagnosticos import LimiteErroresAlcanzado
+from nodo_ast import (NodoAST, NodoPerezoso, Regla, ATRIBUTOS_PEREZOSOS, evaluar_atributo,
+                      coercion_tipos, plegar_constante, tipo_literal, valor_literal,
+                      valor_asignado)
+
+
+def _hijos(atributo):
+    """Dependencias: el atributo de cada hijo, en orden"""
+    return lambda nodo: [(hijo, atributo) for hijo in nodo.hijos]
+
+
+def crear_nodo_operacion_perezoso(operador, izq, der, linea, columna, reglas):
+    """Nodo de una operación binaria con atributos por demanda"""
+    return NodoPerezoso(operador, hijos=[izq, der], reglas=reglas, contexto=columna, linea=linea)
+
+
+def crear_nodo_numero_perezoso(lexema, linea, reglas):
+    """Nodo de un número literal con val por demanda"""
+    return NodoPerezoso(lexema, reglas=reglas, tipo=tipo_literal(lexema), linea=linea)
+
+
+def _operando(nodo):
+    """Texto de un operando en el código de tres direcciones"""
+    if nodo.lugar:
+        return nodo.lugar
+    return nodo.val if nodo.val is not None else nodo.etiqueta
+
+
+class AccionesPerezosas:
+    """
+    Acciones semánticas que construyen nodos perezosos (se combina con un
+    analizador). El modo DAG se desactiva, porque comparte nodos ya evaluados.
+    """
+
+    def __init__(self, *args, **opciones):
+        opciones.update(dag=False)
+        super().__init__(*args, **opciones)
+        self.ast = None
+        # {nombre: nodo cuyo val es el valor vigente de la variable}
+        self.definiciones = {}
+
+        propios = lambda nodo: [(nodo, 'val'), (nodo, 'lugar')]
+        expresion = lambda nodo: [(nodo.hijos[1], 'val'), (nodo.hijos[1], 'lugar')]
+        definicion = lambda nodo: [(nodo.contexto, 'val')] if nodo.contexto is not None else ()
+        self.reglas_operacion = {
+            'tipo': Regla(lambda n: coercion_tipos(n.hijos[0].tipo, n.hijos[1].tipo),
+                          _hijos('tipo')),
+            # El tipo decide si la división trunca (int / int)
+            'val': Regla(self.valor_operacion,
+                         lambda n: [(n, 'tipo')] + [(hijo, 'val') for hijo in n.hijos]),
+            # Temporales en postorden, como el análisis normal
+            'lugar': Regla(lambda n: self.generador.nuevo_temporal(), _hijos('lugar')),
+            'codigo': Regla(self.codigo_operacion, propios),
+        }
+        self.reglas_numero = {'val': Regla(self.valor_numero)}
+        self.reglas_identificador = {
+            'val': Regla(lambda n: n.contexto.val if n.contexto is not None else None,
+                         definicion),
+        }
+        self.reglas_declaracion = {'codigo': Regla(self.codigo_declaracion)}
+        self.reglas_asignacion = {
+            # Convertido al tipo declarado, como el análisis normal
+            'val': Regla(lambda n: valor_asignado(n.hijos[1].val, n.tipo),
+                         lambda n: [(n.hijos[1], 'val')]),
+            'codigo': Regla(self.codigo_asignacion, expresion),
+        }
+
+    def parsear(self):
+        self.ast = super().parsear()
+        return self.ast
+
+    # --- Acciones semánticas (solo resolución de nombres) ---
+
+    def accion_declaracion(self, token_tipo, token_id):
+        """D → tipo id ; (la instrucción es el atributo codigo)"""
+        tipo = token_tipo['lexema']
+        linea = token_tipo['linea']
+        nombre = token_id['lexema']
+        columna = token_id.get('columna', 0)
+        insertado = self.tabla_simbolos.insertar(nombre, tipo, linea, columna=columna)
+        if insertado:
+            # Una declaración nueva empieza sin valor
+            self.definiciones.pop(nombre, None)
+
+        nodo = NodoPerezoso(
+            "Declaracion",
+            hijos=[
+                NodoAST(tipo, tipo='tipo'),
+                NodoAST(nombre, tipo=tipo, linea=linea)
+            ],
+            reglas=self.reglas_declaracion,
+            tipo='void',
+            val=None,
+            linea=linea
+        )
+        if self.referencias is not None and insertado:
+            self.referencias.declarar(nombre, tipo, linea, columna, nodo)
+        return nodo
+
+    def accion_asignacion(self, token, nodo_expr):
+        """id = E ; (la asignación pasa a ser la definición vigente)"""
+        nombre = token['lexema']
+        linea = token['linea']
+        tipo_var = self.tabla_simbolos.obtener_tipo(nombre)
+
+        nodo = NodoPerezoso(
+            "Asignacion",
+            hijos=[NodoAST(nombre, tipo=tipo_var, linea=linea), nodo_expr],
+            reglas=self.reglas_asignacion,
+            tipo=tipo_var,
+            linea=linea
+        )
+        self.definiciones[nombre] = nodo
+        if self.referencias is not None:
+            self.referencias.asignar(nombre, linea, token.get('columna', 0), nodo)
+        return nodo
+
+    def accion_operacion(self, token_op, nodo, nodo_derecho):
+        """E op T y T op F (la división por cero se detecta al evaluar val)"""
+        return crear_nodo_operacion_perezoso(token_op['lexema'], nodo, nodo_derecho,
+                                             token_op['linea'], token_op.get('columna', 0),
+                                             self.reglas_operacion)
+
+    def accion_numero(self, token):
+        """F → num"""
+        return crear_nodo_numero_perezoso(token['lexema'], token['linea'], self.reglas_numero)
+
+    def accion_identificador(self, token):
+        """F → id (val es el de la definición que alcanza la lectura)"""
+        nombre = token['lexema']
+        linea = token['linea']
+        if not self.tabla_simbolos.validar_declaracion(nombre, linea, token.get('columna', 0)):
+            nodo = NodoAST(nombre, tipo=None, linea=linea)
+        else:
+            nodo = NodoPerezoso(nombre, reglas=self.reglas_identificador,
+                                contexto=self.definiciones.get(nombre),
+                                tipo=self.tabla_simbolos.obtener_tipo(nombre), linea=linea)
+        if self.referencias is not None:
+            self.referencias.leer(nombre, linea, token.get('columna', 0), nodo)
+        return nodo
+
+    # --- Reglas ---
+
+    def reportar_error_evaluacion(self, codigo, linea, columna=0):
+        """Error detectado al evaluar un atributo; respeta el máximo de errores"""
+        tabla = self.tabla_simbolos
+        if tabla.limite_alcanzado():
+            return
+        try:
+            tabla.reportar_error(codigo, linea, columna=columna)
+        except LimiteErroresAlcanzado:
+            pass
+
+    def valor_operacion(self, nodo):
+        izq, der = nodo.hijos
+        if nodo.etiqueta == '/' and der.val == 0:
+            self.reportar_error_evaluacion('E003', nodo.linea, nodo.contexto)
+        if izq.val is None or der.val is None:
+            return None
+        valor, acotado = plegar_constante(nodo.etiqueta, izq.val, der.val, nodo.linea,
+                                          self.limites, self.reportar_advertencia, nodo.tipo)
+        if acotado:
+            nodo.establecer_atributo('acotado', True)
+        return valor
+
+    def valor_numero(self, nodo):
+        return valor_literal(nodo.etiqueta, nodo.linea, self.limites, self.reportar_advertencia)
+
+    def codigo_operacion(self, nodo):
+        if nodo.obtener_atributo('acotado'):
+            # Como el análisis normal: el temporal recibe el valor acotado
+            return f"{nodo.lugar} = {nodo.val}"
+        izq, der = nodo.hijos
+        return f"{nodo.lugar} = {_operando(izq)} {nodo.etiqueta} {_operando(der)}"
+
+    def codigo_declaracion(self, nodo):
+        tipo, identificador = nodo.hijos
+        return f"declare {identificador.etiqueta} : {tipo.etiqueta}"
+
+    def codigo_asignacion(self, nodo):
+        return f"{nodo.hijos[0].etiqueta} = {_operando(nodo.hijos[1])}"
+
+    # --- Evaluación ---
+
+    def evaluar(self, *atributos):
+        """Evalúa los atributos en todos los nodos del programa, sentencia por sentencia"""
+        for atributo in atributos:
+            for sentencia in self.ast.hijos:
+                pila = [sentencia]
+                while pila:
+                    nodo = pila.pop()
+                    # Un nodo ya evaluado puede tener hijos sin evaluar (p. ej. Asignacion.tipo)
+                    if isinstance(nodo, NodoPerezoso) and atributo not in nodo.calculados:
+                        evaluar_atributo(nodo, atributo)
+                    if nodo.hijos:
+                        pila.extend(reversed(nodo.hijos))
+
+    def completar(self):
+        """
+        Evalúa val y lugar en el orden del programa, guarda los valores finales
+        en la tabla de símbolos y retorna el código de tres direcciones
+        """
+        self.evaluar('val', 'lugar')
+
+        # El código se arma siempre desde el AST: sentencias en orden y, dentro de
+        # cada una, instrucciones en postorden (operandos antes que su uso)
+        generador = self.generador
+        generador.codigo_generado = []
+        for sentencia in self.ast.hijos:
+            pila = [(sentencia, False)]
+            while pila:
+                nodo, visitado = pila.pop()
+                if not visitado:
+                    pila.append((nodo, True))
+                    pila.extend((hijo, False) for hijo in reversed(nodo.hijos))
+                elif nodo.codigo:
+                    generador.generar(nodo.codigo)
+
+        # Sin contar búsquedas: el análisis normal ya actualizó la tabla al asignar
+        tabla = self.tabla_simbolos
+        busquedas, fallos = tabla.busquedas, tabla.fallos_busqueda
+        for nombre, definicion in self.definiciones.items():
+            if definicion is not None:
+                tabla.actualizar_valor(nombre, definicion.val)
+        tabla.busquedas, tabla.fallos_busqueda = busquedas, fallos
+        return self.generador.obtener_codigo()
+
+    def atributos_evaluados(self):
+        """{atributo: nodos con regla cuyo atributo ya se evaluó}"""
+        conteo = dict.fromkeys(ATRIBUTOS_PEREZOSOS, 0)
+        pila = list(self.ast.hijos) if self.ast else []
+        while pila:
+            nodo = pila.pop()
+            pila.extend(nodo.hijos)
+            if isinstance(nodo, NodoPerezoso):
+                for atributo in nodo.reglas:
+                    if nodo.evaluado(atributo):
+                        conteo[atributo] += 1
+        return conteo
+
+
+class AnalizadorPerezoso(AccionesPerezosas, AnalizadorSintactico):
+    """Analizador recursivo con evaluación perezosa de atributos"""
+
+
+class AnalizadorPerezosoLR(AccionesPerezosas, AnalizadorSintacticoLR):
+    """Analizador LALR(1) con evaluación perezosa de atributos"""
+
+
+def main():
+    """Función principal"""
+    opciones = {}
+    for argumento in sys.argv[1:]:
+        if argumento.startswith('--'):
+            nombre, _, valor = argumento[2:].partition('=')
+            opciones[nombre] = valor
+    argumentos = [a for a in sys.argv[1:] if not a.startswith('--')]
+    if not argumentos:
+        print("Uso: python analizador_perezoso.py programa.txt [--atributos=tipo,val,lugar] [--lr]")
+        return 1
+
+    with open(argumentos[0], 'r', encoding='utf-8') as f:
+        entrada = f.read()
+    atributos = [a for a in (opciones.get('atributos') or 'tipo').split(',') if a]
+    for atributo in atributos:
+        if atributo not in ATRIBUTOS_PEREZOSOS:
+            print(f"❌ ERROR: Atributo desconocido '{atributo}'")
+            return 1
+
+    print("="*80)
+    print(" EVALUACIÓN PEREZOSA DE ATRIBUTOS ".center(80, "="))
+    print("="*80)
+
+    # Referencia: análisis con todos los atributos calculados durante el parseo
+    inicio = time.perf_counter()
+    analizar(entrada, lr='lr' in opciones)
+    completo = time.perf_counter() - inicio
+
+    inicio = time.perf_counter()
+    clase = AnalizadorPerezosoLR if 'lr' in opciones else AnalizadorPerezoso
+    lexico = AnalizadorLexico(entrada)
+    sintactico = clase(lexico.tokenizar())
+    reportar_errores_lexicos(sintactico, lexico.errores)
+    sintactico.parsear()
+    sintactico.evaluar(*atributos)
+    perezoso = time.perf_counter() - inicio
+
+    print(f"📄 Archivo: {argumentos[0]}")
+    print(f"🔎 Atributos pedidos: {', '.join(atributos)}")
+    for atributo, n in sintactico.atributos_evaluados().items():
+        print(f"   - {atributo:6} evaluado en {n} nodos")
+    print(f"⏱️  Análisis completo: {completo * 1000:.2f} ms, "
+          f"perezoso: {perezoso * 1000:.2f} ms")
+
+    sintactico.tabla_simbolos.imprimir_errores()
+    print("="*80)
+    return 1 if sintactico.tabla_simbolos.tiene_errores() else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
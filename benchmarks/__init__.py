@@ -0,0 +1,8 @@
+# benchmarks/__init__.py
+"""
+Benchmarks del analizador y de las herramientas de gramáticas
+
+Ejecución (desde la raíz del proyecto):
+    python -m benchmarks.bench_analizador --salida resultados.json
+    python -m benchmarks.comparar base.json nuevo.json
+"""
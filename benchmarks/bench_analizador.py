@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+# benchmarks/bench_analizador.py
+"""
+Benchmark del analizador: léxico, sintáctico/semántico, tabla de símbolos y
+generador de código, sobre programas sintéticos.
+
+Uso (desde la raíz del proyecto):
+    python -m benchmarks.bench_analizador [--salida=ruta.json] [--escala=1.0]
+                                          [--repeticiones=3] [--semilla=0]
+"""
+
+import sys
+from analizador_completo import AnalizadorLexico, AnalizadorSintactico, GeneradorCodigo
+from tabla_simbolos import TablaSimbolos
+from benchmarks.generador_programas import generar_casos
+from benchmarks.medicion import medir, escribir_resultados
+
+
+def bench_lexico(caso, tamano, fuente, repeticiones):
+    """Throughput de AnalizadorLexico.tokenizar"""
+    tokens = AnalizadorLexico(fuente).tokenizar()
+    resultado = medir(caso, 'lexico', tamano, len(tokens),
+                      lambda: AnalizadorLexico(fuente).tokenizar(), repeticiones)
+    return resultado, tokens
+
+
+def bench_sintactico(caso, tamano, tokens, repeticiones):
+    """Throughput de AnalizadorSintactico.parsear (incluye semántica y código)"""
+    sintactico = AnalizadorSintactico(tokens)
+    sintactico.parsear()
+    resultado = medir(caso, 'sintactico', tamano, len(tokens),
+                      lambda: AnalizadorSintactico(tokens).parsear(), repeticiones)
+    return resultado, sintactico.generador.codigo_generado
+
+
+def bench_generador(caso, tamano, instrucciones, repeticiones):
+    """Throughput de GeneradorCodigo (temporales, emisión y unión del texto)"""
+    def ejecutar():
+        generador = GeneradorCodigo()
+        for instruccion in instrucciones:
+            generador.nuevo_temporal()
+            generador.generar(instruccion)
+        return generador.obtener_codigo()
+
+    return medir(caso, 'generador_codigo', tamano, len(instrucciones), ejecutar, repeticiones)
+
+
+def bench_tabla_simbolos(n, repeticiones, busquedas_por_simbolo=4):
+    """Throughput de TablaSimbolos: inserción, búsqueda, actualización y alcances"""
+    nombres = [f"v{i}" for i in range(n)]
+    ausentes = [f"z{i}" for i in range(n)]
+
+    def ejecutar():
+        tabla = TablaSimbolos()
+        for i, nombre in enumerate(nombres):
+            tabla.insertar(nombre, 'int', i)
+        tabla.entrar_alcance()
+        for nombre in nombres[::10]:
+            tabla.insertar(nombre, 'float', 0)
+        for _ in range(busquedas_por_simbolo):
+            for nombre in nombres:
+                tabla.buscar(nombre)
+        for nombre in ausentes:
+            tabla.buscar(nombre)
+        for i, nombre in enumerate(nombres):
+            tabla.actualizar_valor(nombre, i)
+            tabla.marcar_usado(nombre)
+        tabla.salir_alcance()
+
+    operaciones = n + n // 10 + n * busquedas_por_simbolo + n + 2 * n + 2
+    return medir('tabla_simbolos', 'tabla_simbolos', n, operaciones, ejecutar, repeticiones)
+
+
+def ejecutar_suite(escala=1.0, repeticiones=3, semilla=0):
+    """Ejecuta todos los casos y retorna la lista de resultados"""
+    resultados = []
+
+    for caso, tamano, fuente in generar_casos(escala, semilla):
+        resultado, tokens = bench_lexico(caso, tamano, fuente, repeticiones)
+        resultados.append(resultado)
+
+        resultado, instrucciones = bench_sintactico(caso, tamano, tokens, repeticiones)
+        resultados.append(resultado)
+
+        resultados.append(bench_generador(caso, tamano, instrucciones, repeticiones))
+
+    resultados.append(bench_tabla_simbolos(max(1, int(20000 * escala)), repeticiones))
+    return resultados
+
+
+def imprimir_resultados(resultados):
+    """Imprime un resumen legible de los resultados"""
+    print(f"{'Caso':22} {'Fase':18} {'Tamaño':>8} {'Unidades':>9} {'ms':>10} {'u/s':>12} {'Pico KiB':>10}")
+    print("-"*95)
+    for r in resultados:
+        print(f"{r['caso']:22} {r['fase']:18} {r['tamano']:8} {r['unidades']:9} "
+              f"{r['segundos'] * 1000:10.2f} {r['unidades_por_segundo'] or 0:12.0f} "
+              f"{r['memoria_pico_bytes'] / 1024:10.1f}")
+
+
+def main():
+    """Función principal"""
+    opciones = {}
+    for argumento in sys.argv[1:]:
+        if argumento.startswith('--'):
+            nombre, _, valor = argumento[2:].partition('=')
+            opciones[nombre] = valor
+
+    salida = opciones.get('salida') or 'bench_analizador.json'
+    escala = float(opciones.get('escala') or 1.0)
+    repeticiones = int(opciones.get('repeticiones') or 3)
+    semilla = int(opciones.get('semilla') or 0)
+
+    # El parser es recursivo: los paréntesis anidados necesitan margen
+    sys.setrecursionlimit(max(sys.getrecursionlimit(), 5000))
+
+    resultados = ejecutar_suite(escala, repeticiones, semilla)
+    imprimir_resultados(resultados)
+    escribir_resultados(salida, 'analizador', resultados,
+                        {'escala': escala, 'repeticiones': repeticiones, 'semilla': semilla})
+    print(f"\n📄 Resultados escritos en {salida}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,149 @@
+#!/usr/bin/env python3
+# benchmarks/bench_gramaticas.py
+"""
+Benchmark de escalamiento del análisis de gramáticas (calculador_conjuntos)
+
+Mide leer_gramatica, calcular_primeros, calcular_siguientes,
+calcular_prediccion y verificar_ll1 sobre familias de gramáticas sintéticas
+(generador_gramaticas.py) de tamaño creciente. Para cada familia y fase ajusta
+el exponente de la curva tiempo ~ tamaño^k (mínimos cuadrados en escala
+log-log, con el tamaño medido en símbolos de la gramática); k cercano a 1 es
+escalamiento lineal y uno cuadrático da k ≈ 2 (el umbral por omisión, 1.5, deja
+margen para el ruido de caché y del recolector). Las curvas se guardan en el
+JSON junto a los resultados; el código de salida es 1 si alguna supera el umbral.
+
+Uso (desde la raíz del proyecto):
+    python -m benchmarks.bench_gramaticas [--salida=ruta.json] [--escala=1.0]
+                                          [--repeticiones=3] [--semilla=0] [--umbral=1.5]
+"""
+
+import math
+import os
+import sys
+import tempfile
+
+from calculador_conjuntos import (leer_gramatica, calcular_primeros, calcular_siguientes,
+                                  calcular_prediccion, verificar_ll1)
+from benchmarks.generador_gramaticas import generar_casos
+from benchmarks.medicion import medir, escribir_resultados
+
+TAMANOS = [200, 400, 800, 1600, 3200]
+FASES = ['leer_gramatica', 'primeros', 'siguientes', 'prediccion', 'verificar_ll1']
+
+
+def tamano_gramatica(gramatica):
+    """Número de símbolos de la gramática (lados izquierdos y derechos)"""
+    return sum(1 + len(produccion) for producciones in gramatica.values()
+               for produccion in producciones)
+
+
+def bench_gramatica(familia, n, ruta, repeticiones):
+    """Mide cada fase sobre una gramática; cada fase recibe la salida de la anterior"""
+    gramatica, inicial = leer_gramatica(ruta)
+    primeros = calcular_primeros(gramatica)
+    siguientes = calcular_siguientes(gramatica, inicial, primeros)
+    prediccion = calcular_prediccion(gramatica, primeros, siguientes)
+    unidades = tamano_gramatica(gramatica)
+
+    funciones = {
+        'leer_gramatica': lambda: leer_gramatica(ruta),
+        'primeros': lambda: calcular_primeros(gramatica),
+        'siguientes': lambda: calcular_siguientes(gramatica, inicial, primeros),
+        'prediccion': lambda: calcular_prediccion(gramatica, primeros, siguientes),
+        'verificar_ll1': lambda: verificar_ll1(gramatica, prediccion),
+    }
+    return [medir(familia, fase, n, unidades, funciones[fase], repeticiones) for fase in FASES]
+
+
+def exponente(puntos):
+    """Pendiente de log(segundos) contra log(unidades), o None con menos de dos puntos"""
+    pares = [(math.log(u), math.log(s)) for u, s in puntos if u > 0 and s > 0]
+    if len(pares) < 2:
+        return None
+    media_x = sum(x for x, _ in pares) / len(pares)
+    media_y = sum(y for _, y in pares) / len(pares)
+    varianza = sum((x - media_x) ** 2 for x, _ in pares)
+    if not varianza:
+        return None
+    return sum((x - media_x) * (y - media_y) for x, y in pares) / varianza
+
+
+def curvas_escalamiento(resultados):
+    """[{familia, fase, puntos: [[n, unidades, segundos]], exponente}]"""
+    curvas = {}
+    for r in resultados:
+        curvas.setdefault((r['caso'], r['fase']), []).append(r)
+    return [
+        {
+            'familia': familia,
+            'fase': fase,
+            'puntos': [[r['tamano'], r['unidades'], r['segundos']] for r in serie],
+            'exponente': exponente([(r['unidades'], r['segundos']) for r in serie]),
+        }
+        for (familia, fase), serie in curvas.items()
+    ]
+
+
+def ejecutar_suite(escala=1.0, repeticiones=3, semilla=0):
+    """Genera las gramáticas en un directorio temporal y mide todas las fases"""
+    tamanos = sorted({max(2, int(n * escala)) for n in TAMANOS})
+    resultados = []
+    with tempfile.TemporaryDirectory() as directorio:
+        for familia, n, texto in generar_casos(tamanos, semilla):
+            ruta = os.path.join(directorio, f"{familia}_{n}.txt")
+            with open(ruta, 'w', encoding='utf-8') as f:
+                f.write(texto)
+            resultados.extend(bench_gramatica(familia, n, ruta, repeticiones))
+    return resultados
+
+
+def imprimir_resultados(resultados, curvas, umbral):
+    """Imprime los tiempos y el exponente de escalamiento de cada curva"""
+    print(f"{'Familia':24} {'Fase':15} {'n':>6} {'Símbolos':>9} {'ms':>10} {'símb/s':>12}")
+    print("-"*80)
+    for r in resultados:
+        print(f"{r['caso']:24} {r['fase']:15} {r['tamano']:6} {r['unidades']:9} "
+              f"{r['segundos'] * 1000:10.2f} {r['unidades_por_segundo'] or 0:12.0f}")
+
+    print("\n" + "="*80)
+    print(" ESCALAMIENTO: tiempo ~ tamaño^k ".center(80, "="))
+    print("="*80)
+    for curva in curvas:
+        k = curva['exponente']
+        if k is None:
+            print(f"{curva['familia']:24} {curva['fase']:15}      -")
+            continue
+        marca = "✅" if k <= umbral else "⚠️ "
+        print(f"{marca} {curva['familia']:24} {curva['fase']:15} k = {k:5.2f}")
+    print("="*80)
+
+
+def main():
+    """Función principal"""
+    opciones = {}
+    for argumento in sys.argv[1:]:
+        if argumento.startswith('--'):
+            nombre, _, valor = argumento[2:].partition('=')
+            opciones[nombre] = valor
+
+    salida = opciones.get('salida') or 'bench_gramaticas.json'
+    escala = float(opciones.get('escala') or 1.0)
+    repeticiones = int(opciones.get('repeticiones') or 3)
+    semilla = int(opciones.get('semilla') or 0)
+    umbral = float(opciones.get('umbral') or 1.5)
+
+    resultados = ejecutar_suite(escala, repeticiones, semilla)
+    curvas = curvas_escalamiento(resultados)
+    imprimir_resultados(resultados, curvas, umbral)
+    escribir_resultados(salida, 'gramaticas', resultados,
+                        {'escala': escala, 'repeticiones': repeticiones, 'semilla': semilla,
+                         'umbral': umbral},
+                        curvas=curvas)
+    print(f"\n📄 Resultados escritos en {salida}")
+
+    # Código de salida 1 si alguna fase escala peor que el umbral
+    return 1 if any(c['exponente'] is not None and c['exponente'] > umbral for c in curvas) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,195 @@
+#!/usr/bin/env python3
+# benchmarks/bench_parser_generado.py
+"""
+Benchmark del analizador generado (generador_parser.py) frente al escrito a mano
+
+Ambos analizan programas del lenguaje de gramatica.txt (declaraciones y una
+expresión) con las mismas acciones semánticas: el generado usa las reducciones
+de AnalizadorSintacticoLR, así que el AST y el código deben ser idénticos, y se
+verifica antes de medir. Se mide el léxico, el análisis con acciones, el
+análisis sin acciones (solo reconocimiento) y la importación del módulo generado.
+
+La cifra principal es la aceleración del análisis sintáctico con acciones: el
+benchmark termina con código 1 si en algún caso el generado no es más rápido.
+Los analizadores se crean fuera de la medición (uno nuevo por ejecución) y el
+recolector de ciclos se pausa mientras se mide.
+
+Uso (desde la raíz del proyecto):
+    python -m benchmarks.bench_parser_generado [--salida=ruta.json] [--escala=1.0]
+                                               [--repeticiones=7] [--semilla=0]
+"""
+
+import importlib.util
+import os
+import sys
+import tempfile
+import time
+
+from analizador_completo import AnalizadorLexico, AnalizadorSintactico
+from analizador_lr import AnalizadorSintacticoLR
+from calculador_conjuntos import leer_gramatica
+from generador_parser import generar_modulo
+from benchmarks.generador_programas import GeneradorProgramas, RUTA_GRAMATICA
+from benchmarks.medicion import (medir, medir_tiempos_alternados, medir_memoria, resultado,
+                                 escribir_resultados)
+
+
+def cargar_generado(directorio):
+    """Genera el módulo para gramatica.txt, lo importa y retorna (módulo, segundos de importación)"""
+    gramatica, inicial = leer_gramatica(RUTA_GRAMATICA)
+    ruta = os.path.join(directorio, 'parser_gramatica.py')
+    with open(ruta, 'w', encoding='utf-8') as f:
+        f.write(generar_modulo(gramatica, inicial, origen='gramatica.txt'))
+
+    inicio = time.perf_counter()
+    especificacion = importlib.util.spec_from_file_location('parser_gramatica', ruta)
+    modulo = importlib.util.module_from_spec(especificacion)
+    especificacion.loader.exec_module(modulo)
+    return modulo, time.perf_counter() - inicio
+
+
+def generar_casos(escala=1.0, semilla=0):
+    """Programas del lenguaje de gramatica.txt: [(caso, tamaño, fuente)]"""
+    generador = GeneradorProgramas(semilla=semilla)
+    n = lambda base: max(1, int(base * escala))
+
+    def programa(n_declaraciones, n_expresiones):
+        lineas, nombres = generador.declaraciones(n_declaraciones)
+        lineas.append(" +\n".join(generador.expresion(nombres, 5) for _ in range(n_expresiones)))
+        return "\n".join(lineas)
+
+    def anidado(profundidad):
+        lineas, nombres = generador.declaraciones(2)
+        expresion = nombres[1]
+        for i in range(profundidad):
+            expresion = f"( {expresion} * {i + 1} )"
+        return "\n".join(lineas + [expresion])
+
+    return [
+        ('muchas_declaraciones', n(5000), programa(n(5000), 1)),
+        ('expresion_larga', n(3000), programa(16, n(3000))),
+        # Profundidad limitada por la recursión del analizador escrito a mano
+        ('parentesis_anidados', 250, anidado(250)),
+    ]
+
+
+def verificar(generado, fuente):
+    """Comprueba que ambos analizadores producen el mismo código y errores"""
+    manual = AnalizadorSintactico(AnalizadorLexico(fuente).tokenizar())
+    manual.parsear()
+    lr = AnalizadorSintacticoLR([], RUTA_GRAMATICA)
+    tipos, tokens = generado.tokenizar(fuente)
+    generado.parsear(tipos, tokens, lr.reducciones)
+    if (manual.generador.codigo_generado != lr.generador.codigo_generado
+            or [str(d) for d in manual.tabla_simbolos.errores]
+            != [str(d) for d in lr.tabla_simbolos.errores]):
+        raise AssertionError("El analizador generado no produce el mismo resultado")
+
+
+def bench_caso(generado, caso, tamano, fuente, repeticiones):
+    """Mide léxico y análisis de ambos analizadores sobre un programa"""
+    verificar(generado, fuente)
+    tokens_manual = AnalizadorLexico(fuente).tokenizar()
+    tipos, tokens = generado.tokenizar(fuente)
+    n = len(tokens)
+
+    # Las acciones modifican la tabla de símbolos: un analizador nuevo por
+    # ejecución (repeticiones + 1 con la de memoria), construido antes de medir
+    manuales = iter([AnalizadorSintactico(tokens_manual) for _ in range(repeticiones + 1)])
+    reducciones = iter([AnalizadorSintacticoLR([], RUTA_GRAMATICA).reducciones
+                        for _ in range(repeticiones + 1)])
+    sintactico_manual = lambda: next(manuales).parsear()
+    sintactico_generado = lambda: generado.parsear(tipos, tokens, next(reducciones))
+
+    # La cifra principal se mide por turnos para que la comparación sea estable
+    manual, generado_segundos = medir_tiempos_alternados(
+        [sintactico_manual, sintactico_generado], repeticiones, recolector=False)
+
+    return [
+        medir(caso, 'lexico_manual', tamano, n,
+              lambda: AnalizadorLexico(fuente).tokenizar(), repeticiones, recolector=False),
+        medir(caso, 'lexico_generado', tamano, n,
+              lambda: generado.tokenizar(fuente), repeticiones, recolector=False),
+        resultado(caso, 'sintactico_manual', tamano, n, manual,
+                  medir_memoria(sintactico_manual)),
+        resultado(caso, 'sintactico_generado', tamano, n, generado_segundos,
+                  medir_memoria(sintactico_generado)),
+        medir(caso, 'reconocimiento_generado', tamano, n,
+              lambda: generado.parsear(tipos, tokens), repeticiones, recolector=False),
+    ]
+
+
+def aceleraciones(resultados):
+    """Aceleración del análisis con acciones (generado sobre manual) por caso"""
+    por_fase = {(r['caso'], r['fase']): r['segundos'] for r in resultados}
+    return {caso: por_fase[(caso, 'sintactico_manual')] / por_fase[(caso, 'sintactico_generado')]
+            for caso in dict.fromkeys(r['caso'] for r in resultados)}
+
+
+def imprimir_resultados(resultados, importacion):
+    """Imprime los resultados y la aceleración del generado sobre el manual"""
+    print(f"{'Caso':22} {'Fase':24} {'Tamaño':>8} {'Tokens':>8} {'ms':>10} {'tokens/s':>12}")
+    print("-"*90)
+    por_fase = {}
+    for r in resultados:
+        por_fase[(r['caso'], r['fase'])] = r['segundos']
+        print(f"{r['caso']:22} {r['fase']:24} {r['tamano']:8} {r['unidades']:8} "
+              f"{r['segundos'] * 1000:10.2f} {r['unidades_por_segundo'] or 0:12.0f}")
+    print("-"*90)
+    for caso in dict.fromkeys(r['caso'] for r in resultados):
+        lexico = por_fase[(caso, 'lexico_manual')] / por_fase[(caso, 'lexico_generado')]
+        sintactico = por_fase[(caso, 'sintactico_manual')] / por_fase[(caso, 'sintactico_generado')]
+        total = ((por_fase[(caso, 'lexico_manual')] + por_fase[(caso, 'sintactico_manual')])
+                 / (por_fase[(caso, 'lexico_generado')] + por_fase[(caso, 'sintactico_generado')]))
+        print(f"{caso:22} aceleración: léxico {lexico:5.2f}x, sintáctico {sintactico:5.2f}x, "
+              f"total {total:5.2f}x")
+    print(f"\nImportación del módulo generado: {importacion * 1000:.2f} ms")
+
+    print("\n" + "="*90)
+    print(" ANÁLISIS SINTÁCTICO CON ACCIONES: GENERADO FRENTE AL MANUAL ".center(90, "="))
+    print("="*90)
+    for caso, aceleracion in aceleraciones(resultados).items():
+        marca = "✅" if aceleracion > 1 else "❌"
+        print(f"{marca} {caso:22} {aceleracion:5.2f}x")
+
+
+def main():
+    """Función principal"""
+    opciones = {}
+    for argumento in sys.argv[1:]:
+        if argumento.startswith('--'):
+            nombre, _, valor = argumento[2:].partition('=')
+            opciones[nombre] = valor
+
+    salida = opciones.get('salida') or 'bench_parser_generado.json'
+    escala = float(opciones.get('escala') or 1.0)
+    repeticiones = int(opciones.get('repeticiones') or 7)
+    semilla = int(opciones.get('semilla') or 0)
+
+    # El parser escrito a mano es recursivo: los paréntesis anidados necesitan margen
+    sys.setrecursionlimit(max(sys.getrecursionlimit(), 5000))
+
+    with tempfile.TemporaryDirectory() as directorio:
+        generado, importacion = cargar_generado(directorio)
+        resultados = []
+        for caso, tamano, fuente in generar_casos(escala, semilla):
+            resultados.extend(bench_caso(generado, caso, tamano, fuente, repeticiones))
+
+    imprimir_resultados(resultados, importacion)
+    aceleracion = aceleraciones(resultados)
+    escribir_resultados(salida, 'parser_generado', resultados,
+                        {'escala': escala, 'repeticiones': repeticiones, 'semilla': semilla,
+                         'importacion_segundos': importacion},
+                        aceleracion_sintactico=aceleracion)
+    print(f"\n📄 Resultados escritos en {salida}")
+
+    # El analizador generado debe ganar en el análisis con acciones
+    lentos = [caso for caso, valor in aceleracion.items() if valor <= 1]
+    if lentos:
+        print(f"\n❌ El analizador generado no es más rápido en: {', '.join(lentos)}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+# benchmarks/comparar.py
+"""
+Compara dos archivos de resultados JSON y señala regresiones.
+
+Uso (desde la raíz del proyecto):
+    python -m benchmarks.comparar base.json nuevo.json [--umbral=0.10]
+"""
+
+import json
+import sys
+
+
+def cargar(ruta):
+    """Carga un documento de resultados indexado por (caso, fase, tamaño)"""
+    with open(ruta, 'r', encoding='utf-8') as f:
+        documento = json.load(f)
+    return documento, {(r['caso'], r['fase'], r['tamano']): r for r in documento['resultados']}
+
+
+def comparar(base, nuevo, umbral=0.10):
+    """Retorna [(clave, cambio_tiempo, cambio_memoria, es_regresion)]"""
+    filas = []
+    for clave, r_base in base.items():
+        r_nuevo = nuevo.get(clave)
+        if r_nuevo is None:
+            continue
+        cambio_tiempo = r_nuevo['segundos'] / r_base['segundos'] - 1 if r_base['segundos'] else 0.0
+        cambio_memoria = (r_nuevo['memoria_pico_bytes'] / r_base['memoria_pico_bytes'] - 1
+                          if r_base['memoria_pico_bytes'] else 0.0)
+        regresion = cambio_tiempo > umbral or cambio_memoria > umbral
+        filas.append((clave, cambio_tiempo, cambio_memoria, regresion))
+    return filas
+
+
+def main():
+    """Función principal"""
+    argumentos = [a for a in sys.argv[1:] if not a.startswith('--')]
+    opciones = dict(a[2:].partition('=')[::2] for a in sys.argv[1:] if a.startswith('--'))
+
+    if len(argumentos) < 2:
+        print("Uso: python -m benchmarks.comparar base.json nuevo.json [--umbral=0.10]")
+        return 1
+
+    umbral = float(opciones.get('umbral') or 0.10)
+    doc_base, base = cargar(argumentos[0])
+    doc_nuevo, nuevo = cargar(argumentos[1])
+
+    print(f"Base:  {doc_base.get('commit')}")
+    print(f"Nuevo: {doc_nuevo.get('commit')}")
+    print(f"\n{'Caso':30} {'Fase':20} {'Tamaño':>8} {'Tiempo':>9} {'Memoria':>9}")
+    print("-"*80)
+
+    regresiones = 0
+    for (caso, fase, tamano), cambio_tiempo, cambio_memoria, regresion in comparar(base, nuevo, umbral):
+        marca = " ⚠️" if regresion else ""
+        print(f"{caso:30} {fase:20} {tamano:8} {cambio_tiempo:+9.1%} {cambio_memoria:+9.1%}{marca}")
+        regresiones += regresion
+
+    print("-"*80)
+    print(f"Regresiones (> {umbral:.0%}): {regresiones}")
+    return 1 if regresiones else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,87 @@
+# benchmarks/generador_gramaticas.py
+"""
+Gramáticas sintéticas parametrizadas para medir calculador_conjuntos
+
+Cada familia crece con n manteniendo acotados los conjuntos PRIMEROS y
+SIGUIENTES, de modo que el tamaño de la salida es lineal en el de la
+gramática. Los no terminales se escriben en el orden que más iteraciones
+exige a un punto fijo recorrido en el orden de la gramática: las
+dependencias apuntan hacia adelante en el archivo.
+"""
+
+import random
+
+# Terminales compartidos: conjuntos de tamaño acotado aunque n crezca
+_OPERADORES = ['+', '-', '*', '/']
+_ALFABETO = [f"t{i}" for i in range(8)]
+
+
+def cadena_anulable(n):
+    """S -> A0 fin ; Ai -> Ni Ai+1 ; Ni -> m | ε ; An -> z (n anulables encadenados)"""
+    lineas = ["S -> A0 fin"]
+    for i in range(n):
+        lineas.append(f"A{i} -> N{i} A{i + 1}")
+        lineas.append(f"N{i} -> m | ε")
+    lineas.append(f"A{n} -> z")
+    return "\n".join(lineas)
+
+
+def recursion_izquierda(n):
+    """n niveles de precedencia: Ei -> Ei op Ei+1 | Ei+1 ; En -> id | ( E0 )"""
+    lineas = ["S -> E0 fin"]
+    for i in range(n):
+        lineas.append(f"E{i} -> E{i} {_OPERADORES[i % 4]} E{i + 1} | E{i + 1}")
+    lineas.append(f"E{n} -> id | ( E0 )")
+    return "\n".join(lineas)
+
+
+def recursion_derecha(n):
+    """S -> Bn fin ; Bi+1 -> y Bi | x ; B0 -> z (SIGUIENTES fluye de Bn hacia B0)"""
+    lineas = [f"S -> B{n} fin"]
+    for i in range(n):
+        lineas.append(f"B{i + 1} -> y B{i} | x")
+    lineas.append("B0 -> z")
+    return "\n".join(lineas)
+
+
+def alternancia_ancha(n):
+    """S -> X fin ; X -> a1 Y | ... | an Y | ε ; Y -> y | ε (n alternativas)"""
+    alternativas = " | ".join(f"a{i} Y" for i in range(n))
+    return "\n".join([
+        "S -> X fin",
+        f"X -> {alternativas} | ε",
+        "Y -> y | ε",
+    ])
+
+
+def mutuamente_dependientes(n, semilla=0):
+    """
+    Ai -> A(i+1) ti | Ar u | ti | ε con r aleatorio: un ciclo de longitud n más
+    dependencias cruzadas, sobre un alfabeto fijo de terminales
+    """
+    aleatorio = random.Random(semilla)
+    lineas = ["S -> A0 fin"]
+    for i in range(n):
+        terminal = _ALFABETO[i % len(_ALFABETO)]
+        lineas.append(f"A{i} -> A{(i + 1) % n} {terminal} | A{aleatorio.randrange(n)} u "
+                      f"| {terminal} | ε")
+    return "\n".join(lineas)
+
+
+FAMILIAS = {
+    'cadena_anulable': cadena_anulable,
+    'recursion_izquierda': recursion_izquierda,
+    'recursion_derecha': recursion_derecha,
+    'alternancia_ancha': alternancia_ancha,
+    'mutuamente_dependientes': mutuamente_dependientes,
+}
+
+
+def generar_casos(tamanos, semilla=0):
+    """Retorna [(familia, n, texto)] para cada familia y tamaño"""
+    casos = []
+    for familia, generar in FAMILIAS.items():
+        for n in tamanos:
+            texto = generar(n, semilla) if familia == 'mutuamente_dependientes' else generar(n)
+            casos.append((familia, n, texto))
+    return casos
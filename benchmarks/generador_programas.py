@@ -0,0 +1,150 @@
+# benchmarks/generador_programas.py
+"""
+Generación de programas sintéticos a partir de gramatica.txt
+
+Las expresiones se obtienen por derivaciones aleatorias de la gramática
+(limitando la profundidad) y los terminales id/num/int/float se sustituyen por
+lexemas concretos. Además de la forma S → D S | E de la gramática, los
+programas incluyen asignaciones (id = E ;), que el analizador también acepta.
+Todos los programas generados son válidos: cada identificador se declara antes
+de usarse.
+"""
+
+import os
+import random
+from calculador_conjuntos import leer_gramatica
+
+RUTA_GRAMATICA = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                              'gramatica.txt')
+
+
+class GeneradorProgramas:
+    """Genera programas sintéticos derivados de la gramática"""
+
+    def __init__(self, archivo=RUTA_GRAMATICA, semilla=0):
+        self.gramatica, self.inicial = leer_gramatica(archivo)
+        self.random = random.Random(semilla)
+
+        # Producciones de altura mínima, para cerrar derivaciones profundas
+        self.cierre = self._producciones_minimas()
+
+    def _altura(self, produccion, alturas):
+        """Altura mínima del árbol de derivación de una producción"""
+        return 1 + max((alturas[s] if s in self.gramatica else 0) for s in produccion)
+
+    def _producciones_minimas(self):
+        """Para cada no terminal, las producciones que terminan la derivación antes"""
+        alturas = {nt: float('inf') for nt in self.gramatica}
+        cambio = True
+        while cambio:
+            cambio = False
+            for nt, producciones in self.gramatica.items():
+                minima = min(self._altura(p, alturas) for p in producciones)
+                if minima < alturas[nt]:
+                    alturas[nt] = minima
+                    cambio = True
+        return {nt: [p for p in producciones if self._altura(p, alturas) == alturas[nt]]
+                for nt, producciones in self.gramatica.items()}
+
+    def lexema(self, terminal, identificadores):
+        """Lexema concreto para un terminal de la gramática"""
+        if terminal == 'id':
+            return self.random.choice(identificadores)
+        if terminal == 'num':
+            if self.random.random() < 0.2:
+                return f"{self.random.randint(1, 99)}.{self.random.randint(0, 9)}"
+            return str(self.random.randint(1, 99))
+        return terminal
+
+    def derivar(self, simbolo, identificadores, profundidad):
+        """Deriva aleatoriamente un símbolo y retorna la lista de lexemas"""
+        if simbolo not in self.gramatica:
+            return [] if simbolo == 'ε' else [self.lexema(simbolo, identificadores)]
+
+        producciones = self.gramatica[simbolo] if profundidad > 0 else self.cierre[simbolo]
+        produccion = self.random.choice(producciones)
+
+        lexemas = []
+        for s in produccion:
+            lexemas.extend(self.derivar(s, identificadores, profundidad - 1))
+        return lexemas
+
+    def expresion(self, identificadores, profundidad=6):
+        """Expresión aleatoria derivada desde E"""
+        return " ".join(self.derivar('E', identificadores, profundidad))
+
+    def declaraciones(self, n, prefijo='v'):
+        """Líneas de declaración derivadas desde D y nombres declarados"""
+        lineas, nombres = [], []
+        for i in range(n):
+            nombre = f"{prefijo}{i}"
+            produccion = self.random.choice(self.gramatica['D'])
+            lineas.append(" ".join(nombre if s == 'id' else s for s in produccion))
+            nombres.append(nombre)
+        return lineas, nombres
+
+    # Formas de programa
+
+    def muchas_declaraciones(self, n):
+        """n declaraciones y una expresión final"""
+        lineas, nombres = self.declaraciones(n)
+        lineas.append(self.expresion(nombres) + " ;")
+        return "\n".join(lineas)
+
+    def expresion_plana(self, n):
+        """Una asignación con una expresión plana de n operandos"""
+        lineas, nombres = self.declaraciones(16)
+        operandos = [self.lexema(self.random.choice(['id', 'num']), nombres) for _ in range(n)]
+        partes = [operandos[0]]
+        for operando in operandos[1:]:
+            partes.append(self.random.choice('+-*'))
+            partes.append(operando)
+        lineas.append(f"{nombres[0]} = {' '.join(partes)} ;")
+        return "\n".join(lineas)
+
+    def parentesis_anidados(self, profundidad):
+        """Expresión con paréntesis anidados (el parser es recursivo: ~3 marcos por nivel)"""
+        lineas, nombres = self.declaraciones(2)
+        expresion = nombres[1]
+        for i in range(profundidad):
+            expresion = f"( {expresion} + {i + 1} )"
+        lineas.append(f"{nombres[0]} = {expresion} ;")
+        return "\n".join(lineas)
+
+    def reutilizacion(self, n, identificadores=4):
+        """n asignaciones que reutilizan intensamente pocos identificadores"""
+        lineas, nombres = self.declaraciones(identificadores)
+        for _ in range(n):
+            destino = self.random.choice(nombres)
+            lineas.append(f"{destino} = {self.expresion(nombres, 4)} ;")
+        return "\n".join(lineas)
+
+    def archivo_largo(self, n_lineas):
+        """Archivo largo que mezcla declaraciones, asignaciones y expresiones"""
+        lineas, nombres = self.declaraciones(8)
+        while len(lineas) < n_lineas:
+            r = self.random.random()
+            if r < 0.1:
+                nuevas, declarados = self.declaraciones(1, prefijo=f"w{len(lineas)}_")
+                lineas.extend(nuevas)
+                nombres.extend(declarados)
+            elif r < 0.8:
+                destino = self.random.choice(nombres)
+                lineas.append(f"{destino} = {self.expresion(nombres)} ;")
+            else:
+                lineas.append(self.expresion(nombres) + " ;")
+        return "\n".join(lineas)
+
+
+def generar_casos(escala=1.0, semilla=0):
+    """Retorna [(caso, tamaño, fuente)] para la suite del analizador"""
+    generador = GeneradorProgramas(semilla=semilla)
+    n = lambda base: max(1, int(base * escala))
+    return [
+        ('muchas_declaraciones', n(5000), generador.muchas_declaraciones(n(5000))),
+        ('expresion_plana', n(5000), generador.expresion_plana(n(5000))),
+        # La profundidad no escala: la limita la recursión del parser
+        ('parentesis_anidados', 250, generador.parentesis_anidados(250)),
+        ('reutilizacion', n(3000), generador.reutilizacion(n(3000))),
+        ('archivo_largo', n(10000), generador.archivo_largo(n(10000))),
+    ]
@@ -0,0 +1,108 @@
+# benchmarks/medicion.py
+"""
+Utilidades de medición: tiempo, memoria pico y escritura de resultados JSON
+"""
+
+import gc
+import json
+import platform
+import subprocess
+import time
+import tracemalloc
+
+
+def medir_tiempo(funcion, repeticiones=3, recolector=True):
+    """
+    Ejecuta funcion() varias veces y retorna el mejor tiempo en segundos.
+
+    Con recolector=False el recolector de ciclos se pausa durante cada
+    ejecución (como timeit): sus pasadas caen en momentos arbitrarios y
+    dominan la variación al comparar fases que crean muchos objetos.
+    """
+    mejor = float('inf')
+    for _ in range(repeticiones):
+        gc.collect()
+        if not recolector:
+            gc.disable()
+        try:
+            inicio = time.perf_counter()
+            funcion()
+            mejor = min(mejor, time.perf_counter() - inicio)
+        finally:
+            gc.enable()
+    return mejor
+
+
+def medir_tiempos_alternados(funciones, repeticiones=3, recolector=True):
+    """
+    Mejor tiempo de cada función ejecutándolas por turnos, una vuelta por
+    repetición: las perturbaciones del sistema afectan a todas por igual, lo
+    que hace fiable la comparación entre ellas.
+    """
+    mejores = [float('inf')] * len(funciones)
+    for _ in range(repeticiones):
+        for k, funcion in enumerate(funciones):
+            mejores[k] = min(mejores[k], medir_tiempo(funcion, 1, recolector))
+    return mejores
+
+
+def medir_memoria(funcion):
+    """Ejecuta funcion() una vez bajo tracemalloc y retorna la memoria pico en bytes"""
+    gc.collect()
+    tracemalloc.start()
+    try:
+        funcion()
+        _, pico = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return pico
+
+
+def medir(caso, fase, tamano, unidades, funcion, repeticiones=3, recolector=True):
+    """
+    Mide tiempo y memoria pico por separado (tracemalloc distorsiona los tiempos).
+
+    unidades: cantidad procesada por ejecución (tokens, símbolos, instrucciones...)
+    """
+    return resultado(caso, fase, tamano, unidades, medir_tiempo(funcion, repeticiones, recolector),
+                     medir_memoria(funcion))
+
+
+def resultado(caso, fase, tamano, unidades, segundos, pico):
+    """Registro de una medición en el formato de los documentos de resultados"""
+    return {
+        'caso': caso,
+        'fase': fase,
+        'tamano': tamano,
+        'unidades': unidades,
+        'segundos': segundos,
+        'unidades_por_segundo': unidades / segundos if segundos > 0 else None,
+        'memoria_pico_bytes': pico,
+    }
+
+
+def revision_git():
+    """Commit actual del repositorio, o None si no está disponible"""
+    try:
+        salida = subprocess.run(['git', 'rev-parse', 'HEAD'], capture_output=True,
+                                text=True, check=True)
+        return salida.stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def escribir_resultados(ruta, suite, resultados, parametros=None, **extra):
+    """Escribe los resultados en un documento JSON (extra: secciones adicionales)"""
+    documento = {
+        'suite': suite,
+        'commit': revision_git(),
+        'python': platform.python_version(),
+        'plataforma': platform.platform(),
+        'fecha': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'parametros': parametros or {},
+        'resultados': resultados,
+        **extra,
+    }
+    with open(ruta, 'w', encoding='utf-8') as f:
+        json.dump(documento, f, indent=2, ensure_ascii=False)
+    return documento
@@ -0,0 +1,445 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# cache_analisis.py
+"""
+Caché de análisis direccionada por contenido con serialización binaria compacta
+
+La clave es el hash del código fuente junto con la versión del analizador y las
+opciones. Cada entrada guarda los tokens, la tabla de símbolos (con errores y
+advertencias), el AST decorado y el código de tres direcciones como arreglos
+planos (array) y una tabla de cadenas, sin pickle de grafos de objetos. En un
+acierto no se ejecuta ninguna fase: TablaSimbolos, NodoAST y los tokens se
+reconstruyen solo cuando se accede a ellos.
+
+El directorio de caché tiene un tamaño máximo; al superarlo se eliminan las
+entradas usadas menos recientemente (LRU según la fecha de acceso).
+"""
+
+import array
+import hashlib
+import os
+import struct
+import sys
+import time
+from functools import cached_property
+from itertools import accumulate
+
+from nodo_ast import NodoAST
+from tabla_simbolos import TablaSimbolos, Simbolo
+from diagnosticos import Diagnostico
+
+# Cambiar al modificar el análisis o el formato: invalida las entradas anteriores
+VERSION_ANALIZADOR = '3'
+
+MAGIC = b'TSAC'
+VERSION_FORMATO = 1
+EXTENSION = '.tsac'
+
+# Etiquetas de valores
+VALOR_NONE, VALOR_INT, VALOR_FLOAT, VALOR_ENTERO_GRANDE, VALOR_CADENA = range(5)
+
+# Secciones del archivo, en orden: (nombre, typecode)
+SECCIONES = [
+    ('cadenas_longitudes', 'I'), ('cadenas_datos', 'B'),
+    ('tok_tipo', 'I'), ('tok_lexema', 'I'), ('tok_linea', 'I'), ('tok_columna', 'I'),
+    ('val_etiqueta', 'B'), ('val_datos', 'q'), ('val_flotantes', 'd'),
+    ('sim_nombre', 'I'), ('sim_tipo', 'I'), ('sim_alcance', 'i'), ('sim_linea', 'I'),
+    ('sim_valor', 'I'), ('sim_usado', 'B'), ('sim_en_pila', 'B'),
+    ('diag_advertencia', 'B'), ('diag_codigo', 'I'), ('diag_linea', 'I'),
+    ('diag_columna', 'I'), ('diag_nargs', 'I'), ('diag_args', 'I'),
+    ('nodo_etiqueta', 'I'), ('nodo_tipo', 'I'), ('nodo_val', 'I'), ('nodo_linea', 'I'),
+    ('nodo_lugar', 'I'), ('nodo_codigo', 'I'), ('nodo_nhijos', 'I'), ('nodo_hijos', 'I'),
+    ('codigo', 'I'),
+    ('meta', 'q'),
+]
+
+# Campos de la sección meta
+META = ['alcance_actual', 'max_errores', 'contador_temporal', 'busquedas',
+        'fallos_busqueda', 'entradas_alcance', 'salidas_alcance']
+
+_ENCABEZADO = struct.Struct('<4sHB')   # magic, versión, orden de bytes (0=little)
+_SECCION = struct.Struct('<Q')         # cantidad de elementos
+
+
+class _Escritor:
+    """Acumula los arreglos de una entrada durante la serialización"""
+
+    def __init__(self):
+        self.arreglos = {nombre: array.array(tipo) for nombre, tipo in SECCIONES}
+        self._cadenas = {None: 0}
+        self._datos_cadenas = bytearray()
+        self.arreglos['cadenas_longitudes'].append(0)   # id 0 = None
+
+    def cadena(self, texto):
+        """Id de una cadena en la tabla de cadenas (0 = None)"""
+        indice = self._cadenas.get(texto)
+        if indice is None:
+            datos = texto.encode('utf-8')
+            indice = len(self._cadenas)
+            self._cadenas[texto] = indice
+            self.arreglos['cadenas_longitudes'].append(len(datos))
+            self._datos_cadenas += datos
+        return indice
+
+    def valor(self, valor):
+        """Índice de un valor en la tabla de valores"""
+        a = self.arreglos
+        indice = len(a['val_etiqueta'])
+        if valor is None:
+            a['val_etiqueta'].append(VALOR_NONE)
+            a['val_datos'].append(0)
+        elif isinstance(valor, float):
+            a['val_etiqueta'].append(VALOR_FLOAT)
+            a['val_datos'].append(len(a['val_flotantes']))
+            a['val_flotantes'].append(valor)
+        elif isinstance(valor, int):
+            if -2**63 <= valor < 2**63:
+                a['val_etiqueta'].append(VALOR_INT)
+                a['val_datos'].append(valor)
+            else:
+                a['val_etiqueta'].append(VALOR_ENTERO_GRANDE)
+                a['val_datos'].append(self.cadena(str(valor)))
+        else:
+            a['val_etiqueta'].append(VALOR_CADENA)
+            a['val_datos'].append(self.cadena(str(valor)))
+        return indice
+
+    def a_bytes(self):
+        """Serializa todas las secciones"""
+        self.arreglos['cadenas_datos'] = array.array('B', self._datos_cadenas)
+        orden = 0 if sys.byteorder == 'little' else 1
+        partes = [_ENCABEZADO.pack(MAGIC, VERSION_FORMATO, orden)]
+        for nombre, _ in SECCIONES:
+            arreglo = self.arreglos[nombre]
+            partes.append(_SECCION.pack(len(arreglo)))
+            partes.append(arreglo.tobytes())
+        return b''.join(partes)
+
+
+def serializar(tokens, tabla, ast, instrucciones, contador_temporal=0):
+    """Serializa el resultado de un análisis al formato binario"""
+    e = _Escritor()
+    a = e.arreglos
+
+    # Tokens
+    for token in tokens:
+        a['tok_tipo'].append(e.cadena(token['tipo']))
+        a['tok_lexema'].append(e.cadena(token['lexema']))
+        a['tok_linea'].append(token['linea'])
+        a['tok_columna'].append(token.get('columna', 0))
+
+    # Tabla de símbolos (todas las declaraciones, en orden)
+    for nombre, simbolos in tabla.tabla.items():
+        for simbolo in simbolos:
+            a['sim_nombre'].append(e.cadena(nombre))
+            a['sim_tipo'].append(e.cadena(simbolo.tipo))
+            a['sim_alcance'].append(simbolo.alcance)
+            a['sim_linea'].append(simbolo.linea)
+            a['sim_valor'].append(e.valor(simbolo.valor))
+            a['sim_usado'].append(simbolo.usado)
+            en_pila = (simbolo.alcance < len(tabla.pila_alcances)
+                       and tabla.pila_alcances[simbolo.alcance].get(nombre) is simbolo)
+            a['sim_en_pila'].append(en_pila)
+
+    # Diagnósticos
+    for advertencia, diagnosticos in ((0, tabla.errores), (1, tabla.warnings)):
+        for d in diagnosticos:
+            a['diag_advertencia'].append(advertencia)
+            a['diag_codigo'].append(e.cadena(d.codigo))
+            a['diag_linea'].append(d.linea)
+            a['diag_columna'].append(d.columna)
+            a['diag_nargs'].append(len(d.args))
+            a['diag_args'].extend(e.valor(arg) for arg in d.args)
+
+    # AST en postorden; los nodos compartidos (modo DAG) se guardan una vez
+    ids = {}
+    pila = [(ast, False)]
+    while pila:
+        nodo, visitado = pila.pop()
+        if id(nodo) in ids:
+            continue
+        if not visitado:
+            pila.append((nodo, True))
+            pila.extend((hijo, False) for hijo in reversed(nodo.hijos) if id(hijo) not in ids)
+            continue
+        ids[id(nodo)] = len(ids)
+        a['nodo_etiqueta'].append(e.cadena(str(nodo.etiqueta)))
+        a['nodo_tipo'].append(e.cadena(nodo.tipo))
+        a['nodo_val'].append(e.valor(nodo.val))
+        a['nodo_linea'].append(nodo.linea)
+        a['nodo_lugar'].append(e.cadena(nodo.lugar))
+        a['nodo_codigo'].append(e.cadena(nodo.codigo))
+        a['nodo_nhijos'].append(len(nodo.hijos))
+        a['nodo_hijos'].extend(ids[id(hijo)] for hijo in nodo.hijos)
+
+    # Código de tres direcciones
+    a['codigo'].extend(e.cadena(instruccion) for instruccion in instrucciones)
+
+    max_errores = tabla.max_errores if tabla.max_errores is not None else -1
+    a['meta'].extend([tabla.alcance_actual, max_errores, contador_temporal, tabla.busquedas,
+                      tabla.fallos_busqueda, tabla.entradas_alcance, tabla.salidas_alcance])
+    return e.a_bytes()
+
+
+class AnalisisCacheado:
+    """Vista perezosa de un análisis serializado"""
+
+    def __init__(self, datos):
+        """datos: bytes del archivo de caché"""
+        magic, version, orden = _ENCABEZADO.unpack_from(datos, 0)
+        if magic != MAGIC or version != VERSION_FORMATO:
+            raise ValueError("Formato de caché no reconocido")
+        invertir = orden != (0 if sys.byteorder == 'little' else 1)
+
+        vista = memoryview(datos)
+        pos = _ENCABEZADO.size
+        self.arreglos = {}
+        for nombre, tipo in SECCIONES:
+            (cantidad,) = _SECCION.unpack_from(datos, pos)
+            pos += _SECCION.size
+            arreglo = array.array(tipo)
+            fin = pos + cantidad * arreglo.itemsize
+            if fin > len(datos):
+                raise ValueError("Archivo de caché truncado")
+            arreglo.frombytes(vista[pos:fin])
+            if invertir:
+                arreglo.byteswap()
+            self.arreglos[nombre] = arreglo
+            pos = fin
+
+        self._cadenas = {}
+        self._inicios = array.array('Q', accumulate(self.arreglos['cadenas_longitudes'],
+                                                    initial=0))
+        self.meta = dict(zip(META, self.arreglos['meta']))
+
+    def cadena(self, indice):
+        """Decodifica (con memoria) una cadena de la tabla"""
+        if indice == 0:
+            return None
+        texto = self._cadenas.get(indice)
+        if texto is None:
+            datos = self.arreglos['cadenas_datos']
+            texto = datos[self._inicios[indice]:self._inicios[indice + 1]].tobytes().decode('utf-8')
+            self._cadenas[indice] = texto
+        return texto
+
+    def valor(self, indice):
+        """Decodifica un valor de la tabla de valores"""
+        etiqueta = self.arreglos['val_etiqueta'][indice]
+        dato = self.arreglos['val_datos'][indice]
+        if etiqueta == VALOR_INT:
+            return dato
+        if etiqueta == VALOR_FLOAT:
+            return self.arreglos['val_flotantes'][dato]
+        if etiqueta == VALOR_ENTERO_GRANDE:
+            return int(self.cadena(dato))
+        if etiqueta == VALOR_CADENA:
+            return self.cadena(dato)
+        return None
+
+    @cached_property
+    def tokens(self):
+        a = self.arreglos
+        return [{'tipo': self.cadena(t), 'lexema': self.cadena(l), 'linea': n, 'columna': c}
+                for t, l, n, c in zip(a['tok_tipo'], a['tok_lexema'],
+                                      a['tok_linea'], a['tok_columna'])]
+
+    @cached_property
+    def instrucciones(self):
+        return [self.cadena(i) for i in self.arreglos['codigo']]
+
+    @cached_property
+    def codigo(self):
+        return "\n".join(self.instrucciones)
+
+    @cached_property
+    def tabla_simbolos(self):
+        a = self.arreglos
+        meta = self.meta
+        tabla = TablaSimbolos(meta['max_errores'] if meta['max_errores'] >= 0 else None)
+        tabla.alcance_actual = meta['alcance_actual']
+        tabla.pila_alcances = [{} for _ in range(tabla.alcance_actual + 1)]
+        for campo in ('busquedas', 'fallos_busqueda', 'entradas_alcance', 'salidas_alcance'):
+            setattr(tabla, campo, meta[campo])
+
+        for i in range(len(a['sim_nombre'])):
+            nombre = self.cadena(a['sim_nombre'][i])
+            simbolo = Simbolo(nombre, self.cadena(a['sim_tipo'][i]), a['sim_alcance'][i],
+                              a['sim_linea'][i], self.valor(a['sim_valor'][i]))
+            simbolo.usado = bool(a['sim_usado'][i])
+            tabla.tabla.setdefault(nombre, []).append(simbolo)
+            if a['sim_en_pila'][i]:
+                tabla.pila_alcances[simbolo.alcance][nombre] = simbolo
+
+        pos_args = 0
+        for i in range(len(a['diag_codigo'])):
+            nargs = a['diag_nargs'][i]
+            args = tuple(self.valor(v) for v in a['diag_args'][pos_args:pos_args + nargs])
+            pos_args += nargs
+            diagnostico = Diagnostico(self.cadena(a['diag_codigo'][i]), a['diag_linea'][i],
+                                      a['diag_columna'][i], args)
+            (tabla.warnings if a['diag_advertencia'][i] else tabla.errores).append(diagnostico)
+        return tabla
+
+    @cached_property
+    def ast(self):
+        a = self.arreglos
+        nodos = []
+        pos_hijos = 0
+        for i in range(len(a['nodo_etiqueta'])):
+            nhijos = a['nodo_nhijos'][i]
+            hijos = [nodos[j] for j in a['nodo_hijos'][pos_hijos:pos_hijos + nhijos]]
+            pos_hijos += nhijos
+            nodos.append(NodoAST(
+                self.cadena(a['nodo_etiqueta'][i]),
+                hijos=hijos,
+                tipo=self.cadena(a['nodo_tipo'][i]),
+                val=self.valor(a['nodo_val'][i]),
+                linea=a['nodo_linea'][i],
+                lugar=self.cadena(a['nodo_lugar'][i]),
+                codigo=self.cadena(a['nodo_codigo'][i]) or "",
+            ))
+        return nodos[-1] if nodos else None
+
+
+class CacheAnalisis:
+    """Caché de análisis en disco con tamaño máximo y expulsión LRU"""
+
+    def __init__(self, directorio, max_bytes=64 * 1024 * 1024):
+        self.directorio = directorio
+        self.max_bytes = max_bytes
+        self.aciertos = 0
+        self.fallos = 0
+        os.makedirs(directorio, exist_ok=True)
+
+    def clave(self, entrada, dag=False, max_errores=None):
+        """Hash del código fuente, la versión del analizador y las opciones"""
+        h = hashlib.sha256()
+        h.update(f"{VERSION_ANALIZADOR}|{VERSION_FORMATO}|dag={dag}|max={max_errores}|".encode())
+        h.update(entrada.encode('utf-8'))
+        return h.hexdigest()
+
+    def _ruta(self, clave):
+        return os.path.join(self.directorio, clave + EXTENSION)
+
+    def obtener(self, clave):
+        """Retorna el análisis cacheado o None"""
+        ruta = self._ruta(clave)
+        try:
+            with open(ruta, 'rb') as f:
+                datos = f.read()
+            resultado = AnalisisCacheado(datos)
+        except FileNotFoundError:
+            return None
+        except (ValueError, struct.error):
+            # Entrada corrupta o de otro formato: descartarla
+            self._eliminar(ruta)
+            return None
+
+        # La fecha de acceso ordena la expulsión LRU
+        ahora = time.time()
+        os.utime(ruta, (ahora, ahora))
+        return resultado
+
+    def guardar(self, clave, datos):
+        """Escribe una entrada de forma atómica y aplica el límite de tamaño"""
+        ruta = self._ruta(clave)
+        temporal = f"{ruta}.{os.getpid()}.tmp"
+        with open(temporal, 'wb') as f:
+            f.write(datos)
+        os.replace(temporal, ruta)
+        self.expulsar()
+
+    def expulsar(self):
+        """Elimina las entradas menos recientemente usadas hasta respetar max_bytes"""
+        entradas = []
+        total = 0
+        for nombre in os.listdir(self.directorio):
+            if not nombre.endswith(EXTENSION):
+                continue
+            ruta = os.path.join(self.directorio, nombre)
+            try:
+                info = os.stat(ruta)
+            except FileNotFoundError:
+                continue
+            entradas.append((info.st_mtime, info.st_size, ruta))
+            total += info.st_size
+
+        for _, tamano, ruta in sorted(entradas):
+            if total <= self.max_bytes:
+                break
+            self._eliminar(ruta)
+            total -= tamano
+
+    def _eliminar(self, ruta):
+        try:
+            os.remove(ruta)
+        except FileNotFoundError:
+            pass
+
+    def analizar(self, entrada, dag=False, max_errores=None):
+        """
+        Analiza la entrada usando la caché.
+
+        Retorna (resultado, acierto); resultado expone tokens, tabla_simbolos,
+        ast, instrucciones y codigo.
+        """
+        from analizador_completo import analizar
+
+        clave = self.clave(entrada, dag, max_errores)
+        resultado = self.obtener(clave)
+        if resultado is not None:
+            self.aciertos += 1
+            return resultado, True
+
+        self.fallos += 1
+        sintactico, ast, codigo = analizar(entrada, dag=dag, max_errores=max_errores)
+        generador = sintactico.generador
+        datos = serializar(sintactico.tokens, sintactico.tabla_simbolos, ast,
+                           generador.codigo_generado, generador.contador_temporal)
+        self.guardar(clave, datos)
+
+        # El resultado usa los objetos ya construidos
+        resultado = AnalisisCacheado(datos)
+        resultado.__dict__.update(tokens=sintactico.tokens,
+                                  tabla_simbolos=sintactico.tabla_simbolos, ast=ast,
+                                  instrucciones=list(generador.codigo_generado), codigo=codigo)
+        return resultado, False
+
+
+def main():
+    """Función principal"""
+    argumentos = [a for a in sys.argv[1:] if not a.startswith('--')]
+    opciones = dict(a[2:].partition('=')[::2] for a in sys.argv[1:] if a.startswith('--'))
+
+    if not argumentos:
+        print("\n❌ Error: Debe proporcionar un archivo de código")
+        print("Uso: python cache_analisis.py programa.txt [--cache=DIR] [--max-mb=64]")
+        return 1
+
+    directorio = opciones.get('cache') or '.cache_analisis'
+    max_bytes = int(float(opciones.get('max-mb') or 64) * 1024 * 1024)
+    cache = CacheAnalisis(directorio, max_bytes)
+
+    try:
+        with open(argumentos[0], 'r', encoding='utf-8') as f:
+            entrada = f.read()
+        inicio = time.perf_counter()
+        resultado, acierto = cache.analizar(entrada)
+        segundos = time.perf_counter() - inicio
+    except FileNotFoundError:
+        print(f"\n❌ Error: Archivo '{argumentos[0]}' no encontrado")
+        return 1
+    except (ValueError, SyntaxError) as e:
+        print(f"\n❌ ERROR: {e}")
+        return 1
+
+    estado = "✅ Acierto" if acierto else "🆕 Fallo (analizado y guardado)"
+    print(f"{estado} en {segundos * 1000:.2f} ms")
+    print(f"   - Instrucciones: {len(resultado.instrucciones)}")
+    print(f"   - Errores: {len(resultado.tabla_simbolos.errores)}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -2,11 +2,16 @@
 # calcular_conjuntos.py
 """
 Cálculo de conjuntos PRIMEROS, SIGUIENTES y PREDICCIÓN
-para una gramática independiente del contexto
+para una gramática independiente del contexto, y construcción de la tabla LALR(1)
 """
 
 import sys
+import glob
+import json
+import os
+import time
 from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
 
 def leer_gramatica(archivo):
     """Lee la gramática desde un archivo"""
@@ -58,110 +63,164 @@ def obtener_terminales_no_terminales(gramatica):
     return terminales, no_terminales
 
 
+def calcular_anulables(gramatica):
+    """
+    No terminales que derivan ε. Cada producción cuenta sus no terminales aún
+    no anulables; el contador se reduce al descubrir uno (lineal en la gramática).
+    Un símbolo 'ε' corta la producción: lo que sigue no se considera.
+    """
+    anulables = set()
+    pendientes = []                     # [(nt, faltantes)] por producción
+    apariciones = defaultdict(list)     # {no terminal: [producción]}
+    trabajo = []
+    
+    for nt in gramatica:
+        for produccion in gramatica[nt]:
+            prefijo = produccion[:produccion.index('ε')] if 'ε' in produccion else produccion
+            if any(simbolo not in gramatica for simbolo in prefijo):
+                continue
+            pendientes.append([nt, len(prefijo)])
+            for simbolo in prefijo:
+                apariciones[simbolo].append(len(pendientes) - 1)
+            if not prefijo and nt not in anulables:
+                anulables.add(nt)
+                trabajo.append(nt)
+    
+    while trabajo:
+        for p in apariciones[trabajo.pop()]:
+            pendientes[p][1] -= 1
+            nt = pendientes[p][0]
+            if not pendientes[p][1] and nt not in anulables:
+                anulables.add(nt)
+                trabajo.append(nt)
+    
+    return anulables
+
+
+def _bits_a_conjunto(bits, simbolos):
+    """Conjunto de los símbolos cuyos bits están encendidos"""
+    conjunto = set()
+    while bits:
+        bajo = bits & -bits
+        conjunto.add(simbolos[bajo.bit_length() - 1])
+        bits ^= bajo
+    return conjunto
+
+
 def calcular_primeros(gramatica):
-    """Calcula el conjunto PRIMEROS para cada símbolo"""
-    primeros = defaultdict(set)
-    terminales, no_terminales = obtener_terminales_no_terminales(gramatica)
+    """
+    Calcula el conjunto PRIMEROS para cada símbolo.
     
-    # Inicialización: terminales producen a sí mismos
-    for terminal in terminales:
-        primeros[terminal].add(terminal)
+    PRIMEROS(A) es la unión de los terminales que inician sus producciones y de
+    PRIMEROS(B) para cada B que las inicia tras un prefijo anulable: se resuelve
+    con el algoritmo digraph (componentes fuertemente conexas), lineal en la
+    gramática en lugar de un punto fijo que recorre todo hasta estabilizarse.
+    """
+    terminales, _ = obtener_terminales_no_terminales(gramatica)
+    anulables = calcular_anulables(gramatica)
     
-    # Algoritmo iterativo de punto fijo
-    cambio = True
-    while cambio:
-        cambio = False
-        
-        for nt in gramatica:
-            for produccion in gramatica[nt]:
-                # Para cada símbolo en la producción
-                puede_ser_vacio = True
-                
-                for simbolo in produccion:
-                    # Terminal: agregar y terminar
-                    if simbolo not in no_terminales:
-                        antes = len(primeros[nt])
-                        primeros[nt].add(simbolo)
-                        if len(primeros[nt]) > antes:
-                            cambio = True
-                        puede_ser_vacio = False
-                        break
-                    
-                    # No terminal: agregar PRIMEROS(símbolo) - {ε}
-                    antes = len(primeros[nt])
-                    primeros[nt] |= (primeros[simbolo] - {'ε'})
-                    if len(primeros[nt]) > antes:
-                        cambio = True
-                    
-                    # Si no puede derivar ε, terminar
-                    if 'ε' not in primeros[simbolo]:
-                        puede_ser_vacio = False
+    no_terminales = list(gramatica)
+    indice = {nt: i for i, nt in enumerate(no_terminales)}
+    bits = {}
+    simbolos = []
+    iniciales = [0] * len(no_terminales)
+    relacion = [[] for _ in no_terminales]
+    
+    for nt in no_terminales:
+        x = indice[nt]
+        for produccion in gramatica[nt]:
+            for simbolo in produccion:
+                if simbolo == 'ε':
+                    break
+                if simbolo in indice:
+                    relacion[x].append(indice[simbolo])
+                    if simbolo not in anulables:
                         break
-                
-                # Si todos pueden derivar ε, agregar ε a PRIMEROS(nt)
-                if puede_ser_vacio:
-                    if 'ε' not in primeros[nt]:
-                        primeros[nt].add('ε')
-                        cambio = True
+                    continue
+                if simbolo not in bits:
+                    bits[simbolo] = 1 << len(simbolos)
+                    simbolos.append(simbolo)
+                iniciales[x] |= bits[simbolo]
+                break
+    
+    F = _digrafo(relacion, iniciales)
+    
+    primeros = defaultdict(set)
+    # Terminales producen a sí mismos
+    for terminal in terminales:
+        primeros[terminal].add(terminal)
+    for nt in no_terminales:
+        primeros[nt] = _bits_a_conjunto(F[indice[nt]], simbolos)
+        if nt in anulables:
+            primeros[nt].add('ε')
     
     return primeros
 
 
 def calcular_siguientes(gramatica, inicial, primeros):
-    """Calcula el conjunto SIGUIENTES para cada no terminal"""
+    """
+    Calcula el conjunto SIGUIENTES para cada no terminal.
+    
+    Para A -> α B β: SIGUIENTES(B) incluye PRIMEROS(β) - {ε} y, si β puede ser
+    vacía, SIGUIENTES(A). Esa inclusión se resuelve con el algoritmo digraph.
+    """
     siguientes = defaultdict(set)
     
     # Regla 1: $ en SIGUIENTES(S)
-    siguientes[inicial].add('$')
-    
-    # Algoritmo iterativo de punto fijo
-    cambio = True
-    while cambio:
-        cambio = False
-        
-        for nt in gramatica:
-            for produccion in gramatica[nt]:
-                for i, simbolo in enumerate(produccion):
-                    # Solo nos interesan los no terminales
-                    if simbolo not in gramatica:
-                        continue
-                    
-                    # β = símbolos después de este
-                    beta = produccion[i+1:]
-                    
-                    if beta:
-                        # Calcular PRIMEROS(β)
-                        primeros_beta = set()
-                        todo_puede_ser_vacio = True
-                        
-                        for b in beta:
-                            if b in primeros:
-                                primeros_beta |= primeros[b]
-                            else:
-                                primeros_beta.add(b)
-                            
-                            if 'ε' not in primeros.get(b, {b}):
-                                todo_puede_ser_vacio = False
-                                break
-                        
-                        # Agregar PRIMEROS(β) - {ε}
-                        antes = len(siguientes[simbolo])
-                        siguientes[simbolo] |= (primeros_beta - {'ε'})
-                        if len(siguientes[simbolo]) > antes:
-                            cambio = True
-                        
-                        # Si todo β puede ser ε, agregar SIGUIENTES(nt)
-                        if todo_puede_ser_vacio:
-                            antes = len(siguientes[simbolo])
-                            siguientes[simbolo] |= siguientes[nt]
-                            if len(siguientes[simbolo]) > antes:
-                                cambio = True
-                    else:
-                        # No hay β, agregar SIGUIENTES(nt)
-                        antes = len(siguientes[simbolo])
-                        siguientes[simbolo] |= siguientes[nt]
-                        if len(siguientes[simbolo]) > antes:
-                            cambio = True
+    siguientes[inicial]
+    indice = {inicial: 0}
+    no_terminales = [inicial]
+    bits = {'$': 1}
+    simbolos = ['$']
+    iniciales = [1]
+    relacion = [[]]
+    cache = {}
+    
+    def bits_de(simbolo):
+        """Bits de PRIMEROS(símbolo) - {ε}, calculados una vez por símbolo"""
+        if simbolo not in cache:
+            valor = 0
+            for terminal in primeros[simbolo] if simbolo in primeros else (simbolo,):
+                if terminal != 'ε':
+                    if terminal not in bits:
+                        bits[terminal] = 1 << len(simbolos)
+                        simbolos.append(terminal)
+                    valor |= bits[terminal]
+            cache[simbolo] = valor
+        return cache[simbolo]
+    
+    def nodo(simbolo):
+        if simbolo not in indice:
+            siguientes[simbolo]
+            indice[simbolo] = len(no_terminales)
+            no_terminales.append(simbolo)
+            iniciales.append(0)
+            relacion.append([])
+        return indice[simbolo]
+    
+    for nt in gramatica:
+        for produccion in gramatica[nt]:
+            for i, simbolo in enumerate(produccion):
+                # Solo nos interesan los no terminales
+                if simbolo not in gramatica:
+                    continue
+                x = nodo(simbolo)
+                
+                # PRIMEROS(β) - {ε}, con β = símbolos después de este
+                todo_puede_ser_vacio = True
+                for b in produccion[i+1:]:
+                    iniciales[x] |= bits_de(b)
+                    if 'ε' not in primeros.get(b, {b}):
+                        todo_puede_ser_vacio = False
+                        break
+                
+                # Si todo β puede ser ε, SIGUIENTES(nt) ⊆ SIGUIENTES(símbolo)
+                if todo_puede_ser_vacio:
+                    relacion[x].append(nodo(nt))
+    
+    F = _digrafo(relacion, iniciales)
+    for x, nt in enumerate(no_terminales):
+        siguientes[nt] = _bits_a_conjunto(F[x], simbolos)
     
     return siguientes
 
@@ -244,6 +303,415 @@ def verificar_recursion_izquierda(gramatica):
     return problemas
 
 
+def verificar_ll1(gramatica, prediccion):
+    """Retorna los conflictos LL(1): [(nt, prod1, prod2, interseccion)]"""
+    conflictos = []
+    
+    for nt in gramatica:
+        producciones = gramatica[nt]
+        
+        # Producciones que predice cada terminal: solo se cruzan los pares que
+        # comparten alguno (evita comparar todos los pares de alternativas)
+        por_terminal = defaultdict(list)
+        for i, p in enumerate(producciones):
+            for terminal in prediccion[(nt, tuple(p))]:
+                por_terminal[terminal].append(i)
+        
+        intersecciones = defaultdict(set)
+        for terminal, indices in por_terminal.items():
+            for a in range(len(indices)):
+                for b in range(a+1, len(indices)):
+                    intersecciones[(indices[a], indices[b])].add(terminal)
+        
+        for i, j in sorted(intersecciones):
+            conflictos.append((nt, producciones[i], producciones[j], intersecciones[(i, j)]))
+    
+    return conflictos
+
+
+class TablaLALR:
+    """
+    Tabla LALR(1): acciones[estado][terminal] e ir_a[estado][no_terminal].
+    
+    Acciones: ('d', estado) desplazar, ('r', producción) reducir, ('a', 0) aceptar.
+    La producción 0 es la aumentada S' -> S.
+    """
+    
+    def __init__(self, producciones, inicial, terminales, no_terminales):
+        self.producciones = producciones      # [(nt, (símbolos...))]
+        self.inicial = inicial
+        self.terminales = terminales
+        self.no_terminales = no_terminales
+        self.nucleos = []                     # ítems núcleo [(producción, punto)] por estado
+        self.acciones = []                    # [{terminal: (tipo, argumento)}]
+        self.ir_a = []                        # [{no_terminal: estado}]
+        self.conflictos = []                  # [(estado, terminal, elegida, descartada)]
+    
+    def accion(self, estado, terminal):
+        """Acción para (estado, terminal) o None si es un error"""
+        return self.acciones[estado].get(terminal)
+    
+    def describir(self, produccion):
+        """Texto de una producción: 'E -> E + T' (ε si es vacía)"""
+        nt, derecha = self.producciones[produccion]
+        return f"{nt} -> {' '.join(derecha) or 'ε'}"
+    
+    def es_lalr1(self):
+        """True si la construcción no encontró conflictos"""
+        return not self.conflictos
+
+
+def aumentar_gramatica(gramatica, inicial):
+    """Lista de producciones con S' -> S en la posición 0 (ε como cadena vacía)"""
+    aumentado = inicial + "'"
+    while aumentado in gramatica:
+        aumentado += "'"
+    
+    producciones = [(aumentado, (inicial,))]
+    for nt in gramatica:
+        for produccion in gramatica[nt]:
+            producciones.append((nt, tuple(s for s in produccion if s != 'ε')))
+    return producciones
+
+
+def _digrafo(relacion, iniciales):
+    """
+    Algoritmo digraph de DeRemer y Pennello (iterativo):
+    F(x) = iniciales[x] ∪ ⋃{F(y) : x R y}, con conjuntos como bits de un int
+    """
+    n = len(iniciales)
+    F = list(iniciales)
+    marca = [0] * n
+    infinito = n + 1
+    pila = []
+    
+    for origen in range(n):
+        if marca[origen]:
+            continue
+        pila.append(origen)
+        marca[origen] = len(pila)
+        llamadas = [[origen, 0, len(pila)]]
+        
+        while llamadas:
+            marco = llamadas[-1]
+            x, k, profundidad = marco
+            sucesores = relacion[x]
+            if k < len(sucesores):
+                marco[1] = k + 1
+                y = sucesores[k]
+                if marca[y] == 0:
+                    pila.append(y)
+                    marca[y] = len(pila)
+                    llamadas.append([y, 0, len(pila)])
+                else:
+                    marca[x] = min(marca[x], marca[y])
+                    F[x] |= F[y]
+                continue
+            
+            # x terminado: cerrar su componente fuertemente conexa
+            llamadas.pop()
+            if marca[x] == profundidad:
+                while True:
+                    z = pila.pop()
+                    marca[z] = infinito
+                    F[z] = F[x]
+                    if z == x:
+                        break
+            if llamadas:
+                padre = llamadas[-1][0]
+                marca[padre] = min(marca[padre], marca[x])
+                F[padre] |= F[x]
+    
+    return F
+
+
+def construir_lalr(gramatica, inicial, primeros=None):
+    """
+    Construye la tabla LALR(1): colección canónica LR(0) y lookaheads por el
+    método de DeRemer y Pennello (relaciones reads, includes y lookback sobre
+    las transiciones de no terminales; los anulables salen de PRIMEROS).
+    """
+    if primeros is None:
+        primeros = calcular_primeros(gramatica)
+    
+    producciones = aumentar_gramatica(gramatica, inicial)
+    terminales, no_terminales = obtener_terminales_no_terminales(gramatica)
+    tabla = TablaLALR(producciones, inicial, terminales, no_terminales)
+    
+    por_nt = defaultdict(list)
+    for i, (nt, _) in enumerate(producciones):
+        por_nt[nt].append(i)
+    anulables = {nt for nt in gramatica if 'ε' in primeros[nt]}
+    
+    # No terminales que pueden iniciar cada no terminal (para la cerradura LR(0))
+    esquinas = {nt: {producciones[q][1][0] for q in por_nt[nt]
+                     if producciones[q][1] and producciones[q][1][0] in por_nt}
+                for nt in por_nt}
+    
+    # Colección canónica de conjuntos de ítems LR(0), identificados por su núcleo
+    indices = {}
+    nucleos = []
+    transiciones = []
+    
+    def estado_de(nucleo):
+        nucleo = tuple(sorted(nucleo))
+        if nucleo not in indices:
+            indices[nucleo] = len(nucleos)
+            nucleos.append(nucleo)
+            transiciones.append({})
+        return indices[nucleo]
+    
+    estado_de([(0, 0)])
+    i = 0
+    while i < len(nucleos):
+        # Cerradura LR(0): el núcleo más las producciones de los no terminales alcanzables
+        cierre = list(nucleos[i])
+        vistos = {producciones[p][1][punto] for p, punto in nucleos[i]
+                  if punto < len(producciones[p][1]) and producciones[p][1][punto] in por_nt}
+        pendientes = sorted(vistos)
+        while pendientes:
+            nt = pendientes.pop()
+            cierre.extend((q, 0) for q in por_nt[nt])
+            for siguiente in esquinas[nt] - vistos:
+                vistos.add(siguiente)
+                pendientes.append(siguiente)
+        
+        # ir_a(I, X) para cada símbolo X después del punto
+        siguientes_nucleos = {}
+        for p, punto in cierre:
+            derecha = producciones[p][1]
+            if punto < len(derecha):
+                siguientes_nucleos.setdefault(derecha[punto], []).append((p, punto + 1))
+        for simbolo, nucleo in siguientes_nucleos.items():
+            transiciones[i][simbolo] = estado_de(nucleo)
+        i += 1
+    
+    # Terminales como bits de un entero
+    orden_terminales = sorted(terminales) + ['$']
+    bit = {t: 1 << k for k, t in enumerate(orden_terminales)}
+    
+    # Transiciones de no terminales (p, A) y conjuntos DR: terminales desplazables tras A
+    numero = {}
+    lecturas_directas = []
+    for p, salidas in enumerate(transiciones):
+        for simbolo, r in salidas.items():
+            if simbolo in por_nt:
+                numero[(p, simbolo)] = len(lecturas_directas)
+                conjunto = 0
+                for t, _ in transiciones[r].items():
+                    if t in bit:
+                        conjunto |= bit[t]
+                lecturas_directas.append(conjunto)
+    
+    # El símbolo inicial va seguido del fin de la entrada
+    lecturas_directas[numero[(0, inicial)]] |= bit['$']
+    
+    # reads: (p, A) lee (r, C) si r = ir_a(p, A) y C es anulable
+    lee = [[] for _ in lecturas_directas]
+    for (p, simbolo), x in numero.items():
+        r = transiciones[p][simbolo]
+        for c in transiciones[r]:
+            if c in anulables:
+                lee[x].append(numero[(r, c)])
+    lecturas = _digrafo(lee, lecturas_directas)
+    
+    # includes y lookback recorriendo cada producción desde cada transición (p, B)
+    anulable_desde = []
+    for _, derecha in producciones:
+        k = len(derecha)
+        while k > 0 and derecha[k - 1] in anulables:
+            k -= 1
+        anulable_desde.append(k)
+    
+    incluye = [[] for _ in lecturas_directas]
+    retrocede = defaultdict(list)    # (estado, producción) -> [transición]
+    for (p, b), x in numero.items():
+        for q in por_nt[b]:
+            derecha = producciones[q][1]
+            r = p
+            for k, simbolo in enumerate(derecha):
+                if simbolo in por_nt and k + 1 >= anulable_desde[q]:
+                    incluye[numero[(r, simbolo)]].append(x)
+                r = transiciones[r][simbolo]
+            retrocede[(r, q)].append(x)
+    siguientes = _digrafo(incluye, lecturas)
+    
+    # Reducciones por estado: LA(q, A -> ω) = ⋃ Follow(p, A) con lookback
+    reducciones = [defaultdict(int) for _ in nucleos]
+    for (q, p), origenes in retrocede.items():
+        for x in origenes:
+            reducciones[q][p] |= siguientes[x]
+    reducciones[transiciones[0][inicial]][0] |= bit['$']
+    
+    # Tabla de acciones e ir_a
+    tabla.nucleos = nucleos
+    for i in range(len(nucleos)):
+        acciones = {}
+        ir_a = {}
+        
+        for simbolo, j in transiciones[i].items():
+            if simbolo in por_nt:
+                ir_a[simbolo] = j
+            else:
+                acciones[simbolo] = ('d', j)
+        
+        for p in sorted(reducciones[i]):
+            conjunto = reducciones[i][p]
+            nueva = ('a', 0) if p == 0 else ('r', p)
+            for k, a in enumerate(orden_terminales):
+                if not conjunto >> k & 1:
+                    continue
+                existente = acciones.get(a)
+                if existente is None or existente == nueva:
+                    acciones[a] = nueva
+                    continue
+                # Desplazar gana sobre reducir; entre reducciones, la primera producción
+                if existente[0] == 'd' or existente[1] < nueva[1]:
+                    tabla.conflictos.append((i, a, existente, nueva))
+                else:
+                    tabla.conflictos.append((i, a, nueva, existente))
+                    acciones[a] = nueva
+        
+        tabla.acciones.append(acciones)
+        tabla.ir_a.append(ir_a)
+    
+    return tabla
+
+
+def _ordenar(conjunto):
+    """Ordena un conjunto como en los reportes: $ y ε al final"""
+    return sorted(conjunto, key=lambda x: (x == '$', x == 'ε', x))
+
+
+def analizar_gramatica(archivo):
+    """
+    Calcula PRIMEROS, SIGUIENTES, PREDICCIÓN y el veredicto LL(1) de un archivo.
+    
+    Retorna un diccionario serializable en JSON con los conjuntos y los
+    tiempos de cada fase; si falla, el diccionario contiene 'error'.
+    """
+    tiempos = {}
+    inicio_total = time.perf_counter()
+    
+    try:
+        inicio = time.perf_counter()
+        gramatica, inicial = leer_gramatica(archivo)
+        tiempos['lectura'] = time.perf_counter() - inicio
+        
+        inicio = time.perf_counter()
+        primeros = calcular_primeros(gramatica)
+        tiempos['primeros'] = time.perf_counter() - inicio
+        
+        inicio = time.perf_counter()
+        siguientes = calcular_siguientes(gramatica, inicial, primeros)
+        tiempos['siguientes'] = time.perf_counter() - inicio
+        
+        inicio = time.perf_counter()
+        prediccion = calcular_prediccion(gramatica, primeros, siguientes)
+        tiempos['prediccion'] = time.perf_counter() - inicio
+        
+        inicio = time.perf_counter()
+        conflictos = verificar_ll1(gramatica, prediccion)
+        tiempos['ll1'] = time.perf_counter() - inicio
+        
+        inicio = time.perf_counter()
+        tabla = construir_lalr(gramatica, inicial, primeros)
+        tiempos['lalr'] = time.perf_counter() - inicio
+    except Exception as e:
+        return {
+            'archivo': archivo,
+            'error': f"{type(e).__name__}: {e}",
+            'tiempos': tiempos,
+            'segundos': time.perf_counter() - inicio_total,
+        }
+    
+    return {
+        'archivo': archivo,
+        'inicial': inicial,
+        'primeros': {nt: _ordenar(c) for nt, c in primeros.items() if nt in gramatica},
+        'siguientes': {nt: _ordenar(c) for nt, c in siguientes.items()},
+        'prediccion': {f"{nt} -> {' '.join(prod)}": _ordenar(c)
+                       for (nt, prod), c in prediccion.items()},
+        'es_ll1': not conflictos,
+        'conflictos': [
+            {
+                'no_terminal': nt,
+                'produccion1': ' '.join(p1),
+                'produccion2': ' '.join(p2),
+                'interseccion': _ordenar(interseccion),
+            }
+            for nt, p1, p2, interseccion in conflictos
+        ],
+        'es_lalr1': tabla.es_lalr1(),
+        'estados_lalr': len(tabla.nucleos),
+        'conflictos_lalr': len(tabla.conflictos),
+        'tiempos': tiempos,
+        'segundos': time.perf_counter() - inicio_total,
+    }
+
+
+def expandir_archivos(patrones):
+    """Expande patrones glob (los que no coinciden se dejan tal cual)"""
+    archivos = []
+    for patron in patrones:
+        coincidencias = sorted(glob.glob(patron, recursive=True))
+        archivos.extend(coincidencias if coincidencias else [patron])
+    return archivos
+
+
+def analizar_lote(archivos, procesos=None):
+    """Analiza muchas gramáticas en un pool de procesos; retorna el documento JSON"""
+    inicio = time.perf_counter()
+    procesos = procesos or os.cpu_count() or 1
+    
+    if procesos == 1 or len(archivos) <= 1:
+        resultados = [analizar_gramatica(archivo) for archivo in archivos]
+    else:
+        # Lotes grandes por tarea para amortizar la comunicación entre procesos
+        tamano_lote = max(1, len(archivos) // (procesos * 4))
+        with ProcessPoolExecutor(max_workers=procesos) as pool:
+            resultados = list(pool.map(analizar_gramatica, archivos, chunksize=tamano_lote))
+    
+    return {
+        'gramaticas': len(resultados),
+        'll1': sum(1 for r in resultados if r.get('es_ll1')),
+        'errores': sum(1 for r in resultados if 'error' in r),
+        'procesos': procesos,
+        'segundos': time.perf_counter() - inicio,
+        'resultados': resultados,
+    }
+
+
+def main_lote(argumentos):
+    """Modo lote: --lote archivo|glob ... [--procesos=N] [--salida=ruta.json]"""
+    opciones = {}
+    patrones = []
+    for argumento in argumentos:
+        if argumento.startswith('--'):
+            nombre, _, valor = argumento[2:].partition('=')
+            opciones[nombre] = valor
+        else:
+            patrones.append(argumento)
+    
+    archivos = expandir_archivos(patrones)
+    if not archivos:
+        print("Uso: python calculador_conjuntos.py --lote archivo|glob ... "
+              "[--procesos=N] [--salida=ruta.json]", file=sys.stderr)
+        return 1
+    
+    procesos = int(opciones['procesos']) if opciones.get('procesos') else None
+    documento = analizar_lote(archivos, procesos)
+    texto = json.dumps(documento, ensure_ascii=False, indent=2)
+    
+    if opciones.get('salida'):
+        with open(opciones['salida'], 'w', encoding='utf-8') as f:
+            f.write(texto)
+    else:
+        print(texto)
+    
+    return 1 if documento['errores'] else 0
+
+
 def imprimir_conjunto(nombre, conjunto, width=80):
     """Imprime un conjunto de forma legible"""
     print(f"\n{nombre}")
@@ -269,6 +737,9 @@ def imprimir_prediccion(prediccion, width=80):
 
 def main():
     """Función principal"""
+    if '--lote' in sys.argv[1:]:
+        return main_lote([a for a in sys.argv[1:] if a != '--lote'])
+    
     print("="*80)
     print(" CÁLCULO DE CONJUNTOS: PRIMEROS, SIGUIENTES Y PREDICCIÓN ".center(80, "="))
     print("="*80)
@@ -276,9 +747,12 @@ def main():
     if len(sys.argv) < 2:
         print("\n❌ Error: Debe proporcionar un archivo de gramática")
         print("Uso: python calcular_conjuntos.py gramatica.txt")
+        print("     python calcular_conjuntos.py gramatica.txt [--generar=parser.py]")
+        print("     python calcular_conjuntos.py --lote archivo|glob ... [--procesos=N] [--salida=ruta.json]")
         return 1
     
     archivo = sys.argv[1]
+    generar = next((a.partition('=')[2] for a in sys.argv[2:] if a.startswith('--generar=')), None)
     
     try:
         # Leer gramática
@@ -336,31 +810,46 @@ def main():
         print(f"\n🎯 VERIFICACIÓN LL(1)")
         print("="*80)
         
-        es_ll1 = True
-        for nt in gramatica:
-            producciones = gramatica[nt]
-            conjuntos_pred = [prediccion[(nt, tuple(p))] for p in producciones]
-            
-            # Verificar intersección vacía entre producciones
-            for i in range(len(conjuntos_pred)):
-                for j in range(i+1, len(conjuntos_pred)):
-                    interseccion = conjuntos_pred[i] & conjuntos_pred[j]
-                    if interseccion:
-                        es_ll1 = False
-                        prod1 = ' '.join(producciones[i])
-                        prod2 = ' '.join(producciones[j])
-                        print(f"❌ Conflicto en {nt}:")
-                        print(f"   {nt} -> {prod1}")
-                        print(f"   {nt} -> {prod2}")
-                        print(f"   Intersección: {interseccion}")
-        
-        if es_ll1:
+        conflictos = verificar_ll1(gramatica, prediccion)
+        for nt, prod1, prod2, interseccion in conflictos:
+            print(f"❌ Conflicto en {nt}:")
+            print(f"   {nt} -> {' '.join(prod1)}")
+            print(f"   {nt} -> {' '.join(prod2)}")
+            print(f"   Intersección: {interseccion}")
+        
+        if not conflictos:
             print("✅ La gramática es LL(1)")
         else:
             print("\n❌ La gramática NO es LL(1)")
         
         print("="*80)
         
+        # Construcción LALR(1): admite la gramática con recursión izquierda
+        tabla = construir_lalr(gramatica, inicial, primeros)
+        print(f"\n🎯 CONSTRUCCIÓN LALR(1)")
+        print("="*80)
+        print(f"  Estados: {len(tabla.nucleos)}")
+        for estado, terminal, elegida, descartada in tabla.conflictos:
+            tipo = "desplazar/reducir" if elegida[0] == 'd' else "reducir/reducir"
+            print(f"❌ Conflicto {tipo} en estado {estado} con '{terminal}':")
+            print(f"   se elige {elegida}, se descarta {descartada}")
+        
+        if tabla.es_lalr1():
+            print("✅ La gramática es LALR(1)")
+        else:
+            print("\n❌ La gramática NO es LALR(1)")
+        
+        print("="*80)
+        
+        if generar:
+            # Importación diferida: generador_parser depende de este módulo
+            from generador_parser import generar_modulo
+            # Generar antes de abrir: si la gramática no es LL(1) no queda un archivo vacío
+            codigo = generar_modulo(gramatica, inicial, primeros, origen=archivo)
+            with open(generar, 'w', encoding='utf-8') as f:
+                f.write(codigo)
+            print(f"\n📄 Analizador generado en {generar}")
+        
     except FileNotFoundError:
         print(f"\n❌ Error: Archivo '{archivo}' no encontrado")
         return 1
@@ -0,0 +1,223 @@
+#!/usr/bin/env python3
+# compilacion_flujo.py
+"""
+Compilación en flujo, una sentencia a la vez
+
+El léxico lee la entrada línea por línea (los tokens nunca cruzan un salto de
+línea) y el analizador solo guarda los tokens de la sentencia en curso. Cada
+sentencia se analiza y valida contra la tabla de símbolos, su código de tres
+direcciones se escribe en el sumidero y su AST se descarta, así que la memoria
+pico depende de la sentencia más grande y de la tabla de símbolos, no del
+tamaño del archivo.
+
+Tras el primer error ya no se escribe código (el sumidero queda con el código
+de las sentencias anteriores), pero el análisis continúa para reportar todos
+los errores.
+"""
+
+import io
+import sys
+
+from analizador_completo import (AnalizadorLexico, AnalizadorSintactico, GeneradorCodigoMedido,
+                                 registrar_contadores)
+from diagnosticos import ErrorSintactico, LimiteErroresAlcanzado
+from estadisticas import Estadisticas
+from nodo_ast import NodoAST
+
+
+class LexicoFlujo(AnalizadorLexico):
+    """
+    Analizador léxico sobre un iterable de líneas (archivo abierto, lista...);
+    cada elemento es una línea, termine o no en salto de línea
+    """
+
+    def __init__(self, lineas):
+        super().__init__('')
+        self.lineas = iter(lineas)
+        self.sin_salto = False
+
+    def siguiente_token(self):
+        """Siguiente token, leyendo una línea nueva cuando se agota la actual"""
+        while True:
+            token = super().siguiente_token()
+            if token is not None:
+                return token
+            linea = next(self.lineas, None)
+            if linea is None:
+                return None
+            if self.sin_salto:
+                # La línea anterior no terminaba en salto: el léxico no la contó
+                self.linea_actual += 1
+            self.sin_salto = not linea.endswith('\n')
+            self.cadena = linea
+            self.pos = 0
+            self.inicio_linea = 0
+
+
+class AnalizadorFlujo(AnalizadorSintactico):
+    """Analizador que emite el código de cada sentencia y descarta su AST"""
+
+    def __init__(self, lexico, sumidero, **opciones):
+        if opciones.get('dag'):
+            # El DAG comparte nodos entre sentencias: retendría todo el programa
+            raise ValueError("El modo DAG no está disponible en la compilación en flujo")
+        super().__init__([], **opciones)
+        self.lexico = lexico
+        self.sumidero = sumidero
+        self.total_tokens = 0
+        self.instrucciones = 0     # instrucciones emitidas (escritas o no)
+        self.sentencias = 0
+
+    def llenar(self):
+        """Descarta los tokens consumidos y lee hasta el siguiente PUNTOCOMA (o el final)"""
+        del self.tokens[:self.pos]
+        self.pos = 0
+        if any(token['tipo'] == 'PUNTOCOMA' for token in self.tokens):
+            return
+        while True:
+            token = self.lexico.siguiente_token()
+            if token is None:
+                return
+            self.tokens.append(token)
+            self.total_tokens += 1
+            if token['tipo'] == 'PUNTOCOMA':
+                return
+
+    def emitir(self):
+        """Escribe el código pendiente en el sumidero (solo si no hubo errores)"""
+        codigo = self.generador.codigo_generado
+        if codigo:
+            if not self.tabla_simbolos.tiene_errores():
+                self.sumidero.write("\n".join(codigo) + "\n")
+            self.instrucciones += len(codigo)
+            codigo.clear()
+
+    def parsear(self, al_sentencia=None):
+        """
+        Compila la entrada completa; al_sentencia(nodo) recibe cada AST antes
+        de descartarlo. Retorna un nodo Programa vacío con el número de sentencias.
+        """
+        try:
+            while True:
+                self.llenar()
+                # Caracteres no reconocidos en las líneas recién leídas
+                errores, self.lexico.errores = self.lexico.errores, []
+                for error in errores:
+                    self.tabla_simbolos.reportar_error(error.codigo, error.linea, *error.args,
+                                                       columna=error.columna)
+                if not self.actual():
+                    break
+                pos_inicio = self.pos
+                try:
+                    nodo = self.parsear_sentencia()
+                except ErrorSintactico as e:
+                    if not self.recuperar:
+                        raise
+                    self.tabla_simbolos.reportar_error(
+                        e.diagnostico.codigo, e.diagnostico.linea, *e.diagnostico.args,
+                        columna=e.diagnostico.columna
+                    )
+                    self.sincronizar(pos_inicio)
+                    nodo = None
+
+                self.emitir()
+                if nodo:
+                    self.sentencias += 1
+                    if al_sentencia:
+                        al_sentencia(nodo)
+        except LimiteErroresAlcanzado:
+            # Se alcanzó el máximo de errores: detener el análisis
+            pass
+
+        self.emitir()
+        return NodoAST("Programa", tipo='void', sentencias=self.sentencias)
+
+
+def compilar_flujo(lineas, sumidero, estadisticas=None, al_sentencia=None, **opciones):
+    """
+    Compila un iterable de líneas escribiendo el código en sumidero (objeto
+    con write). Retorna el analizador (tabla_simbolos, sentencias, instrucciones).
+    """
+    if isinstance(lineas, str):
+        lineas = io.StringIO(lineas)
+    sintactico = AnalizadorFlujo(LexicoFlujo(lineas), sumidero, **opciones)
+
+    if estadisticas is None:
+        sintactico.parsear(al_sentencia)
+        return sintactico
+
+    sintactico.generador = GeneradorCodigoMedido()
+    with estadisticas.fase('compilacion_flujo'):
+        sintactico.parsear(al_sentencia)
+    registrar_contadores(estadisticas, sintactico)
+    estadisticas.contadores.update({
+        'tokens': sintactico.total_tokens,
+        'instrucciones': sintactico.instrucciones,
+        'sentencias': sintactico.sentencias,
+    })
+    return sintactico
+
+
+def main():
+    """Función principal"""
+    argumentos = [a for a in sys.argv if not a.startswith('--')]
+    opciones = {}
+    for argumento in sys.argv[1:]:
+        if argumento.startswith('--'):
+            nombre, _, valor = argumento[2:].partition('=')
+            opciones[nombre] = valor
+
+    if len(argumentos) < 2:
+        print("Uso: python compilacion_flujo.py programa.txt [salida.tac] "
+              "[--persistente] [--max-errores=N] [--stats]")
+        return 1
+
+    # Con salida a archivo el reporte va a la consola; si no, a stderr
+    reporte = sys.stdout if len(argumentos) > 2 else sys.stderr
+    estadisticas = Estadisticas() if 'stats' in opciones else None
+    max_errores = int(opciones['max-errores']) if opciones.get('max-errores') else None
+
+    salida = open(argumentos[2], 'w', encoding='utf-8') if len(argumentos) > 2 else sys.stdout
+    try:
+        with open(argumentos[1], 'r', encoding='utf-8') as entrada:
+            sintactico = compilar_flujo(entrada, salida, estadisticas,
+                                        max_errores=max_errores,
+                                        persistente='persistente' in opciones)
+    except ValueError as e:
+        print(f"\n❌ ERROR: {e}", file=reporte)
+        return 1
+    finally:
+        if salida is not sys.stdout:
+            salida.close()
+        else:
+            salida.flush()
+
+    tabla = sintactico.tabla_simbolos
+    print("="*80, file=reporte)
+    print(" COMPILACIÓN EN FLUJO ".center(80, "="), file=reporte)
+    print("="*80, file=reporte)
+    print(f"📄 Archivo: {argumentos[1]}", file=reporte)
+    print(f"   - Sentencias: {sintactico.sentencias}", file=reporte)
+    print(f"   - Tokens: {sintactico.total_tokens}", file=reporte)
+    print(f"   - Instrucciones: {sintactico.instrucciones}", file=reporte)
+
+    tabla.salir_alcance()
+    for diagnostico in tabla.errores:
+        print(f"❌ {diagnostico}", file=reporte)
+    for diagnostico in tabla.warnings:
+        print(f"⚠️  {diagnostico}", file=reporte)
+
+    if estadisticas:
+        estadisticas.finalizar()
+        print(estadisticas.a_json(), file=reporte)
+
+    if tabla.tiene_errores():
+        print("\n❌ COMPILACIÓN FALLIDA - el código de salida está incompleto", file=reporte)
+        return 1
+    print("\n✅ COMPILACIÓN EXITOSA", file=reporte)
+    print("="*80, file=reporte)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,197 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# compilador_python.py
+"""
+Compilación del código de tres direcciones a funciones nativas de Python
+
+Cada programa se traduce a una única función cuyas variables y temporales son
+variables locales. El código fuente generado se compila una sola vez con
+compile() y se guarda en caché según el hash del programa, de modo que las
+ejecuciones repetidas corren a velocidad de bytecode de CPython.
+
+La semántica de tipos es la misma de la máquina virtual (maquina_virtual.py).
+"""
+
+import hashlib
+import math
+import sys
+from collections import OrderedDict
+from maquina_virtual import (MaquinaVirtual, convertir_valor, literal_numerico,
+                             OP_SUMA, OP_RESTA, OP_MUL, OP_DIV, OP_DIV_ENTERA,
+                             OP_COPIA, OP_A_INT)
+
+SIMBOLOS_OPERADOR = {OP_SUMA: '+', OP_RESTA: '-', OP_MUL: '*', OP_DIV: '/'}
+
+# Caché LRU de programas compilados: {hash: ProgramaPython}
+CAPACIDAD_CACHE = 256
+_cache_programas = OrderedDict()
+
+
+def hash_programa(codigo):
+    """Calcula el hash del código de tres direcciones"""
+    if not isinstance(codigo, str):
+        codigo = "\n".join(codigo)
+    return hashlib.sha256(codigo.encode('utf-8')).hexdigest()
+
+
+class ProgramaPython:
+    """Programa de tres direcciones compilado a una función de Python"""
+
+    def __init__(self, codigo):
+        self.maquina = MaquinaVirtual(codigo)
+        self.variables = list(self.maquina.variables)
+        self.constantes = {}      # constantes no representables como literal
+        self._slots_constantes = set(self.maquina.constantes.values())
+        self.fuente = self._generar_fuente()
+
+        espacio = {'ZeroDivisionError': ZeroDivisionError}
+        espacio.update(self.constantes)
+        exec(compile(self.fuente, '<programa-tres-direcciones>', 'exec'), espacio)
+        self.funcion = espacio['programa']
+
+        # Valores por defecto y posición de las variables declaradas
+        self._por_defecto = [self.maquina.memoria_inicial[self.maquina.slots[nombre]]
+                             for nombre in self.variables]
+        self._posiciones = {nombre: i for i, nombre in enumerate(self.variables)}
+
+    def _referencia(self, slot):
+        """Expresión de Python para leer un slot"""
+        maquina = self.maquina
+        if slot in self._slots_constantes:
+            valor = maquina.memoria_inicial[slot]
+            if isinstance(valor, float) and not math.isfinite(valor):
+                nombre = f"c{slot}"
+                self.constantes[nombre] = valor
+                return nombre
+            return repr(valor)
+        return f"s{slot}"
+
+    def _generar_fuente(self):
+        """Genera el código fuente de la función"""
+        maquina = self.maquina
+        parametros = [f"s{maquina.slots[nombre]}" for nombre in self.variables]
+        lineas = [f"def programa({', '.join(parametros)}):"]
+
+        for op, d, a, b, indice in maquina.instrucciones:
+            destino = f"s{d}"
+            izq = self._referencia(a)
+            der = self._referencia(b)
+            lineas.append(f"    # {maquina.fuente[indice]}")
+
+            if op in (OP_DIV, OP_DIV_ENTERA):
+                mensaje = f"Instrucción {indice + 1} ({maquina.fuente[indice]}): División por cero"
+                lineas.append(f"    if not {der}:")
+                lineas.append(f"        raise ZeroDivisionError({mensaje!r})")
+
+            if op in SIMBOLOS_OPERADOR:
+                lineas.append(f"    {destino} = {izq} {SIMBOLOS_OPERADOR[op]} {der}")
+            elif op == OP_DIV_ENTERA:
+                # División entera con truncamiento hacia cero
+                # (cociente y signo en locales: destino puede ser un operando)
+                lineas.append(f"    cociente = abs({izq}) // abs({der})")
+                lineas.append(f"    {destino} = cociente if ({izq} < 0) == ({der} < 0) else -cociente")
+            elif op == OP_COPIA:
+                lineas.append(f"    {destino} = {izq}")
+            elif op == OP_A_INT:
+                lineas.append(f"    {destino} = int({izq})")
+            else:
+                lineas.append(f"    {destino} = float({izq})")
+
+        lineas.append(f"    return ({''.join(p + ', ' for p in parametros)})")
+        return "\n".join(lineas) + "\n"
+
+    def argumentos(self, valores=None):
+        """Construye la lista de argumentos posicionales de la función"""
+        argumentos = self._por_defecto.copy()
+        if valores:
+            for nombre, valor in valores.items():
+                if nombre not in self._posiciones:
+                    raise ValueError(f"Variable '{nombre}' no declarada en el programa")
+                tipo = self.maquina.tipos[self.maquina.slots[nombre]]
+                argumentos[self._posiciones[nombre]] = convertir_valor(valor, tipo)
+        return argumentos
+
+    def ejecutar(self, valores=None):
+        """Ejecuta el programa y retorna el estado final de las variables declaradas"""
+        return dict(zip(self.variables, self.funcion(*self.argumentos(valores))))
+
+
+def compilar(codigo):
+    """
+    Compila un programa de tres direcciones, reutilizando la caché si existe;
+    con más de CAPACIDAD_CACHE programas se expulsa el menos usado
+    """
+    clave = hash_programa(codigo)
+    programa = _cache_programas.get(clave)
+    if programa is not None:
+        _cache_programas.move_to_end(clave)
+        return programa
+    programa = ProgramaPython(codigo)
+    _cache_programas[clave] = programa
+    if len(_cache_programas) > CAPACIDAD_CACHE:
+        _cache_programas.popitem(last=False)
+    return programa
+
+
+def limpiar_cache():
+    """Vacía la caché de programas compilados"""
+    _cache_programas.clear()
+
+
+def main():
+    """Función principal"""
+    from analizador_completo import (AnalizadorLexico, AnalizadorSintactico,
+                                     reportar_errores_lexicos)
+
+    if len(sys.argv) < 2:
+        print("\n❌ Error: Debe proporcionar un archivo de código")
+        print("Uso: python compilador_python.py programa.txt [nombre=valor ...]")
+        return 1
+
+    try:
+        with open(sys.argv[1], 'r', encoding='utf-8') as f:
+            entrada = f.read()
+
+        # Valores iniciales: nombre=valor
+        valores = {}
+        for argumento in sys.argv[2:]:
+            nombre, _, texto = argumento.partition('=')
+            literal = literal_numerico(texto)
+            if literal is None:
+                raise ValueError(f"Valor inválido para '{nombre}': '{texto}'")
+            valores[nombre] = literal[1]
+
+        lexico = AnalizadorLexico(entrada)
+        sintactico = AnalizadorSintactico(lexico.tokenizar())
+        reportar_errores_lexicos(sintactico, lexico.errores)
+        sintactico.parsear()
+
+        if sintactico.tabla_simbolos.tiene_errores():
+            sintactico.tabla_simbolos.imprimir_errores()
+            return 1
+
+        programa = compilar(sintactico.generador.obtener_codigo())
+        estado = programa.ejecutar(valores)
+
+    except FileNotFoundError:
+        print(f"\n❌ Error: Archivo '{sys.argv[1]}' no encontrado")
+        return 1
+    except (ValueError, SyntaxError, ZeroDivisionError, OverflowError) as e:
+        print(f"\n❌ ERROR: {e}")
+        return 1
+
+    print("\n" + "="*80)
+    print(" FUNCIÓN DE PYTHON GENERADA ".center(80, "="))
+    print("="*80)
+    print(programa.fuente, end="")
+    print("="*80)
+    print(" EJECUCIÓN ".center(80, "="))
+    print("="*80)
+    for nombre, valor in estado.items():
+        print(f"  {nombre:10} {type(valor).__name__:8} {valor}")
+    print("="*80)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
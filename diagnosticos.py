@@ -0,0 +1,72 @@
+# diagnosticos.py
+"""
+Diagnósticos estructurados (errores y advertencias) con formato diferido
+"""
+
+# Plantillas de mensajes por código de diagnóstico
+MENSAJES = {
+    # Errores léxicos
+    'L001': "Error léxico - Carácter no reconocido '{0}'",
+    # Errores sintácticos
+    'S001': "Error sintáctico - Se esperaba {0}, se encontró {1}",
+    'S002': "Error sintáctico - Token inesperado {0}",
+    'S003': "Error sintáctico - Fin inesperado de entrada",
+    'S004': "Error sintáctico - Se esperaba un identificador después del tipo",
+    # Errores semánticos
+    'E001': "Error semántico - Variable '{0}' no declarada",
+    'E002': "Error semántico - Variable '{0}' ya declarada en línea {1}",
+    'E003': "Error semántico - División por cero",
+    'E004': "Error semántico - Variable '{0}' ya declarada en {1}, línea {2}",
+    # Advertencias
+    'W001': "Variable '{0}' declarada pero no usada",
+    'W002': "Constante entera fuera del rango de {0} bits: {1}",
+    'W003': "Desbordamiento de punto flotante en constante: no se pliega",
+    'W004': "Constante entera de {0} dígitos, demasiado larga para convertirla: no se pliega",
+}
+
+
+class Diagnostico:
+    """Registro de un error o advertencia; el mensaje se formatea al mostrarlo"""
+    __slots__ = ('codigo', 'linea', 'columna', 'args')
+
+    def __init__(self, codigo, linea=0, columna=0, args=()):
+        self.codigo = codigo      # clave en MENSAJES
+        self.linea = linea        # línea del código fuente
+        self.columna = columna    # columna (0 si no se conoce)
+        self.args = args          # argumentos de la plantilla
+
+    def mensaje(self):
+        """Formatea el mensaje sin la posición"""
+        return MENSAJES[self.codigo].format(*self.args)
+
+    def a_dict(self):
+        """Representación serializable del diagnóstico"""
+        return {
+            'codigo': self.codigo,
+            'linea': self.linea,
+            'columna': self.columna,
+            'args': list(self.args),
+        }
+
+    def __str__(self):
+        if self.linea:
+            return f"Línea {self.linea}: {self.mensaje()}"
+        return self.mensaje()
+
+    def __repr__(self):
+        return f"Diagnostico({self.codigo!r}, {self.linea}, {self.columna}, {self.args!r})"
+
+
+class ErrorSintactico(SyntaxError):
+    """SyntaxError que transporta su diagnóstico"""
+
+    def __init__(self, diagnostico):
+        super().__init__()
+        self.diagnostico = diagnostico
+
+    def __str__(self):
+        return str(self.diagnostico)
+
+
+class LimiteErroresAlcanzado(Exception):
+    """Se alcanzó el número máximo de errores configurado"""
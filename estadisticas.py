@@ -0,0 +1,79 @@
+# estadisticas.py
+"""
+Instrumentación del análisis: tiempo y memoria pico por fase, y contadores
+"""
+
+import json
+import time
+import tracemalloc
+from contextlib import contextmanager
+
+
+class Estadisticas:
+    """Tiempos, memoria pico (tracemalloc) y contadores de una ejecución"""
+
+    def __init__(self, medir_memoria=True):
+        self.medir_memoria = medir_memoria
+        self.fases = {}       # {nombre: {'segundos': float, 'memoria_pico_bytes': int}}
+        self.contadores = {}  # {nombre: int}
+        self._iniciado_tracemalloc = False
+
+    @contextmanager
+    def fase(self, nombre):
+        """Mide el tiempo y la memoria pico de un bloque"""
+        if self.medir_memoria and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._iniciado_tracemalloc = True
+
+        if self.medir_memoria:
+            base, _ = tracemalloc.get_traced_memory()
+            tracemalloc.reset_peak()
+
+        inicio = time.perf_counter()
+        try:
+            yield
+        finally:
+            segundos = time.perf_counter() - inicio
+            registro = self.fases.setdefault(nombre, {'segundos': 0.0, 'memoria_pico_bytes': 0})
+            registro['segundos'] += segundos
+            if self.medir_memoria:
+                _, pico = tracemalloc.get_traced_memory()
+                registro['memoria_pico_bytes'] = max(registro['memoria_pico_bytes'], pico - base)
+
+    def agregar_tiempo(self, nombre, segundos):
+        """Suma tiempo medido externamente a una fase"""
+        registro = self.fases.setdefault(nombre, {'segundos': 0.0, 'memoria_pico_bytes': 0})
+        registro['segundos'] += segundos
+
+    def finalizar(self):
+        """Detiene tracemalloc si fue iniciado por esta instancia"""
+        if self._iniciado_tracemalloc:
+            tracemalloc.stop()
+            self._iniciado_tracemalloc = False
+
+    def a_dict(self):
+        """Representación serializable (JSON) de las estadísticas"""
+        return {
+            'fases': {nombre: dict(datos) for nombre, datos in self.fases.items()},
+            'tiempo_total_segundos': sum(d['segundos'] for d in self.fases.values()),
+            'contadores': dict(self.contadores),
+        }
+
+    def a_json(self):
+        """Estadísticas como texto JSON"""
+        return json.dumps(self.a_dict(), indent=2, ensure_ascii=False)
+
+    def imprimir(self):
+        """Imprime el reporte de estadísticas"""
+        print("\n" + "="*80)
+        print(" ESTADÍSTICAS DE EJECUCIÓN ".center(80, "="))
+        print("="*80)
+        print(f"{'Fase':28} {'Tiempo (ms)':>14} {'Memoria pico (KiB)':>20}")
+        print("-"*80)
+        for nombre, datos in self.fases.items():
+            print(f"{nombre:28} {datos['segundos'] * 1000:14.3f} "
+                  f"{datos['memoria_pico_bytes'] / 1024:20.1f}")
+        print("-"*80)
+        for nombre, valor in self.contadores.items():
+            print(f"{nombre:28} {valor:14}")
+        print("="*80)
@@ -0,0 +1,157 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# evaluacion_vectorial.py
+"""
+Evaluación vectorizada del código de tres direcciones sobre columnas de NumPy
+
+El programa se recorre una sola vez y cada instrucción se aplica elemento a
+elemento a columnas completas: cada posición de las columnas es una
+ejecución independiente del programa con otros valores iniciales.
+
+La semántica de tipos es la de la máquina virtual (maquina_virtual.py), con
+int representado como int64 (los desbordamientos dan la vuelta). Las filas en
+las que la máquina virtual se detendría (división por cero o conversión de un
+valor no finito a int) quedan marcadas y sus resultados enmascarados.
+"""
+
+import sys
+from maquina_virtual import (MaquinaVirtual, OP_SUMA, OP_RESTA, OP_MUL, OP_DIV,
+                             OP_DIV_ENTERA, OP_COPIA, OP_A_INT)
+
+try:
+    import numpy as np
+except ImportError:  # NumPy es opcional
+    np = None
+
+
+def _tipo_numpy(tipo):
+    """Tipo de NumPy correspondiente a un tipo del lenguaje"""
+    return np.int64 if tipo == 'int' else np.float64
+
+
+class EvaluadorVectorial:
+    """Evalúa un programa de tres direcciones sobre columnas de valores"""
+
+    def __init__(self, codigo):
+        if np is None:
+            raise ImportError("La evaluación vectorizada requiere NumPy (pip install numpy)")
+        self.maquina = MaquinaVirtual(codigo)
+        self.variables = list(self.maquina.variables)
+
+    def _memoria(self, columnas):
+        """Crea la memoria vectorial a partir de las columnas de entrada"""
+        maquina = self.maquina
+        n = None
+        for nombre, columna in columnas.items():
+            if nombre not in self.variables:
+                raise ValueError(f"Variable '{nombre}' no declarada en el programa")
+            longitud = len(columna)
+            if n is not None and longitud != n:
+                raise ValueError(f"La columna '{nombre}' tiene {longitud} filas, se esperaban {n}")
+            n = longitud
+        if n is None:
+            n = 1
+
+        # Constantes y ceros como escalares (se difunden con broadcasting)
+        memoria = [_tipo_numpy(tipo)(valor)
+                   for tipo, valor in zip(maquina.tipos, maquina.memoria_inicial)]
+        for nombre, columna in columnas.items():
+            slot = maquina.slots[nombre]
+            memoria[slot] = np.asarray(columna).astype(_tipo_numpy(maquina.tipos[slot]))
+        return memoria, n
+
+    def evaluar(self, columnas):
+        """
+        Evalúa el programa para todas las filas de las columnas.
+
+        columnas: {nombre: array} con valores iniciales de variables declaradas
+        Retorna (resultados, invalidos): resultados es {nombre: MaskedArray} con
+        el estado final de cada variable e invalidos es la máscara booleana de
+        filas en las que la ejecución escalar habría fallado.
+        """
+        m, n = self._memoria(columnas)
+        invalidos = np.zeros(n, dtype=bool)
+
+        with np.errstate(divide='ignore', invalid='ignore', over='ignore'):
+            for op, d, a, b, _ in self.maquina.instrucciones:
+                if op == OP_SUMA:
+                    m[d] = m[a] + m[b]
+                elif op == OP_MUL:
+                    m[d] = m[a] * m[b]
+                elif op == OP_RESTA:
+                    m[d] = m[a] - m[b]
+                elif op == OP_COPIA:
+                    m[d] = m[a]
+                elif op == OP_DIV:
+                    cero = m[b] == 0
+                    invalidos |= cero
+                    m[d] = np.where(cero, 0.0, m[a] / np.where(cero, 1, m[b]))
+                elif op == OP_DIV_ENTERA:
+                    cero = m[b] == 0
+                    invalidos |= cero
+                    divisor = np.where(cero, 1, m[b])
+                    cociente = np.abs(m[a]) // np.abs(divisor)
+                    m[d] = np.where((m[a] < 0) != (divisor < 0), -cociente, cociente)
+                elif op == OP_A_INT:
+                    finito = np.isfinite(m[a])
+                    invalidos |= ~finito
+                    m[d] = np.where(finito, m[a], 0).astype(np.int64)
+                else:
+                    m[d] = np.asarray(m[a]).astype(np.float64)
+
+        resultados = {}
+        for nombre in self.variables:
+            valores = np.broadcast_to(m[self.maquina.slots[nombre]], (n,))
+            resultados[nombre] = np.ma.array(valores, mask=invalidos)
+        return resultados, invalidos
+
+
+def main():
+    """Función principal: evalúa un programa sobre columnas aleatorias"""
+    from analizador_completo import (AnalizadorLexico, AnalizadorSintactico,
+                                     reportar_errores_lexicos)
+
+    if len(sys.argv) < 2:
+        print("\n❌ Error: Debe proporcionar un archivo de código")
+        print("Uso: python evaluacion_vectorial.py programa.txt [filas]")
+        return 1
+
+    try:
+        with open(sys.argv[1], 'r', encoding='utf-8') as f:
+            entrada = f.read()
+        filas = int(sys.argv[2]) if len(sys.argv) > 2 else 10
+
+        lexico = AnalizadorLexico(entrada)
+        sintactico = AnalizadorSintactico(lexico.tokenizar())
+        reportar_errores_lexicos(sintactico, lexico.errores)
+        sintactico.parsear()
+
+        if sintactico.tabla_simbolos.tiene_errores():
+            sintactico.tabla_simbolos.imprimir_errores()
+            return 1
+
+        evaluador = EvaluadorVectorial(sintactico.generador.obtener_codigo())
+        generador = np.random.default_rng(0)
+        columnas = {nombre: generador.integers(-10, 10, filas) for nombre in evaluador.variables}
+        resultados, invalidos = evaluador.evaluar(columnas)
+
+    except FileNotFoundError:
+        print(f"\n❌ Error: Archivo '{sys.argv[1]}' no encontrado")
+        return 1
+    except (ValueError, SyntaxError, ImportError) as e:
+        print(f"\n❌ ERROR: {e}")
+        return 1
+
+    print("\n" + "="*80)
+    print(" EVALUACIÓN VECTORIZADA ".center(80, "="))
+    print("="*80)
+    for nombre in evaluador.variables:
+        print(f"  {nombre:10} entrada:   {columnas[nombre]}")
+        print(f"  {'':10} resultado: {resultados[nombre]}")
+    print(f"\n  Filas inválidas: {int(invalidos.sum())} de {filas}")
+    print("="*80)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,547 @@
+#!/usr/bin/env python3
+# generador_parser.py
+"""
+Generación de un analizador especializado (código Python) para una gramática
+
+El módulo generado no interpreta tablas: contiene un léxico con una única
+expresión regular maestra (el número de grupo es el código del terminal) y un
+analizador descendente predictivo en el que cada decisión es una comparación de
+enteros. La recursión izquierda inmediata (E -> E + T | T) y la recursión de
+cola (S -> D S | E) se convierten en ciclos while; el resto de la recursión
+(F -> ( E )) se resuelve sin la pila de Python: los no terminales recursivos
+son generadores y un trampolín mantiene su pila explícita. Los no terminales
+no recursivos usados en un solo lugar se expanden en línea.
+
+Las acciones semánticas se indexan como en TablaLALR (producción 0 = S' -> S),
+así que las reducciones de AnalizadorSintacticoLR sirven directamente.
+"""
+
+import re
+import sys
+
+from calculador_conjuntos import (leer_gramatica, obtener_terminales_no_terminales,
+                                  calcular_primeros, calcular_siguientes,
+                                  calcular_primeros_cadena, aumentar_gramatica)
+
+# Expresiones regulares de los terminales que son clases de lexemas
+CLASES_LEXICAS = {
+    'id': r'[A-Za-z_][A-Za-z0-9_]*',
+    'num': r'\d+\.\d+|\d+',
+}
+
+# Más comparaciones que esto se escriben como pertenencia a una tupla
+_MAX_COMPARACIONES = 3
+
+# Un no terminal se expande en línea mientras sus copias no sumen más símbolos
+_MAX_EXPANSION = 400
+
+
+class _Emisor:
+    """Acumula líneas de código con sangría y nombres de variables únicos"""
+
+    def __init__(self):
+        self.lineas = []
+        self.nivel = 0
+        self.contador = 0
+
+    def linea(self, texto):
+        self.lineas.append("    " * self.nivel + texto)
+
+    def variable(self, prefijo='v'):
+        self.contador += 1
+        return f"{prefijo}{self.contador}"
+
+
+class GeneradorParser:
+    """Analiza la gramática y escribe el módulo del analizador especializado"""
+
+    def __init__(self, gramatica, inicial, primeros=None, clases=CLASES_LEXICAS):
+        self.gramatica = gramatica
+        self.inicial = inicial
+        self.primeros = primeros or calcular_primeros(gramatica)
+        self.producciones = aumentar_gramatica(gramatica, inicial)
+        self.clases = clases
+
+        terminales, _ = obtener_terminales_no_terminales(gramatica)
+        self.terminales = self._ordenar_terminales(terminales)
+        self.codigos = {terminal: i for i, terminal in enumerate(self.terminales)}
+        self.codigos['$'] = len(self.terminales)
+
+        self._clasificar()
+        self._verificar()
+        self._elegir_procedimientos()
+
+    # Análisis de la gramática
+
+    def _ordenar_terminales(self, terminales):
+        """Orden de los grupos del léxico: palabras clave, símbolos (más largos primero), clases"""
+        clase_id = re.compile(self.clases.get('id', r'(?!)'))
+        palabras = sorted(t for t in terminales
+                          if t not in self.clases and clase_id.fullmatch(t))
+        simbolos = sorted((t for t in terminales
+                           if t not in self.clases and t not in palabras),
+                          key=lambda t: (-len(t), t))
+        clases = [t for t in self.clases if t in terminales]
+        return palabras + simbolos + clases
+
+    def _es_anulable(self, cadena):
+        return 'ε' in calcular_primeros_cadena(cadena, self.primeros)
+
+    def _primeros(self, cadena):
+        return calcular_primeros_cadena(cadena, self.primeros) - {'ε'}
+
+    def _clasificar(self):
+        """
+        Para cada no terminal A: alternativas base, recursivas izquierdas
+        (A -> A α, ciclo posterior) y de cola (A -> α A, ciclo previo).
+        """
+        self.alternativas = {}
+        for p, (nt, derecha) in enumerate(self.producciones):
+            if p == 0:
+                continue
+            base, izquierdas, cola = self.alternativas.setdefault(nt, ([], [], []))
+            if derecha and derecha[0] == nt:
+                izquierdas.append((p, derecha[1:]))
+            elif len(derecha) > 1 and derecha[-1] == nt and nt not in derecha[:-1]:
+                cola.append((p, derecha[:-1]))
+            else:
+                base.append((p, derecha))
+        self.siguientes = self._siguientes_sin_recursion()
+
+        # Conjuntos de predicción de cada alternativa. Una base anulable β equivale
+        # a β A': la predicen también los terminales que empiezan el ciclo izquierdo
+        self.prediccion = {}
+        for nt, (base, izquierdas, cola) in self.alternativas.items():
+            for p, derecha in base:
+                conjunto = self._primeros(derecha)
+                if self._es_anulable(derecha):
+                    conjunto |= self.siguientes[nt]
+                    for _, alfa in izquierdas:
+                        conjunto |= self._primeros(alfa)
+                self.prediccion[p] = conjunto
+            for p, alfa in izquierdas + cola:
+                self.prediccion[p] = self._primeros(alfa)
+
+    def _siguientes_sin_recursion(self):
+        """
+        SIGUIENTES de la gramática con la recursión izquierda eliminada
+        (A -> β A', A' -> α A' | ε): el ciclo no aporta sus propios terminales.
+        """
+        transformada = {}
+        for nt, (base, izquierdas, cola) in self.alternativas.items():
+            if not izquierdas:
+                transformada[nt] = [list(d) or ['ε'] for _, d in base] + \
+                                   [list(a) + [nt] for _, a in cola]
+                continue
+            ciclo = nt + "'"
+            while ciclo in self.gramatica:
+                ciclo += "'"
+            transformada[nt] = [list(d) + [ciclo] for _, d in base]
+            transformada[ciclo] = [list(a) + [ciclo] for _, a in izquierdas] + [['ε']]
+        primeros = calcular_primeros(transformada)
+        return calcular_siguientes(transformada, self.inicial, primeros)
+
+    def _verificar(self):
+        """Lanza ValueError si la gramática transformada no es LL(1)"""
+        conflictos = []
+        for nt, (base, izquierdas, cola) in self.alternativas.items():
+            if not base:
+                conflictos.append(f"{nt}: sin alternativa base, la recursión no termina")
+            if izquierdas and cola:
+                conflictos.append(f"{nt}: recursión izquierda y de cola a la vez")
+            for p, alfa in izquierdas + cola:
+                if self._es_anulable(alfa):
+                    conflictos.append(f"{self.describir(p)}: la parte repetida puede ser vacía")
+
+            # Elección de la alternativa (ciclo de cola y base) y salida del ciclo izquierdo
+            grupos = [base + cola, izquierdas]
+            for grupo in grupos:
+                for i in range(len(grupo)):
+                    for j in range(i + 1, len(grupo)):
+                        comun = self.prediccion[grupo[i][0]] & self.prediccion[grupo[j][0]]
+                        if comun:
+                            conflictos.append(f"{self.describir(grupo[i][0])} | "
+                                              f"{self.describir(grupo[j][0])}: {sorted(comun)}")
+            for p, _ in izquierdas:
+                comun = self.prediccion[p] & self.siguientes[nt]
+                if comun:
+                    conflictos.append(f"{self.describir(p)} y SIGUIENTES({nt}): {sorted(comun)}")
+
+        # Recursión izquierda indirecta: ciclo por la esquina izquierda
+        esquinas = {nt: set() for nt in self.alternativas}
+        for nt, (base, _, cola) in self.alternativas.items():
+            for _, derecha in base + cola:
+                for simbolo in derecha:
+                    if simbolo in self.alternativas:
+                        esquinas[nt].add(simbolo)
+                    if not self._es_anulable((simbolo,)):
+                        break
+        for nt in esquinas:
+            alcanzados, pendientes = set(), list(esquinas[nt])
+            while pendientes:
+                otro = pendientes.pop()
+                if otro not in alcanzados:
+                    alcanzados.add(otro)
+                    pendientes.extend(esquinas[otro])
+            if nt in alcanzados:
+                conflictos.append(f"{nt}: recursión izquierda indirecta")
+
+        if conflictos:
+            raise ValueError("La gramática no es LL(1) tras convertir la recursión en ciclos:\n  "
+                             + "\n  ".join(conflictos))
+
+    def _llamadas(self, nt):
+        """No terminales llamados desde el cuerpo de nt (sin contar los ciclos)"""
+        base, izquierdas, cola = self.alternativas[nt]
+        for _, derecha in base + izquierdas + cola:
+            for simbolo in derecha:
+                if simbolo in self.alternativas:
+                    yield simbolo
+
+    def _elegir_procedimientos(self):
+        """
+        Procedimientos: el inicial, los que cierran un ciclo de llamadas y los
+        que expandidos en todos sus sitios de llamada superarían
+        _MAX_EXPANSION símbolos; el resto se expande en línea. Son generadores
+        (se suspenden en el trampolín) si pueden llegar a sí mismos.
+        """
+        procedimientos = {self.inicial}
+
+        # DFS iterativa: los destinos de aristas hacia atrás rompen los ciclos;
+        # el postorden deja los llamados antes que quien los llama
+        estado = {self.inicial: 'activo'}
+        postorden = []
+        pila = [(self.inicial, iter(list(self._llamadas(self.inicial))))]
+        while pila:
+            nt, hijos = pila[-1]
+            for hijo in hijos:
+                if estado.get(hijo) == 'activo':
+                    procedimientos.add(hijo)
+                elif hijo not in estado:
+                    estado[hijo] = 'activo'
+                    pila.append((hijo, iter(list(self._llamadas(hijo)))))
+                    break
+            else:
+                estado[nt] = 'terminado'
+                postorden.append(nt)
+                pila.pop()
+        self.alcanzables = set(estado)
+
+        sitios = {nt: 0 for nt in self.alternativas}
+        for nt in self.alcanzables:
+            for llamado in self._llamadas(nt):
+                sitios[llamado] += 1
+
+        # Tamaño expandido (en símbolos) con las decisiones ya tomadas más abajo
+        tamano = {}
+        for nt in postorden:
+            base, izquierdas, cola = self.alternativas[nt]
+            tamano[nt] = sum(1 + sum(1 if s in procedimientos or s not in self.alternativas
+                                     else tamano[s] for s in derecha)
+                             for _, derecha in base + izquierdas + cola)
+            if sitios[nt] > 1 and sitios[nt] * tamano[nt] > _MAX_EXPANSION:
+                procedimientos.add(nt)
+
+        # Procedimientos llamados por cada uno (a través de lo expandido en línea)
+        llamados = {}
+        for proc in procedimientos:
+            llamados[proc] = set()
+            pendientes = list(self._llamadas(proc))
+            vistos = set()
+            while pendientes:
+                nt = pendientes.pop()
+                if nt in procedimientos:
+                    llamados[proc].add(nt)
+                elif nt not in vistos:
+                    vistos.add(nt)
+                    pendientes.extend(self._llamadas(nt))
+
+        # Generadores: alcanzan un ciclo entre procedimientos
+        generadores = set()
+        for proc in procedimientos:
+            alcanzados, pendientes = set(), list(llamados[proc])
+            while pendientes:
+                otro = pendientes.pop()
+                if otro not in alcanzados:
+                    alcanzados.add(otro)
+                    pendientes.extend(llamados[otro])
+            if proc in alcanzados:
+                generadores.add(proc)
+        cambio = True
+        while cambio:
+            cambio = False
+            for proc in procedimientos - generadores:
+                if llamados[proc] & generadores:
+                    generadores.add(proc)
+                    cambio = True
+
+        orden = [nt for nt in self.alternativas if nt in procedimientos and nt in self.alcanzables]
+        self.procedimientos = {nt: i for i, nt in enumerate(orden)}
+        self.generadores = generadores
+
+    def describir(self, p):
+        nt, derecha = self.producciones[p]
+        return f"{nt} -> {' '.join(derecha) or 'ε'}"
+
+    # Emisión de código
+
+    def _condicion(self, conjunto):
+        codigos = sorted(self.codigos[t] for t in conjunto)
+        if len(codigos) <= _MAX_COMPARACIONES:
+            return " or ".join(f"t == {c}" for c in codigos)
+        return f"t in {tuple(codigos)}"
+
+    def _esperados(self, conjunto):
+        return ", ".join(sorted(conjunto))
+
+    def _secuencia(self, e, simbolos, predicho):
+        """Analiza una secuencia de símbolos; retorna los nombres de sus valores"""
+        valores = []
+        for k, simbolo in enumerate(simbolos):
+            v = e.variable()
+            if simbolo in self.alternativas:
+                self._no_terminal(e, simbolo, v)
+            else:
+                if not (k == 0 and predicho):
+                    e.linea(f"if t != {self.codigos[simbolo]}:")
+                    e.linea(f"    _error(tokens, i, {simbolo!r})")
+                e.linea(f"{v} = tokens[i]")
+                e.linea("i += 1")
+                e.linea("t = tipos[i]")
+            valores.append(v)
+        return valores
+
+    def _no_terminal(self, e, nt, destino):
+        """Analiza nt dejando su valor en destino"""
+        if nt in self.procedimientos:
+            indice = self.procedimientos[nt]
+            if nt in self.generadores:
+                e.linea(f"{destino}, i = yield ({indice}, i)")
+            else:
+                e.linea(f"{destino}, i = _p{indice}(tipos, tokens, acciones, i)")
+            e.linea("t = tipos[i]")
+        else:
+            self._cuerpo(e, nt, destino)
+
+    def _accion(self, e, destino, p, valores):
+        e.linea(f"{destino} = acciones[{p}]({', '.join(valores)})  # {self.describir(p)}")
+
+    def _cuerpo(self, e, nt, destino):
+        """Código de las alternativas de nt: ciclo de cola, elección y ciclo izquierdo"""
+        base, izquierdas, cola = self.alternativas[nt]
+
+        pendientes = None
+        if cola:
+            pendientes = e.variable('pendientes')
+            e.linea(f"{pendientes} = []")
+            e.linea("while True:")
+            e.nivel += 1
+            for k, (p, alfa) in enumerate(cola):
+                e.linea(f"{'if' if k == 0 else 'elif'} {self._condicion(self.prediccion[p])}:")
+                e.nivel += 1
+                valores = self._secuencia(e, alfa, True)
+                if len(cola) == 1:
+                    # Una sola alternativa de cola: basta guardar sus valores
+                    tupla = valores[0] if len(valores) == 1 else f"({', '.join(valores)})"
+                    e.linea(f"{pendientes}.append({tupla})")
+                else:
+                    e.linea(f"{pendientes}.append(({p}, ({''.join(v + ', ' for v in valores)})))")
+                e.nivel -= 1
+            e.linea("else:")
+            e.linea("    break")
+            e.nivel -= 1
+
+        if len(base) == 1:
+            p, derecha = base[0]
+            valores = self._secuencia(e, derecha, False)
+            self._accion(e, destino, p, valores)
+        else:
+            esperados = set()
+            for k, (p, derecha) in enumerate(base):
+                esperados |= self.prediccion[p]
+                e.linea(f"{'if' if k == 0 else 'elif'} {self._condicion(self.prediccion[p])}:")
+                e.nivel += 1
+                valores = self._secuencia(e, derecha, True)
+                self._accion(e, destino, p, valores)
+                e.nivel -= 1
+            e.linea("else:")
+            e.linea(f"    _error(tokens, i, {self._esperados(esperados)!r})")
+
+        if izquierdas:
+            e.linea("while True:")
+            e.nivel += 1
+            for k, (p, alfa) in enumerate(izquierdas):
+                e.linea(f"{'if' if k == 0 else 'elif'} {self._condicion(self.prediccion[p])}:")
+                e.nivel += 1
+                valores = self._secuencia(e, alfa, True)
+                self._accion(e, destino, p, [destino] + valores)
+                e.nivel -= 1
+            e.linea("else:")
+            e.linea("    break")
+            e.nivel -= 1
+
+        if pendientes and len(cola) == 1:
+            # Acción fija y aridad conocida: sin tuplas ni llamada con *valores
+            p, alfa = cola[0]
+            accion = e.variable('accion')
+            valores = [e.variable() for _ in alfa]
+            e.linea(f"{accion} = acciones[{p}]  # {self.describir(p)}")
+            e.linea(f"for {', '.join(valores)} in reversed({pendientes}):")
+            e.linea(f"    {destino} = {accion}({', '.join(valores + [destino])})")
+        elif pendientes:
+            e.linea(f"for p, valores in reversed({pendientes}):")
+            e.linea(f"    {destino} = acciones[p](*valores, {destino})")
+
+    def _patron(self):
+        """Expresión regular maestra: un grupo por terminal y luego espacios, saltos y error"""
+        grupos = []
+        for terminal in self.terminales:
+            if terminal in self.clases:
+                grupos.append(f"(?:{self.clases[terminal]})")
+            elif terminal[-1:].isalnum() or terminal[-1:] == '_':
+                grupos.append(re.escape(terminal) + r"\b")
+            else:
+                grupos.append(re.escape(terminal))
+        grupos += [r"[ \t]+", r"\n", r"."]
+        return "|".join(f"({g})" for g in grupos)
+
+    def generar(self, origen='gramatica'):
+        """Texto del módulo generado"""
+        e = _Emisor()
+        n = len(self.terminales)
+        e.lineas += [
+            "# Generado por generador_parser.py: no editar a mano",
+            '"""',
+            f"Analizador especializado para {origen} (símbolo inicial {self.inicial})",
+            "",
+            "tipos, tokens = tokenizar(texto)",
+            "valor = parsear(tipos, tokens, acciones)   # acciones[p](*valores)",
+            '"""',
+            "",
+            "import re",
+            "",
+            f"TERMINALES = {tuple(self.terminales)!r}",
+            f"FIN = {n}",
+            f"PRODUCCIONES = {tuple(self.describir(p) for p in range(len(self.producciones)))!r}",
+            "",
+            f"_PATRON = re.compile({self._patron()!r})",
+            f"_ESPACIO, _SALTO, _ERROR = {n + 1}, {n + 2}, {n + 3}",
+            "",
+            "",
+            "def tokenizar(cadena):",
+            '    """Retorna (tipos, tokens): códigos de terminal (con FIN al final) y tokens"""',
+            "    tipos = []",
+            "    tokens = []",
+            "    agregar_tipo = tipos.append",
+            "    agregar = tokens.append",
+            "    linea = 1",
+            "    inicio_linea = 0",
+            "    for m in _PATRON.finditer(cadena):",
+            "        g = m.lastindex",
+            "        if g > FIN:",
+            "            if g == _SALTO:",
+            "                linea += 1",
+            "                inicio_linea = m.end()",
+            "            elif g == _ERROR:",
+            "                raise ValueError(f\"Línea {linea}: Carácter no reconocido '{m.group()}'\")",
+            "            continue",
+            "        agregar_tipo(g - 1)",
+            "        agregar({'tipo': TERMINALES[g - 1], 'lexema': m.group(), 'linea': linea,",
+            "                 'columna': m.start() - inicio_linea + 1})",
+            "    agregar_tipo(FIN)",
+            "    return tipos, tokens",
+            "",
+            "",
+            "def _error(tokens, i, esperado):",
+            "    if i >= len(tokens):",
+            "        linea = tokens[-1]['linea'] if tokens else 0",
+            "        raise SyntaxError(f\"Línea {linea}: Error sintáctico - Fin inesperado de entrada, \"",
+            "                          f\"se esperaba {esperado}\")",
+            "    token = tokens[i]",
+            "    raise SyntaxError(f\"Línea {token['linea']}: Error sintáctico - Se esperaba {esperado}, \"",
+            "                      f\"se encontró '{token['lexema']}'\")",
+            "",
+            "",
+            "def arbol(p):",
+            '    """Acción por omisión: (producción, valores)"""',
+            "    return lambda *valores: (p, list(valores))",
+        ]
+
+        for nt, indice in self.procedimientos.items():
+            e.lineas += ["", ""]
+            e.linea(f"def _p{indice}(tipos, tokens, acciones, i):")
+            e.nivel += 1
+            e.linea(f'"""{nt}{" (generador)" if nt in self.generadores else ""}"""')
+            e.linea("t = tipos[i]")
+            self._cuerpo(e, nt, 'valor')
+            e.linea("return valor, i")
+            e.nivel -= 1
+
+        indices = sorted(self.procedimientos.values())
+        inicial = self.procedimientos[self.inicial]
+        e.lineas += [
+            "",
+            "",
+            f"_PROCEDIMIENTOS = ({''.join(f'_p{i}, ' for i in indices)})",
+            "",
+            "",
+            "def parsear(tipos, tokens, acciones=None):",
+            '    """Analiza la entrada completa; retorna el valor del símbolo inicial"""',
+            "    if acciones is None:",
+            "        acciones = [arbol(p) for p in range(len(PRODUCCIONES))]",
+        ]
+        if self.inicial in self.generadores:
+            e.lineas += [
+                "    # Trampolín: la pila de generadores reemplaza a la de Python",
+                f"    pila = [_p{inicial}(tipos, tokens, acciones, 0)]",
+                "    enviado = None",
+                "    while True:",
+                "        try:",
+                "            indice, i = pila[-1].send(enviado)",
+                "        except StopIteration as fin:",
+                "            del pila[-1]",
+                "            enviado = fin.value",
+                "            if not pila:",
+                "                break",
+                "            continue",
+                "        pila.append(_PROCEDIMIENTOS[indice](tipos, tokens, acciones, i))",
+                "        enviado = None",
+                "    valor, i = enviado",
+            ]
+        else:
+            e.lineas.append(f"    valor, i = _p{inicial}(tipos, tokens, acciones, 0)")
+        e.lineas += [
+            "    if tipos[i] != FIN:",
+            "        _error(tokens, i, '$')",
+            "    return valor",
+            "",
+        ]
+        return "\n".join(e.lineas)
+
+
+def generar_modulo(gramatica, inicial, primeros=None, origen='gramatica'):
+    """Código fuente del módulo especializado (ValueError si no es LL(1) tras los ciclos)"""
+    return GeneradorParser(gramatica, inicial, primeros).generar(origen)
+
+
+def main():
+    """Función principal"""
+    argumentos = [a for a in sys.argv if not a.startswith('--')]
+    if len(argumentos) < 3:
+        print("Uso: python generador_parser.py gramatica.txt salida.py")
+        return 1
+
+    gramatica, inicial = leer_gramatica(argumentos[1])
+    try:
+        codigo = generar_modulo(gramatica, inicial, origen=argumentos[1])
+    except ValueError as e:
+        print(f"\n❌ ERROR: {e}")
+        return 1
+    with open(argumentos[2], 'w', encoding='utf-8') as f:
+        f.write(codigo)
+    print(f"✅ Analizador generado en {argumentos[2]}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,7 +1,126 @@
 # graficador.py
+"""
+Impresión y exportación del AST
+
+Además del árbol en consola, el AST se exporta en streaming a Graphviz DOT,
+JSON-lines (un nodo por línea con el id de su padre) y un formato binario en
+preorden. Los recorridos son iterativos (sin límite de recursión) y escriben
+en bloques a través de un búfer, sin construir la salida completa en memoria.
+
+Formato binario (enteros como varint LEB128 sin signo):
+    cabecera  b'AST\\x01'
+    por nodo, en preorden:
+        varint   número de hijos exportados
+        cadena   etiqueta
+        cadena   tipo
+        valor    un byte: 0 None, 1 entero (varint zigzag), 2 flotante
+                 (8 bytes IEEE 754 little-endian), 3 otro (cadena con str)
+        varint   línea
+        cadena   lugar
+    cadena: varint k; 0 es None, k <= n es la k-ésima cadena ya vista y
+    k = n + 1 agrega una nueva (varint longitud y bytes UTF-8)
+"""
+
+import json
+import os
+import struct
+import sys
+from contextlib import contextmanager
+
+from nodo_ast import NodoAST
+
+CABECERA_BINARIA = b'AST\x01'
+
+_VALOR_NONE, _VALOR_ENTERO, _VALOR_FLOTANTE, _VALOR_OTRO = range(4)
+_FLOTANTE = struct.Struct('<d')
+
+
+class _Sumidero:
+    """Escritura con búfer: acumula fragmentos y los escribe en bloques"""
+
+    def __init__(self, destino, binario=False, tamano=1 << 16):
+        self.destino = destino
+        self.binario = binario
+        self.tamano = tamano
+        self.partes = bytearray() if binario else []
+        self.pendiente = 0
+
+    def escribir(self, fragmento):
+        if self.binario:
+            self.partes += fragmento
+        else:
+            self.partes.append(fragmento)
+        self.pendiente += len(fragmento)
+        if self.pendiente >= self.tamano:
+            self.vaciar()
+
+    def vaciar(self):
+        if self.pendiente:
+            self.destino.write(bytes(self.partes) if self.binario else "".join(self.partes))
+            self.partes = bytearray() if self.binario else []
+            self.pendiente = 0
+
+
+@contextmanager
+def _abrir(salida, binario=False):
+    """Sumidero sobre una ruta (se abre y cierra aquí) o un archivo ya abierto"""
+    if isinstance(salida, (str, os.PathLike)):
+        if binario:
+            archivo = open(salida, 'wb')
+        else:
+            archivo = open(salida, 'w', encoding='utf-8', newline='\n')
+        with archivo:
+            sumidero = _Sumidero(archivo, binario)
+            yield sumidero
+            sumidero.vaciar()
+    else:
+        sumidero = _Sumidero(salida, binario)
+        yield sumidero
+        sumidero.vaciar()
+
+
+def recorrer_preorden(nodo, profundidad=None, filtro=None):
+    """
+    Recorre el árbol en preorden con una pila explícita.
+
+    Genera (id, id del padre o None, profundidad, nodo, hijos exportados); los
+    ids son consecutivos en preorden desde 0 (un nodo compartido en modo DAG
+    aparece una vez por cada camino). profundidad limita la profundidad (la
+    raíz es 0) y filtro(nodo) = False omite el nodo con todo su subárbol; la
+    raíz siempre se exporta.
+    """
+    siguiente = 0
+    pila = [(nodo, None, 0)]
+    while pila:
+        actual, padre, nivel = pila.pop()
+        if profundidad is not None and nivel >= profundidad:
+            hijos = []
+        elif filtro is None:
+            hijos = actual.hijos
+        else:
+            hijos = [hijo for hijo in actual.hijos if filtro(hijo)]
+
+        identificador = siguiente
+        siguiente += 1
+        yield identificador, padre, nivel, actual, hijos
+        for hijo in reversed(hijos):
+            pila.append((hijo, identificador, nivel + 1))
+
+
+def _escapar_dot(texto):
+    return texto.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _varint(buffer, n):
+    while n >= 0x80:
+        buffer.append((n & 0x7F) | 0x80)
+        n >>= 7
+    buffer.append(n)
+
+
 class Graficador:
     @staticmethod
-    def imprimir_arbol(nodo, nivel=0, es_ultimo=True, prefijo=""):
+    def imprimir_arbol(nodo, nivel=0, es_ultimo=True, prefijo="", salida=None):
         """
         Imprime un árbol en consola usando líneas y sangrías.
 
@@ -9,19 +128,259 @@ class Graficador:
         nivel: profundidad del nodo
         es_ultimo: indica si el nodo es el último hijo
         prefijo: prefijo acumulado para dibujar ramas
+        salida: archivo de texto (por omisión sys.stdout)
+        """
+        with _abrir(salida or sys.stdout) as sumidero:
+            # Segmento de sangría que aporta cada ancestro del camino actual: la
+            # pila no guarda un prefijo por nodo pendiente
+            segmentos = []
+            pila = [(nodo, es_ultimo, 0)]
+            while pila:
+                actual, ultimo, profundidad = pila.pop()
+                del segmentos[profundidad:]
+
+                # Prefijo visual para ramas
+                rama = "└── " if ultimo else "├── "
+                sumidero.escribir(prefijo + "".join(segmentos) + rama + str(actual.etiqueta) + "\n")
+
+                # Hijos apilados al revés para recorrerlos en orden
+                segmentos.append("    " if ultimo else "│   ")
+                n = len(actual.hijos)
+                for i in range(n - 1, -1, -1):
+                    pila.append((actual.hijos[i], i == n - 1, profundidad + 1))
+
+    @staticmethod
+    def exportar_dot(nodo, salida, profundidad=None, filtro=None):
+        """
+        Exporta el árbol como grafo de Graphviz (digraph).
+
+        salida: ruta o archivo de texto abierto
+        profundidad, filtro: ver recorrer_preorden
+        Retorna el número de nodos exportados.
+        """
+        total = 0
+        with _abrir(salida) as sumidero:
+            sumidero.escribir('digraph AST {\n    node [shape=box, fontname="monospace"];\n')
+            for identificador, padre, _, actual, _ in recorrer_preorden(nodo, profundidad, filtro):
+                sumidero.escribir(f'    n{identificador} [label="{_escapar_dot(str(actual))}"];\n')
+                if padre is not None:
+                    sumidero.escribir(f'    n{padre} -> n{identificador};\n')
+                total += 1
+            sumidero.escribir('}\n')
+        return total
+
+    @staticmethod
+    def exportar_jsonl(nodo, salida, profundidad=None, filtro=None):
+        """
+        Exporta el árbol en JSON-lines: un objeto por nodo, en preorden, con
+        id, padre, profundidad, etiqueta, tipo, val, linea y lugar.
+
+        salida: ruta o archivo de texto abierto
+        profundidad, filtro: ver recorrer_preorden
+        Retorna el número de nodos exportados.
+        """
+        codificar = json.JSONEncoder(ensure_ascii=False, default=str).encode
+        total = 0
+        with _abrir(salida) as sumidero:
+            for identificador, padre, nivel, actual, _ in recorrer_preorden(nodo, profundidad, filtro):
+                sumidero.escribir(codificar({
+                    'id': identificador,
+                    'padre': padre,
+                    'profundidad': nivel,
+                    'etiqueta': str(actual.etiqueta),
+                    'tipo': actual.tipo,
+                    'val': actual.val,
+                    'linea': actual.linea,
+                    'lugar': actual.lugar,
+                }) + "\n")
+                total += 1
+        return total
+
+    @staticmethod
+    def exportar_binario(nodo, salida, profundidad=None, filtro=None):
+        """
+        Exporta el árbol en el formato binario en preorden (ver el módulo).
+
+        salida: ruta o archivo binario abierto
+        profundidad, filtro: ver recorrer_preorden
+        Retorna el número de nodos exportados.
         """
+        referencias = {None: b'\x00'}   # {texto: bytes de su referencia}
+        total = 0
+
+        def cadena(buffer, texto):
+            referencia = referencias.get(texto)
+            if referencia is not None:
+                buffer += referencia
+                return
+            # Primera aparición: referencia n + 1 seguida de la cadena
+            referencia = bytearray()
+            _varint(referencia, len(referencias))
+            referencias[texto] = referencia = bytes(referencia)
+            codificado = texto.encode('utf-8')
+            buffer += referencia
+            _varint(buffer, len(codificado))
+            buffer += codificado
 
-        # Prefijo visual para ramas
-        rama = "└── " if es_ultimo else "├── "
-        print(prefijo + rama + str(nodo.etiqueta))
+        with _abrir(salida, binario=True) as sumidero:
+            sumidero.escribir(CABECERA_BINARIA)
+            buffer = bytearray()
+            for _, _, _, actual, hijos in recorrer_preorden(nodo, profundidad, filtro):
+                _varint(buffer, len(hijos))
+                cadena(buffer, str(actual.etiqueta))
+                cadena(buffer, actual.tipo)
+
+                valor = actual.val
+                if valor is None:
+                    buffer.append(_VALOR_NONE)
+                elif type(valor) is int:
+                    buffer.append(_VALOR_ENTERO)
+                    # zigzag: los negativos pequeños ocupan pocos bytes
+                    _varint(buffer, valor * 2 if valor >= 0 else -valor * 2 - 1)
+                elif type(valor) is float:
+                    buffer.append(_VALOR_FLOTANTE)
+                    buffer += _FLOTANTE.pack(valor)
+                else:
+                    buffer.append(_VALOR_OTRO)
+                    cadena(buffer, str(valor))
+
+                _varint(buffer, actual.linea or 0)
+                cadena(buffer, actual.lugar)
+                total += 1
+                if len(buffer) >= 4096:
+                    sumidero.escribir(buffer)
+                    buffer = bytearray()
+            sumidero.escribir(buffer)
+        return total
+
+    @staticmethod
+    def leer_binario(entrada):
+        """
+        Reconstruye un árbol de NodoAST desde el formato binario.
 
-        # Calcular nuevo prefijo para los hijos
-        if es_ultimo:
-            nuevo_prefijo = prefijo + "    "
+        entrada: ruta, archivo binario abierto o bytes
+        """
+        if isinstance(entrada, (bytes, bytearray)):
+            datos = entrada
+        elif isinstance(entrada, (str, os.PathLike)):
+            with open(entrada, 'rb') as f:
+                datos = f.read()
         else:
-            nuevo_prefijo = prefijo + "│   "
+            datos = entrada.read()
+        if datos[:len(CABECERA_BINARIA)] != CABECERA_BINARIA:
+            raise ValueError("No es un AST en formato binario (cabecera inválida)")
+
+        pos = len(CABECERA_BINARIA)
+        cadenas = []
+
+        def varint():
+            nonlocal pos
+            byte = datos[pos]
+            pos += 1
+            if byte < 0x80:
+                return byte
+            resultado, desplazamiento = byte & 0x7F, 7
+            while True:
+                byte = datos[pos]
+                pos += 1
+                resultado |= (byte & 0x7F) << desplazamiento
+                if byte < 0x80:
+                    return resultado
+                desplazamiento += 7
+
+        def cadena():
+            nonlocal pos
+            k = varint()
+            if k == 0:
+                return None
+            if k <= len(cadenas):
+                return cadenas[k - 1]
+            if k != len(cadenas) + 1:
+                raise ValueError(f"Referencia a cadena inválida en el byte {pos}")
+            longitud = varint()
+            texto = bytes(datos[pos:pos + longitud]).decode('utf-8')
+            pos += longitud
+            cadenas.append(texto)
+            return texto
+
+        raiz = None
+        pila = []   # [nodo, hijos que faltan leer]
+        try:
+            while raiz is None or pila:
+                n_hijos = varint()
+                etiqueta = cadena()
+                tipo = cadena()
+                clase = datos[pos]
+                pos += 1
+                if clase == _VALOR_NONE:
+                    valor = None
+                elif clase == _VALOR_ENTERO:
+                    z = varint()
+                    valor = z >> 1 if not z & 1 else -(z >> 1) - 1
+                elif clase == _VALOR_FLOTANTE:
+                    valor = _FLOTANTE.unpack_from(datos, pos)[0]
+                    pos += _FLOTANTE.size
+                else:
+                    valor = cadena()
+                linea = varint()
+                lugar = cadena()
+
+                nodo = NodoAST(etiqueta, tipo=tipo, val=valor, linea=linea, lugar=lugar)
+                if raiz is None:
+                    raiz = nodo
+                else:
+                    pila[-1][0].hijos.append(nodo)
+                    pila[-1][1] -= 1
+                if n_hijos:
+                    pila.append([nodo, n_hijos])
+                while pila and not pila[-1][1]:
+                    pila.pop()
+        except IndexError:
+            raise ValueError("AST binario truncado") from None
+        return raiz
+
+
+# Exportadores por formato (línea de comandos)
+FORMATOS = {
+    'dot': Graficador.exportar_dot,
+    'jsonl': Graficador.exportar_jsonl,
+    'bin': Graficador.exportar_binario,
+}
+
+
+def main():
+    """Función principal"""
+    opciones = {}
+    for argumento in sys.argv[1:]:
+        if argumento.startswith('--'):
+            nombre, _, valor = argumento[2:].partition('=')
+            opciones[nombre] = valor
+    argumentos = [a for a in sys.argv[1:] if not a.startswith('--')]
+    formato = opciones.get('formato') or 'dot'
+    if not argumentos or formato not in FORMATOS:
+        print("Uso: python graficador.py programa.txt [--formato=dot|jsonl|bin] "
+              "[--salida=ruta] [--profundidad=N] [--podar=Etiqueta,...] [--lr]")
+        return 1
+
+    # Importación diferida: solo la línea de comandos analiza programas
+    from analizador_completo import analizar
+
+    with open(argumentos[0], 'r', encoding='utf-8') as f:
+        entrada = f.read()
+    _, ast, _ = analizar(entrada, lr='lr' in opciones)
+
+    profundidad = int(opciones['profundidad']) if opciones.get('profundidad') else None
+    podar = set(opciones['podar'].split(',')) if opciones.get('podar') else None
+    filtro = (lambda nodo: str(nodo.etiqueta) not in podar) if podar else None
+
+    salida = opciones.get('salida')
+    if salida is None:
+        salida = sys.stdout.buffer if formato == 'bin' else sys.stdout
+    total = FORMATOS[formato](ast, salida, profundidad, filtro)
+    if opciones.get('salida'):
+        print(f"📄 {total} nodos exportados a {opciones['salida']} ({formato})")
+    return 0
+
 
-        # Recorrer hijos
-        for i, hijo in enumerate(nodo.hijos):
-            es_ultimo_hijo = (i == len(nodo.hijos) - 1)
-            Graficador.imprimir_arbol(hijo, nivel + 1, es_ultimo_hijo, nuevo_prefijo)
\ No newline at end of file
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,293 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# maquina_virtual.py
+"""
+Máquina virtual de registros para ejecutar el código de tres direcciones
+
+Las variables declaradas, los temporales y las constantes se asignan a
+posiciones (slots) de una memoria plana. Las instrucciones se decodifican
+una sola vez en tuplas (opcode, destino, op1, op2, indice) y se ejecutan en
+un ciclo de despacho sin volver a analizar el texto.
+
+Semántica de tipos (coercion_tipos):
+- int ⊕ int → int   (la división entera trunca hacia cero)
+- int ⊕ float, float ⊕ int, float ⊕ float → float
+- Asignar a una variable convierte el valor al tipo declarado
+"""
+
+import re
+import sys
+from nodo_ast import coercion_tipos
+
+# Códigos de operación
+OP_SUMA = 0
+OP_RESTA = 1
+OP_MUL = 2
+OP_DIV = 3
+OP_DIV_ENTERA = 4
+OP_COPIA = 5
+OP_A_INT = 6
+OP_A_FLOAT = 7
+
+OPERADORES = {'+': OP_SUMA, '-': OP_RESTA, '*': OP_MUL, '/': OP_DIV}
+
+# Formatos de instrucción generados por GeneradorCodigo
+PATRON_DECLARACION = re.compile(r'^declare (\w+) : (\w+)$')
+PATRON_OPERACION = re.compile(r'^(\w+) = (\S+) ([-+*/]) (\S+)$')
+PATRON_COPIA = re.compile(r'^(\w+) = (\S+)$')
+# Operando literal entero
+PATRON_ENTERO = re.compile(r'[-+]?\d+')
+
+
+def division_entera(a, b):
+    """División entera con truncamiento hacia cero (como en C)"""
+    cociente = abs(a) // abs(b)
+    return cociente if (a < 0) == (b < 0) else -cociente
+
+
+def convertir_valor(valor, tipo):
+    """Convierte un valor al tipo declarado"""
+    if tipo == 'int':
+        return int(valor)
+    if tipo == 'float':
+        return float(valor)
+    return valor
+
+
+def literal_numerico(texto):
+    """
+    Convierte un operando literal en (tipo, valor), o None si no es numérico.
+    Un literal entero con más dígitos de los que convierte int()
+    (sys.get_int_max_str_digits) lanza ValueError: nunca se lee como float.
+    """
+    try:
+        return 'int', int(texto)
+    except ValueError:
+        if PATRON_ENTERO.fullmatch(texto):
+            raise ValueError(f"Literal entero de {len(texto.lstrip('+-'))} dígitos, "
+                             "demasiado largo para convertirlo") from None
+    try:
+        return 'float', float(texto)
+    except ValueError:
+        return None
+
+
+class MaquinaVirtual:
+    """Máquina virtual de registros para código de tres direcciones"""
+
+    def __init__(self, codigo):
+        """
+        codigo: texto de GeneradorCodigo.obtener_codigo() o lista de instrucciones
+        """
+        if isinstance(codigo, str):
+            codigo = codigo.splitlines()
+
+        self.slots = {}              # {nombre: índice} para variables y temporales
+        self.tipos = []              # tipo de cada slot
+        self.variables = []          # variables declaradas, en orden
+        self.memoria_inicial = []    # valores iniciales (ceros y constantes)
+        self.instrucciones = []      # tuplas (opcode, destino, op1, op2, indice)
+        self.fuente = []             # texto original de cada instrucción
+        self.constantes = {}         # {literal: índice}
+
+        for linea in codigo:
+            linea = linea.strip()
+            if linea:
+                self._decodificar(linea)
+
+    def _nuevo_slot(self, tipo, valor):
+        """Reserva un slot en la memoria"""
+        self.tipos.append(tipo)
+        self.memoria_inicial.append(valor)
+        return len(self.tipos) - 1
+
+    def _operando(self, texto, linea):
+        """Obtiene el slot de un operando (variable, temporal o constante)"""
+        if texto in self.slots:
+            return self.slots[texto]
+
+        if texto in self.constantes:
+            return self.constantes[texto]
+
+        literal = literal_numerico(texto)
+        if literal is None:
+            raise ValueError(f"Instrucción '{linea}': Operando '{texto}' no declarado")
+
+        tipo, valor = literal
+        slot = self._nuevo_slot(tipo, valor)
+        self.constantes[texto] = slot
+        return slot
+
+    def _destino(self, nombre, tipo):
+        """Obtiene el slot destino, creando un temporal si no existe"""
+        if nombre not in self.slots:
+            self.slots[nombre] = self._nuevo_slot(tipo, convertir_valor(0, tipo))
+        return self.slots[nombre]
+
+    def _emitir(self, opcode, destino, op1, op2, linea):
+        """Agrega una instrucción decodificada"""
+        self.instrucciones.append((opcode, destino, op1, op2, len(self.fuente)))
+        self.fuente.append(linea)
+
+    def _emitir_conversion(self, destino, origen, tipo_origen, linea):
+        """Copia origen en destino convirtiendo al tipo del destino si es necesario"""
+        tipo_destino = self.tipos[destino]
+        if tipo_destino == tipo_origen:
+            if destino != origen:
+                self._emitir(OP_COPIA, destino, origen, origen, linea)
+        elif tipo_destino == 'int':
+            self._emitir(OP_A_INT, destino, origen, origen, linea)
+        else:
+            self._emitir(OP_A_FLOAT, destino, origen, origen, linea)
+
+    def _decodificar(self, linea):
+        """Decodifica una instrucción de tres direcciones"""
+        # declare x : tipo
+        match = PATRON_DECLARACION.match(linea)
+        if match:
+            nombre, tipo = match.groups()
+            if tipo not in ('int', 'float'):
+                raise ValueError(f"Instrucción '{linea}': Tipo '{tipo}' no soportado")
+            if nombre not in self.slots:
+                self.slots[nombre] = self._nuevo_slot(tipo, convertir_valor(0, tipo))
+                self.variables.append(nombre)
+            return
+
+        # destino = op1 operador op2
+        match = PATRON_OPERACION.match(linea)
+        if match:
+            destino, texto_izq, operador, texto_der = match.groups()
+            izq = self._operando(texto_izq, linea)
+            der = self._operando(texto_der, linea)
+            tipo = coercion_tipos(self.tipos[izq], self.tipos[der])
+
+            opcode = OPERADORES[operador]
+            if opcode == OP_DIV and tipo == 'int':
+                opcode = OP_DIV_ENTERA
+
+            slot = self._destino(destino, tipo)
+            self._emitir(opcode, slot, izq, der, linea)
+
+            # Ajustar al tipo declarado si el destino es una variable
+            self._emitir_conversion(slot, slot, tipo, linea)
+            return
+
+        # destino = origen
+        match = PATRON_COPIA.match(linea)
+        if match:
+            destino, texto_origen = match.groups()
+            origen = self._operando(texto_origen, linea)
+            tipo = self.tipos[origen]
+            slot = self._destino(destino, tipo)
+            self._emitir_conversion(slot, origen, tipo, linea)
+            return
+
+        raise ValueError(f"Instrucción no reconocida: '{linea}'")
+
+    def nueva_memoria(self, valores=None):
+        """Crea una memoria inicializada con valores para las variables declaradas"""
+        memoria = self.memoria_inicial.copy()
+        if valores:
+            for nombre, valor in valores.items():
+                if nombre not in self.variables:
+                    raise ValueError(f"Variable '{nombre}' no declarada en el programa")
+                slot = self.slots[nombre]
+                memoria[slot] = convertir_valor(valor, self.tipos[slot])
+        return memoria
+
+    def ejecutar_memoria(self, m):
+        """Ejecuta el programa sobre una memoria (modificada en el lugar)"""
+        SUMA, RESTA, MUL, DIV = OP_SUMA, OP_RESTA, OP_MUL, OP_DIV
+        DIV_ENTERA, COPIA, A_INT = OP_DIV_ENTERA, OP_COPIA, OP_A_INT
+
+        for op, d, a, b, indice in self.instrucciones:
+            if op == SUMA:
+                m[d] = m[a] + m[b]
+            elif op == MUL:
+                m[d] = m[a] * m[b]
+            elif op == RESTA:
+                m[d] = m[a] - m[b]
+            elif op == COPIA:
+                m[d] = m[a]
+            elif op == DIV:
+                divisor = m[b]
+                if not divisor:
+                    self._division_por_cero(indice)
+                m[d] = m[a] / divisor
+            elif op == DIV_ENTERA:
+                divisor = m[b]
+                if not divisor:
+                    self._division_por_cero(indice)
+                m[d] = division_entera(m[a], divisor)
+            elif op == A_INT:
+                m[d] = int(m[a])
+            else:
+                m[d] = float(m[a])
+
+        return m
+
+    def _division_por_cero(self, indice):
+        """Detiene la ejecución por una división por cero"""
+        raise ZeroDivisionError(
+            f"Instrucción {indice + 1} ({self.fuente[indice]}): División por cero"
+        )
+
+    def ejecutar(self, valores=None):
+        """Ejecuta el programa y retorna el estado final de las variables declaradas"""
+        memoria = self.ejecutar_memoria(self.nueva_memoria(valores))
+        return {nombre: memoria[self.slots[nombre]] for nombre in self.variables}
+
+
+def main():
+    """Función principal"""
+    from analizador_completo import (AnalizadorLexico, AnalizadorSintactico,
+                                     reportar_errores_lexicos)
+
+    if len(sys.argv) < 2:
+        print("\n❌ Error: Debe proporcionar un archivo de código")
+        print("Uso: python maquina_virtual.py programa.txt [nombre=valor ...]")
+        return 1
+
+    try:
+        with open(sys.argv[1], 'r', encoding='utf-8') as f:
+            entrada = f.read()
+
+        # Valores iniciales: nombre=valor
+        valores = {}
+        for argumento in sys.argv[2:]:
+            nombre, _, texto = argumento.partition('=')
+            literal = literal_numerico(texto)
+            if literal is None:
+                raise ValueError(f"Valor inválido para '{nombre}': '{texto}'")
+            valores[nombre] = literal[1]
+
+        lexico = AnalizadorLexico(entrada)
+        sintactico = AnalizadorSintactico(lexico.tokenizar())
+        reportar_errores_lexicos(sintactico, lexico.errores)
+        sintactico.parsear()
+
+        if sintactico.tabla_simbolos.tiene_errores():
+            sintactico.tabla_simbolos.imprimir_errores()
+            return 1
+
+        maquina = MaquinaVirtual(sintactico.generador.obtener_codigo())
+        estado = maquina.ejecutar(valores)
+
+    except FileNotFoundError:
+        print(f"\n❌ Error: Archivo '{sys.argv[1]}' no encontrado")
+        return 1
+    except (ValueError, SyntaxError, ZeroDivisionError, OverflowError) as e:
+        print(f"\n❌ ERROR: {e}")
+        return 1
+
+    print("\n" + "="*80)
+    print(" EJECUCIÓN (MÁQUINA VIRTUAL) ".center(80, "="))
+    print("="*80)
+    for nombre, valor in estado.items():
+        print(f"  {nombre:10} {maquina.tipos[maquina.slots[nombre]]:8} {valor}")
+    print("="*80)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -3,23 +3,28 @@
 Estructura de nodos del AST decorado con atributos
 """
 
+import math
+import sys
+
+from diagnosticos import Diagnostico
+
 class NodoAST:
     """Nodo del árbol de sintaxis abstracta decorado"""
     
-    def __init__(self, etiqueta, hijos=None, **atributos):
+    def __init__(self, etiqueta, hijos=None, tipo=None, val=None, codigo="", linea=0,
+                 lugar=None, **atributos):
         self.etiqueta = etiqueta      # Operador, identificador o valor
         self.hijos = hijos or []      # Lista de nodos hijos
         
-        # Atributos semánticos
-        self.tipo = atributos.get('tipo', None)          # Tipo de dato (int, float, void)
-        self.val = atributos.get('val', None)            # Valor calculado
-        self.codigo = atributos.get('codigo', "")        # Código intermedio
-        self.linea = atributos.get('linea', 0)           # Número de línea
-        self.lugar = atributos.get('lugar', None)        # Lugar temporal para código
+        # Atributos semánticos (parámetros con nombre: se crea uno por nodo)
+        self.tipo = tipo              # Tipo de dato (int, float, void)
+        self.val = val                # Valor calculado
+        self.codigo = codigo          # Código intermedio
+        self.linea = linea            # Número de línea
+        self.lugar = lugar            # Lugar temporal para código
         
         # Atributos adicionales personalizados
-        self.atributos = {k: v for k, v in atributos.items() 
-                         if k not in ['tipo', 'val', 'codigo', 'linea', 'lugar']}
+        self.atributos = atributos
     
     def agregar_hijo(self, hijo):
         """Agrega un hijo al nodo"""
@@ -110,51 +115,287 @@ class NodoAST:
         return nodos_encontrados
 
 
-def crear_nodo_operacion(operador, izq, der, linea=0):
-    """Crea un nodo para una operación binaria con cálculo de tipo y valor"""
+# Atributos que un NodoPerezoso puede definir por reglas, con su valor sin regla
+ATRIBUTOS_PEREZOSOS = ('tipo', 'val', 'lugar', 'codigo')
+_SIN_REGLA = {'tipo': None, 'val': None, 'lugar': None, 'codigo': ""}
+
+
+class Regla:
+    """
+    Regla de un atributo: calcular(nodo) retorna su valor y dependencias(nodo)
+    las instancias (nodo, atributo) que calcular consulta, en el orden en que
+    deben evaluarse.
+    """
+    __slots__ = ('calcular', 'dependencias')
+    
+    def __init__(self, calcular, dependencias=None):
+        self.calcular = calcular
+        self.dependencias = dependencias or (lambda nodo: ())
+
+
+def _atributo_perezoso(nombre):
+    """Propiedad que evalúa la regla del atributo la primera vez que se consulta"""
+    def obtener(self):
+        calculados = self.calculados
+        if nombre in calculados:
+            return calculados[nombre]
+        return evaluar_atributo(self, nombre)
+    
+    def establecer(self, valor):
+        self.calculados[nombre] = valor
+    
+    return property(obtener, establecer)
+
+
+class NodoPerezoso(NodoAST):
+    """
+    Nodo del AST con atributos definidos por reglas (gramática de atributos).
+
+    reglas es {atributo: Regla}, normalmente compartido por todos los nodos de
+    una misma producción; contexto guarda los datos propios del nodo que usan
+    las reglas. Cada atributo de ATRIBUTOS_PEREZOSOS con regla se calcula al
+    consultarlo por primera vez y queda memorizado; los demás valen lo que se
+    pasó al crear el nodo. Asignar un atributo reemplaza su regla.
+    """
+    
+    tipo = _atributo_perezoso('tipo')
+    val = _atributo_perezoso('val')
+    lugar = _atributo_perezoso('lugar')
+    codigo = _atributo_perezoso('codigo')
+    
+    def __init__(self, etiqueta, hijos=None, reglas=None, contexto=None, linea=0,
+                 **atributos):
+        # Sin NodoAST.__init__: se crea uno por nodo y los setters lo encarecen
+        self.etiqueta = etiqueta
+        self.hijos = hijos or []
+        self.reglas = reglas = reglas or {}
+        self.contexto = contexto
+        self.linea = linea
+        # {atributo: valor} ya evaluados o dados; los que tienen regla esperan a consultarse
+        calculados = self.calculados = {}
+        for nombre in ATRIBUTOS_PEREZOSOS:
+            if nombre in atributos:
+                calculados[nombre] = atributos.pop(nombre)
+            elif nombre not in reglas:
+                calculados[nombre] = _SIN_REGLA[nombre]
+        self.atributos = atributos
+    
+    def evaluado(self, nombre):
+        """True si el atributo ya tiene valor (dado o calculado)"""
+        return nombre in self.calculados
+
+
+def evaluar_atributo(nodo, atributo):
+    """
+    Valor de nodo.atributo, evaluando antes sus dependencias que falten.
+
+    Usa una pila explícita: las dependencias se evalúan en el orden de la regla
+    (postorden, como las acciones del análisis) y la profundidad del árbol o de
+    las cadenas de definiciones no consume la pila de Python.
+    """
+    if not isinstance(nodo, NodoPerezoso):
+        return getattr(nodo, atributo)
+    
+    # (nodo, atributo, dependencias ya apiladas)
+    pila = [(nodo, atributo, False)]
+    while pila:
+        actual, nombre, listo = pila.pop()
+        calculados = actual.calculados
+        if nombre in calculados:
+            continue
+        regla = actual.reglas[nombre]
+        if listo:
+            calculados[nombre] = regla.calcular(actual)
+            continue
+        pila.append((actual, nombre, True))
+        for dependencia, a in reversed(regla.dependencias(actual)):
+            if isinstance(dependencia, NodoPerezoso) and a not in dependencia.calculados:
+                pila.append((dependencia, a, False))
+    return nodo.calculados[atributo]
+
+
+POLITICAS_DESBORDE = ('envolver', 'saturar', 'abandonar')
+
+
+def max_bits():
+    """
+    Ancho máximo para que todo entero en rango se pueda convertir a texto
+    (sys.get_int_max_str_digits() dígitos decimales); None si no hay límite
+    """
+    digitos = getattr(sys, 'get_int_max_str_digits', lambda: 0)()
+    return digitos * 100000 // 30103 if digitos else None
+
+
+class LimitesConstantes:
+    """
+    Límites del plegado de constantes.
+
+    Los enteros se acotan a un ancho de bits con signo; un resultado fuera de
+    rango se envuelve (complemento a dos), se satura o deja de plegarse
+    (val=None, el cálculo queda en el código). Un flotante que desborda a
+    inf/nan no se pliega. bits=None desactiva el límite de enteros; bits no
+    puede superar max_bits().
+    """
+    
+    def __init__(self, bits=4096, politica='abandonar'):
+        if politica not in POLITICAS_DESBORDE:
+            raise ValueError(f"Política de desbordamiento desconocida: '{politica}'")
+        if bits is not None and bits < 2:
+            raise ValueError(f"Ancho de bits inválido: {bits}")
+        maximo_bits = max_bits()
+        if bits is not None and maximo_bits is not None and bits > maximo_bits:
+            raise ValueError(f"Ancho de bits inválido: {bits} (máximo {maximo_bits})")
+        self.bits = bits
+        self.politica = politica
+        if bits is not None:
+            self.minimo = -(1 << (bits - 1))
+            self.maximo = (1 << (bits - 1)) - 1
+            # Dígitos decimales a partir de los cuales un literal seguro no cabe
+            self.max_digitos = bits * 30103 // 100000 + 2
+    
+    def acotar_entero(self, valor):
+        """Retorna (valor acotado o None, desbordó)"""
+        if self.bits is None or self.minimo <= valor <= self.maximo:
+            return valor, False
+        if self.politica == 'envolver':
+            return ((valor - self.minimo) & ((1 << self.bits) - 1)) + self.minimo, True
+        if self.politica == 'saturar':
+            return (self.maximo if valor > 0 else self.minimo), True
+        return None, True
+
+
+LIMITES_POR_DEFECTO = LimitesConstantes()
+
+# Descripción de la política en la advertencia W002
+_ACCIONES = {'envolver': 'se envuelve', 'saturar': 'se satura', 'abandonar': 'no se pliega'}
+
+
+def _advertir(advertir, codigo, linea, *args):
+    """Reporta una advertencia de plegado (sin callback se imprime)"""
+    if advertir is None:
+        print(f"⚠️  Advertencia al calcular valor: {Diagnostico(codigo, linea, args=args)}")
+    else:
+        advertir(codigo, linea, *args)
+
+
+def plegar_constante(operador, a, b, linea=0, limites=LIMITES_POR_DEFECTO, advertir=None,
+                     tipo=None):
+    """
+    Retorna (valor, acotado): a op b dentro de los límites, o None si no se
+    pliega; acotado es True si el valor se envolvió o saturó y ya no es el que
+    calcula la instrucción a op b.
+    
+    tipo es el tipo del resultado: con 'int' la división trunca hacia cero,
+    como la máquina virtual (7 / 2 = 3, -7 / 2 = -3).
+    """
+    if operador == '/' and b == 0:
+        # La división por cero la reporta el analizador (E003)
+        return None, False
+    try:
+        if operador == '+':
+            valor = a + b
+        elif operador == '-':
+            valor = a - b
+        elif operador == '*':
+            valor = a * b
+        elif operador == '/' and tipo == 'int' and type(a) is int and type(b) is int:
+            cociente = abs(a) // abs(b)
+            valor = cociente if (a < 0) == (b < 0) else -cociente
+        elif operador == '/':
+            valor = a / b
+        else:
+            return None, False
+    except OverflowError:
+        # int demasiado grande para convertirse a float
+        _advertir(advertir, 'W003', linea)
+        return None, False
+    
+    if type(valor) is int:
+        valor, desborde = limites.acotar_entero(valor)
+        if desborde:
+            _advertir(advertir, 'W002', linea, limites.bits, _ACCIONES[limites.politica])
+        return valor, desborde and valor is not None
+    
+    # Flotante: inf o nan a partir de operandos finitos es desbordamiento
+    if math.isinf(valor) or math.isnan(valor):
+        if math.isfinite(a) and math.isfinite(b):
+            _advertir(advertir, 'W003', linea)
+            return None, False
+    return valor, False
+
+
+def crear_nodo_operacion(operador, izq, der, linea=0, limites=LIMITES_POR_DEFECTO, advertir=None):
+    """
+    Crea un nodo para una operación binaria con cálculo de tipo y valor.
+    
+    advertir(codigo, linea, *args) recibe las advertencias del plegado; sin él
+    se imprimen. Si el valor se envolvió o saturó, el nodo lleva el atributo
+    'acotado' y su instrucción debe asignar val en lugar de calcularlo.
+    """
     # Coerción de tipos
     tipo_resultado = coercion_tipos(izq.tipo, der.tipo)
     
-    # Cálculo del valor si ambos operandos son constantes
-    valor_resultado = None
+    # Cálculo del valor si ambos operandos son constantes (acotado por limites)
+    valor_resultado, acotado = None, False
     if izq.val is not None and der.val is not None:
-        try:
-            if operador == '+':
-                valor_resultado = izq.val + der.val
-            elif operador == '-':
-                valor_resultado = izq.val - der.val
-            elif operador == '*':
-                valor_resultado = izq.val * der.val
-            elif operador == '/':
-                if der.val == 0:
-                    raise ValueError(f"Línea {linea}: División por cero")
-                valor_resultado = izq.val / der.val
-        except Exception as e:
-            print(f"⚠️  Advertencia al calcular valor: {e}")
+        valor_resultado, acotado = plegar_constante(operador, izq.val, der.val, linea, limites,
+                                                    advertir, tipo_resultado)
     
-    return NodoAST(
+    nodo = NodoAST(
         operador,
         hijos=[izq, der],
         tipo=tipo_resultado,
         val=valor_resultado,
         linea=linea
     )
+    if acotado:
+        nodo.establecer_atributo('acotado', True)
+    return nodo
 
 
-def crear_nodo_numero(lexema, linea=0):
-    """Crea un nodo para un número literal"""
-    # Determinar tipo basado en el formato
-    if '.' in lexema or 'e' in lexema.lower():
-        tipo = 'float'
+def tipo_literal(lexema):
+    """Tipo de un número literal según su formato"""
+    return 'float' if '.' in lexema or 'e' in lexema.lower() else 'int'
+
+
+def valor_literal(lexema, linea=0, limites=LIMITES_POR_DEFECTO, advertir=None):
+    """Valor de un número literal dentro de los límites, o None si no se pliega"""
+    if tipo_literal(lexema) == 'float':
         valor = float(lexema)
-    else:
-        tipo = 'int'
-        valor = int(lexema)
+        if math.isinf(valor):
+            _advertir(advertir, 'W003', linea)
+            valor = None
+        return valor
     
+    # Un literal enorme ni siquiera se convierte (costo cuadrático)
+    digitos = len(lexema.lstrip('0'))
+    entero = None
+    if limites.bits is None or digitos <= limites.max_digitos:
+        try:
+            entero = int(lexema)
+        except ValueError:
+            # Más dígitos de los que int() convierte (sys.get_int_max_str_digits)
+            pass
+    if entero is None:
+        if limites.bits is None:
+            _advertir(advertir, 'W004', linea, digitos)
+            return None
+        valor = None if limites.politica != 'saturar' else limites.maximo
+        _advertir(advertir, 'W002', linea, limites.bits,
+                  _ACCIONES['abandonar' if valor is None else 'saturar'])
+        return valor
+    valor, desborde = limites.acotar_entero(entero)
+    if desborde:
+        _advertir(advertir, 'W002', linea, limites.bits, _ACCIONES[limites.politica])
+    return valor
+
+
+def crear_nodo_numero(lexema, linea=0, limites=LIMITES_POR_DEFECTO, advertir=None):
+    """Crea un nodo para un número literal"""
     return NodoAST(
         lexema,
-        tipo=tipo,
-        val=valor,
+        tipo=tipo_literal(lexema),
+        val=valor_literal(lexema, linea, limites, advertir),
         linea=linea
     )
 
@@ -169,6 +410,57 @@ def crear_nodo_identificador(nombre, tipo_var, valor=None, linea=0):
     )
 
 
+class ConstructorDAG:
+    """
+    Construcción de un DAG de expresiones por hash-consing.
+
+    Los nodos estructuralmente idénticos se comparten: las operaciones se
+    identifican por (operador, id(izq), id(der), tipo) y los identificadores
+    por su versión, que cambia con cada asignación a la variable.
+    """
+    
+    def __init__(self, limites=LIMITES_POR_DEFECTO, advertir=None):
+        self.limites = limites
+        self.advertir = advertir
+        self.nodos = {}       # {clave: NodoAST}
+        self.versiones = {}   # {nombre: versión actual}
+        self.reutilizados = 0 # nodos devueltos desde la tabla
+    
+    def _obtener(self, clave, crear):
+        """Retorna el nodo para la clave, creándolo si no existe"""
+        nodo = self.nodos.get(clave)
+        if nodo is None:
+            nodo = crear()
+            self.nodos[clave] = nodo
+        else:
+            self.reutilizados += 1
+        return nodo
+    
+    def operacion(self, operador, izq, der, linea=0):
+        """Nodo compartido para una operación binaria"""
+        clave = ('op', operador, id(izq), id(der), coercion_tipos(izq.tipo, der.tipo))
+        return self._obtener(clave, lambda: crear_nodo_operacion(
+            operador, izq, der, linea, self.limites, self.advertir
+        ))
+    
+    def numero(self, lexema, linea=0):
+        """Nodo compartido para un número literal"""
+        return self._obtener(
+            ('num', lexema), lambda: crear_nodo_numero(lexema, linea, self.limites, self.advertir)
+        )
+    
+    def identificador(self, nombre, tipo_var, valor=None, linea=0):
+        """Nodo compartido para un identificador en su versión actual"""
+        clave = ('id', nombre, self.versiones.get(nombre, 0))
+        return self._obtener(
+            clave, lambda: crear_nodo_identificador(nombre, tipo_var, valor, linea)
+        )
+    
+    def nueva_version(self, nombre):
+        """Registra una asignación: los usos posteriores son nodos distintos"""
+        self.versiones[nombre] = self.versiones.get(nombre, 0) + 1
+
+
 def coercion_tipos(tipo1, tipo2):
     """Realiza coerción de tipos entre dos operandos"""
     if tipo1 is None or tipo2 is None:
@@ -190,3 +482,21 @@ def tipo_compatible(tipo1, tipo2):
     """Verifica si dos tipos son compatibles para operaciones"""
     tipos_numericos = {'int', 'float'}
     return tipo1 in tipos_numericos and tipo2 in tipos_numericos
+
+
+def valor_asignado(valor, tipo):
+    """
+    Valor constante que toma una variable del tipo declarado, como al asignar
+    en la máquina virtual: int trunca, float convierte. None si no se conoce
+    o no cabe en un float.
+    """
+    if valor is None:
+        return None
+    try:
+        if tipo == 'int':
+            return int(valor)
+        if tipo == 'float':
+            return float(valor)
+    except OverflowError:
+        return None
+    return valor
@@ -0,0 +1,158 @@
+# referencias.py
+"""
+Índice de referencias cruzadas y cadenas definición-uso
+
+Se construye durante el análisis (acciones semánticas de declaración,
+asignación e identificador) y responde en O(1) más el tamaño de la respuesta
+dónde se declara, asigna o lee cada variable. Como el lenguaje no tiene
+control de flujo, la definición que alcanza a una lectura es la última
+declaración o asignación anterior de la variable.
+
+Cada referencia conserva el nodo del AST que la produjo (en modo DAG ese nodo
+puede ser compartido por varias lecturas).
+"""
+
+DECLARACION = 'declaracion'
+ASIGNACION = 'asignacion'
+LECTURA = 'lectura'
+
+
+class Referencia:
+    """Aparición de una variable en el programa"""
+    __slots__ = ('clase', 'nombre', 'linea', 'columna', 'nodo', 'definicion', 'usos')
+
+    def __init__(self, clase, nombre, linea, columna, nodo, definicion=None):
+        self.clase = clase            # DECLARACION, ASIGNACION o LECTURA
+        self.nombre = nombre
+        self.linea = linea
+        self.columna = columna
+        self.nodo = nodo              # nodo del AST
+        self.definicion = definicion  # lecturas: definición que las alcanza
+        self.usos = []                # definiciones: lecturas alcanzadas
+
+    def es_definicion(self):
+        return self.clase != LECTURA
+
+    def __repr__(self):
+        return f"Referencia({self.clase}, {self.nombre!r}, línea {self.linea}:{self.columna})"
+
+
+class SimboloReferenciado:
+    """Referencias de una variable declarada"""
+    __slots__ = ('nombre', 'tipo', 'declaracion', 'asignaciones', 'lecturas', 'todas', 'vigente')
+
+    def __init__(self, declaracion, tipo):
+        self.nombre = declaracion.nombre
+        self.tipo = tipo
+        self.declaracion = declaracion
+        self.asignaciones = []
+        self.lecturas = []
+        self.todas = [declaracion]    # en orden de aparición
+        self.vigente = declaracion    # definición que alcanza la siguiente lectura
+
+    def definiciones(self):
+        """Declaración y asignaciones, en orden"""
+        return [self.declaracion] + self.asignaciones
+
+
+class IndiceReferencias:
+    """Índice por nombre (y por nodo) de las referencias registradas en el análisis"""
+
+    def __init__(self):
+        self.simbolos = {}        # {nombre: [SimboloReferenciado]} uno por declaración
+        self.no_declaradas = {}   # {nombre: [Referencia]} sin declaración visible
+        self.por_nodo = {}        # {id(nodo): [Referencia]}
+        self.orden = []           # todas las referencias en orden de registro
+
+    def _registrar(self, referencia):
+        self.orden.append(referencia)
+        if referencia.nodo is not None:
+            self.por_nodo.setdefault(id(referencia.nodo), []).append(referencia)
+        return referencia
+
+    # --- Registro (desde las acciones semánticas) ---
+
+    def declarar(self, nombre, tipo, linea, columna, nodo):
+        """Declaración aceptada por la tabla de símbolos"""
+        referencia = self._registrar(Referencia(DECLARACION, nombre, linea, columna, nodo))
+        self.simbolos.setdefault(nombre, []).append(SimboloReferenciado(referencia, tipo))
+        return referencia
+
+    def asignar(self, nombre, linea, columna, nodo):
+        """Asignación a una variable: pasa a ser su definición vigente"""
+        simbolo = self.simbolo(nombre)
+        referencia = self._registrar(Referencia(ASIGNACION, nombre, linea, columna, nodo))
+        if simbolo is None:
+            self.no_declaradas.setdefault(nombre, []).append(referencia)
+        else:
+            simbolo.asignaciones.append(referencia)
+            simbolo.todas.append(referencia)
+            simbolo.vigente = referencia
+        return referencia
+
+    def leer(self, nombre, linea, columna, nodo):
+        """Lectura de una variable, enlazada con la definición que la alcanza"""
+        simbolo = self.simbolo(nombre)
+        if simbolo is None:
+            referencia = self._registrar(Referencia(LECTURA, nombre, linea, columna, nodo))
+            self.no_declaradas.setdefault(nombre, []).append(referencia)
+            return referencia
+        referencia = self._registrar(
+            Referencia(LECTURA, nombre, linea, columna, nodo, simbolo.vigente)
+        )
+        simbolo.vigente.usos.append(referencia)
+        simbolo.lecturas.append(referencia)
+        simbolo.todas.append(referencia)
+        return referencia
+
+    # --- Consultas ---
+
+    def simbolo(self, nombre):
+        """Última declaración registrada de nombre (la visible) o None"""
+        declaraciones = self.simbolos.get(nombre)
+        return declaraciones[-1] if declaraciones else None
+
+    def declaracion(self, nombre):
+        simbolo = self.simbolo(nombre)
+        return simbolo.declaracion if simbolo else None
+
+    def asignaciones(self, nombre):
+        simbolo = self.simbolo(nombre)
+        return simbolo.asignaciones if simbolo else []
+
+    def lecturas(self, nombre):
+        simbolo = self.simbolo(nombre)
+        return simbolo.lecturas if simbolo else []
+
+    def referencias(self, nombre):
+        """Declaración, asignaciones y lecturas de nombre en orden de aparición"""
+        simbolo = self.simbolo(nombre)
+        return simbolo.todas if simbolo else self.no_declaradas.get(nombre, [])
+
+    def en_nodo(self, nodo):
+        """Referencias producidas por un nodo del AST"""
+        return self.por_nodo.get(id(nodo), [])
+
+    def sin_uso(self):
+        """Definiciones cuyo valor nunca se lee"""
+        return [definicion for declaraciones in self.simbolos.values()
+                for simbolo in declaraciones for definicion in simbolo.definiciones()
+                if not definicion.usos]
+
+    def imprimir(self):
+        """Imprime la tabla de referencias cruzadas"""
+        print("\n" + "="*80)
+        print(" REFERENCIAS CRUZADAS ".center(80, "="))
+        print("="*80)
+        print(f"{'Nombre':10} {'Tipo':8} {'Decl.':6} {'Asignaciones':24} {'Lecturas':28}")
+        print("-"*80)
+        lineas = lambda referencias: ", ".join(str(r.linea) for r in referencias) or "-"
+        for nombre in sorted(self.simbolos):
+            for simbolo in self.simbolos[nombre]:
+                print(f"{nombre:10} {simbolo.tipo:8} {simbolo.declaracion.linea:<6} "
+                      f"{lineas(simbolo.asignaciones):24} {lineas(simbolo.lecturas):28}")
+        for nombre in sorted(self.no_declaradas):
+            print(f"{nombre:10} {'?':8} {'-':6} "
+                  f"{lineas(r for r in self.no_declaradas[nombre] if r.clase == ASIGNACION):24} "
+                  f"{lineas(r for r in self.no_declaradas[nombre] if r.clase == LECTURA):28}")
+        print("="*80)
@@ -0,0 +1,399 @@
+#!/usr/bin/env python3
+# tabla_comprimida.py
+"""
+Tablas de análisis comprimidas para gramáticas grandes
+
+Los símbolos se numeran con enteros densos (terminales primero, '$' incluido, y
+luego no terminales). Cada fila de la tabla (estado LALR o no terminal LL(1))
+guarda su acción más frecuente como acción por defecto y el resto se empaqueta
+por desplazamiento de filas ("peine") en arreglos planos:
+
+    i = base[fila] + columna
+    valor = valor[i] if verificacion[i] == fila else por_defecto[fila]
+
+Codificación de acciones LALR: 0 error, j + 1 desplazar al estado j,
+-(p + 1) reducir por la producción p (-1 = aceptar). Las tablas LL(1)
+guardan p + 1. Solo las reducciones son acciones por defecto: un
+desplazamiento nunca se hace con un token inválido.
+"""
+
+import array
+import struct
+import sys
+import time
+from collections import Counter
+from itertools import accumulate
+
+from calculador_conjuntos import (leer_gramatica, calcular_primeros, calcular_siguientes,
+                                  calcular_prediccion, construir_lalr, aumentar_gramatica,
+                                  obtener_terminales_no_terminales)
+
+MAGIC = b'TSPT'
+VERSION_FORMATO = 1
+EXTENSION = '.tspt'
+
+# Clases de tabla
+TABLA_LALR, TABLA_LL1 = range(2)
+
+# Secciones del archivo, en orden: (nombre, typecode)
+SECCIONES = [
+    ('cadenas_longitudes', 'I'), ('cadenas_datos', 'B'),
+    ('prod_cabeza', 'I'), ('prod_longitud', 'I'), ('prod_simbolos', 'I'),
+    ('acc_base', 'i'), ('acc_defecto', 'i'), ('acc_valor', 'i'), ('acc_verificacion', 'i'),
+    ('ira_base', 'i'), ('ira_defecto', 'i'), ('ira_valor', 'i'), ('ira_verificacion', 'i'),
+    ('meta', 'q'),
+]
+
+# Campos de la sección meta
+META = ['clase', 'terminales', 'inicial']
+
+_ENCABEZADO = struct.Struct('<4sHB')   # magic, versión, orden de bytes (0=little)
+_SECCION = struct.Struct('<Q')         # cantidad de elementos
+
+
+class TablaDispersa:
+    """Tabla de enteros fila × columna empaquetada por desplazamiento de filas"""
+
+    def __init__(self, base, por_defecto, valor, verificacion):
+        self.base = base                  # array('i'): desplazamiento de cada fila
+        self.por_defecto = por_defecto    # array('i'): valor por defecto de cada fila
+        self.valor = valor                # array('i'): valores empaquetados
+        self.verificacion = verificacion  # array('i'): fila dueña de cada posición (-1 libre)
+
+    @classmethod
+    def empaquetar(cls, filas, es_defecto=lambda valor: True):
+        """
+        Empaqueta [{columna: valor}] (valores != 0). El valor más frecuente de
+        cada fila que cumpla es_defecto pasa a ser su valor por defecto.
+        """
+        n = len(filas)
+        base = array.array('i', bytes(4 * n))
+        por_defecto = array.array('i', bytes(4 * n))
+        entradas = []
+
+        for f, fila in enumerate(filas):
+            candidatos = Counter(v for v in fila.values() if es_defecto(v))
+            defecto = candidatos.most_common(1)[0][0] if candidatos else 0
+            por_defecto[f] = defecto
+            entradas.append(sorted(c for c, v in fila.items() if v != defecto))
+
+        # Primer ajuste, empezando por las filas más densas
+        valor = array.array('i')
+        verificacion = array.array('i')
+        ocupado = bytearray()
+        primer_libre = 0
+
+        # Las posiciones solo se ocupan: una fila con las mismas columnas que otra ya
+        # ubicada no cabe antes de la base de aquella y puede empezar a buscar después
+        desde_patron = {}
+
+        for f in sorted(range(n), key=lambda f: -len(entradas[f])):
+            columnas = entradas[f]
+            if not columnas:
+                continue
+
+            # Saltar directamente a las posiciones libres para la primera columna
+            primera = columnas[0]
+            patron = tuple(columnas)
+            b = max(primer_libre - primera, desde_patron.get(patron, -primera))
+            while True:
+                libre = ocupado.find(0, b + primera)
+                b = (libre if libre >= 0 else max(len(ocupado), b + primera)) - primera
+                if not any(b + c < len(ocupado) and ocupado[b + c] for c in columnas):
+                    break
+                b += 1
+
+            fin = b + columnas[-1] + 1
+            if fin > len(ocupado):
+                faltan = fin - len(ocupado)
+                ocupado.extend(bytes(faltan))
+                valor.extend([0] * faltan)
+                verificacion.extend([-1] * faltan)
+
+            fila = filas[f]
+            for c in columnas:
+                ocupado[b + c] = 1
+                valor[b + c] = fila[c]
+                verificacion[b + c] = f
+            base[f] = b
+            desde_patron[patron] = b + 1
+
+            while primer_libre < len(ocupado) and ocupado[primer_libre]:
+                primer_libre += 1
+
+        return cls(base, por_defecto, valor, verificacion)
+
+    def obtener(self, fila, columna):
+        """Valor de (fila, columna); el de la fila por defecto si no está empaquetado"""
+        i = self.base[fila] + columna
+        if 0 <= i < len(self.verificacion) and self.verificacion[i] == fila:
+            return self.valor[i]
+        return self.por_defecto[fila]
+
+    def bytes_ocupados(self):
+        """Tamaño de los arreglos en bytes"""
+        return sum(len(a) * a.itemsize
+                   for a in (self.base, self.por_defecto, self.valor, self.verificacion))
+
+
+class TablaComprimida:
+    """Tabla LALR(1) o LL(1) con símbolos numerados y filas empaquetadas"""
+
+    def __init__(self, clase, simbolos, terminales, inicial, producciones, acciones, ir_a=None):
+        self.clase = clase                # TABLA_LALR o TABLA_LL1
+        self.simbolos = simbolos          # [nombre]: terminales y luego no terminales
+        self.terminales = terminales      # cantidad de terminales
+        self.inicial = inicial            # índice del símbolo inicial
+        self.producciones = producciones  # (cabeza, longitud, símbolos) como arrays
+        self.acciones = acciones          # TablaDispersa por estado (o no terminal)
+        self.ir_a = ir_a                  # TablaDispersa por estado (solo LALR)
+        self.indices = {nombre: i for i, nombre in enumerate(simbolos)}
+
+    @staticmethod
+    def _numerar(gramatica, inicial):
+        """Numeración densa y producciones aumentadas como arrays"""
+        terminales, no_terminales = obtener_terminales_no_terminales(gramatica)
+        producciones = aumentar_gramatica(gramatica, inicial)
+        simbolos = sorted(terminales) + ['$'] + [producciones[0][0]] + list(gramatica)
+        indices = {nombre: i for i, nombre in enumerate(simbolos)}
+
+        cabeza, longitud, derecha = array.array('I'), array.array('I'), array.array('I')
+        for nt, simbolos_derecha in producciones:
+            cabeza.append(indices[nt])
+            longitud.append(len(simbolos_derecha))
+            derecha.extend(indices[s] for s in simbolos_derecha)
+
+        return simbolos, len(terminales) + 1, indices, producciones, (cabeza, longitud, derecha)
+
+    @classmethod
+    def desde_lalr(cls, tabla, gramatica):
+        """Comprime una TablaLALR de calculador_conjuntos.construir_lalr"""
+        simbolos, n_terminales, indices, producciones, arrays = cls._numerar(gramatica, tabla.inicial)
+        if producciones != tabla.producciones:
+            raise ValueError("La tabla no corresponde a la gramática")
+
+        filas_accion = []
+        for fila in tabla.acciones:
+            codificada = {}
+            for terminal, (tipo, argumento) in fila.items():
+                if tipo == 'd':
+                    codificada[indices[terminal]] = argumento + 1
+                else:
+                    codificada[indices[terminal]] = -(argumento + 1)
+            filas_accion.append(codificada)
+
+        filas_ir_a = [{indices[nt] - n_terminales: j + 1 for nt, j in fila.items()}
+                      for fila in tabla.ir_a]
+
+        # Solo las reducciones (no aceptar) pueden ser acción por defecto
+        acciones = TablaDispersa.empaquetar(filas_accion, lambda v: v < -1)
+        ir_a = TablaDispersa.empaquetar(filas_ir_a)
+        return cls(TABLA_LALR, simbolos, n_terminales, indices[tabla.inicial], arrays, acciones, ir_a)
+
+    @classmethod
+    def desde_prediccion(cls, gramatica, inicial, prediccion):
+        """Comprime la tabla LL(1) {(nt, producción): conjunto} de calcular_prediccion"""
+        simbolos, n_terminales, indices, producciones, arrays = cls._numerar(gramatica, inicial)
+        numero = {produccion: p for p, produccion in enumerate(producciones)}
+
+        # Una fila por símbolo (solo las de no terminales tienen entradas)
+        filas = [{} for _ in simbolos]
+        for (nt, produccion), conjunto in prediccion.items():
+            p = numero[(nt, tuple(s for s in produccion if s != 'ε'))]
+            fila = filas[indices[nt]]
+            for terminal in conjunto:
+                # En un conflicto LL(1) se conserva la primera producción
+                columna = indices[terminal]
+                if columna not in fila or fila[columna] > p + 1:
+                    fila[columna] = p + 1
+
+        acciones = TablaDispersa.empaquetar(filas)
+        return cls(TABLA_LL1, simbolos, n_terminales, indices[inicial], arrays, acciones)
+
+    def accion(self, estado, terminal):
+        """Acción LALR como en TablaLALR.accion: ('d', j), ('r', p), ('a', 0) o None"""
+        columna = self.indices.get(terminal)
+        if columna is None or columna >= self.terminales:
+            return None
+        codigo = self.acciones.obtener(estado, columna)
+        if codigo > 0:
+            return ('d', codigo - 1)
+        if codigo == -1:
+            return ('a', 0)
+        if codigo < 0:
+            return ('r', -codigo - 1)
+        return None
+
+    def ir(self, estado, no_terminal):
+        """Estado destino de ir_a(estado, no_terminal) o None"""
+        codigo = self.ir_a.obtener(estado, self.indices[no_terminal] - self.terminales)
+        return codigo - 1 if codigo else None
+
+    def produccion(self, no_terminal, terminal):
+        """Producción LL(1) a usar para (no_terminal, terminal) o None"""
+        columna = self.indices.get(terminal)
+        if columna is None or columna >= self.terminales:
+            return None
+        codigo = self.acciones.obtener(self.indices[no_terminal], columna)
+        return codigo - 1 if codigo else None
+
+    def describir(self, produccion):
+        """Texto de una producción: 'E -> E + T' (ε si es vacía)"""
+        cabeza, longitud, derecha = self.producciones
+        inicio = sum(longitud[:produccion])
+        simbolos = [self.simbolos[s] for s in derecha[inicio:inicio + longitud[produccion]]]
+        return f"{self.simbolos[cabeza[produccion]]} -> {' '.join(simbolos) or 'ε'}"
+
+    def bytes_ocupados(self):
+        """Tamaño de los arreglos de la tabla en bytes"""
+        total = self.acciones.bytes_ocupados()
+        if self.ir_a:
+            total += self.ir_a.bytes_ocupados()
+        return total + sum(len(a) * a.itemsize for a in self.producciones)
+
+    def a_bytes(self):
+        """Serializa la tabla al formato binario"""
+        datos = [s.encode('utf-8') for s in self.simbolos]
+        ir_a = self.ir_a or TablaDispersa(*(array.array('i') for _ in range(4)))
+        arreglos = {
+            'cadenas_longitudes': array.array('I', map(len, datos)),
+            'cadenas_datos': array.array('B', b''.join(datos)),
+            'prod_cabeza': self.producciones[0],
+            'prod_longitud': self.producciones[1],
+            'prod_simbolos': self.producciones[2],
+            'acc_base': self.acciones.base, 'acc_defecto': self.acciones.por_defecto,
+            'acc_valor': self.acciones.valor, 'acc_verificacion': self.acciones.verificacion,
+            'ira_base': ir_a.base, 'ira_defecto': ir_a.por_defecto,
+            'ira_valor': ir_a.valor, 'ira_verificacion': ir_a.verificacion,
+            'meta': array.array('q', [self.clase, self.terminales, self.inicial]),
+        }
+
+        orden = 0 if sys.byteorder == 'little' else 1
+        partes = [_ENCABEZADO.pack(MAGIC, VERSION_FORMATO, orden)]
+        for nombre, _ in SECCIONES:
+            partes.append(_SECCION.pack(len(arreglos[nombre])))
+            partes.append(arreglos[nombre].tobytes())
+        return b''.join(partes)
+
+    @classmethod
+    def desde_bytes(cls, datos):
+        """Reconstruye una tabla serializada con a_bytes"""
+        magic, version, orden = _ENCABEZADO.unpack_from(datos, 0)
+        if magic != MAGIC or version != VERSION_FORMATO:
+            raise ValueError("Formato de tabla no reconocido")
+        invertir = orden != (0 if sys.byteorder == 'little' else 1)
+
+        vista = memoryview(datos)
+        pos = _ENCABEZADO.size
+        a = {}
+        for nombre, tipo in SECCIONES:
+            (cantidad,) = _SECCION.unpack_from(datos, pos)
+            pos += _SECCION.size
+            arreglo = array.array(tipo)
+            fin = pos + cantidad * arreglo.itemsize
+            if fin > len(datos):
+                raise ValueError("Archivo de tabla truncado")
+            arreglo.frombytes(vista[pos:fin])
+            if invertir:
+                arreglo.byteswap()
+            a[nombre] = arreglo
+            pos = fin
+
+        texto = a['cadenas_datos'].tobytes()
+        inicios = list(accumulate(a['cadenas_longitudes'], initial=0))
+        simbolos = [texto[inicios[i]:inicios[i + 1]].decode('utf-8')
+                    for i in range(len(a['cadenas_longitudes']))]
+
+        meta = dict(zip(META, a['meta']))
+        acciones = TablaDispersa(a['acc_base'], a['acc_defecto'], a['acc_valor'], a['acc_verificacion'])
+        ir_a = None
+        if meta['clase'] == TABLA_LALR:
+            ir_a = TablaDispersa(a['ira_base'], a['ira_defecto'], a['ira_valor'], a['ira_verificacion'])
+        producciones = (a['prod_cabeza'], a['prod_longitud'], a['prod_simbolos'])
+        return cls(meta['clase'], simbolos, meta['terminales'], meta['inicial'],
+                   producciones, acciones, ir_a)
+
+    def guardar(self, ruta):
+        """Escribe la tabla en un archivo"""
+        with open(ruta, 'wb') as f:
+            f.write(self.a_bytes())
+
+    @classmethod
+    def cargar(cls, ruta):
+        """Lee una tabla de un archivo"""
+        with open(ruta, 'rb') as f:
+            return cls.desde_bytes(f.read())
+
+
+def tamano_profundo(objeto):
+    """Bytes aproximados de una estructura de dicts, listas, tuplas y conjuntos"""
+    vistos = set()
+    pendientes = [objeto]
+    total = 0
+    while pendientes:
+        o = pendientes.pop()
+        if id(o) in vistos:
+            continue
+        vistos.add(id(o))
+        total += sys.getsizeof(o)
+        if isinstance(o, dict):
+            pendientes.extend(o.keys())
+            pendientes.extend(o.values())
+        elif isinstance(o, (list, tuple, set, frozenset)):
+            pendientes.extend(o)
+    return total
+
+
+def main():
+    """Función principal"""
+    print("="*80)
+    print(" TABLAS DE ANÁLISIS COMPRIMIDAS ".center(80, "="))
+    print("="*80)
+
+    argumentos = [a for a in sys.argv if not a.startswith('--')]
+    opciones = dict(a[2:].partition('=')[::2] for a in sys.argv[1:] if a.startswith('--'))
+
+    if len(argumentos) < 2:
+        print("Uso: python tabla_comprimida.py gramatica.txt [--ll1] [--salida=tabla.tspt]")
+        return 1
+
+    gramatica, inicial = leer_gramatica(argumentos[1])
+
+    # Tabla de diccionarios
+    inicio = time.perf_counter()
+    if 'll1' in opciones:
+        primeros = calcular_primeros(gramatica)
+        siguientes = calcular_siguientes(gramatica, inicial, primeros)
+        tabla = calcular_prediccion(gramatica, primeros, siguientes)
+    else:
+        tabla = construir_lalr(gramatica, inicial)
+    segundos_construccion = time.perf_counter() - inicio
+    memoria_dict = tamano_profundo(tabla if 'll1' in opciones else [tabla.acciones, tabla.ir_a])
+
+    if 'll1' in opciones:
+        comprimida = TablaComprimida.desde_prediccion(gramatica, inicial, tabla)
+    else:
+        comprimida = TablaComprimida.desde_lalr(tabla, gramatica)
+
+    datos = comprimida.a_bytes()
+    inicio = time.perf_counter()
+    TablaComprimida.desde_bytes(datos)
+    segundos_carga = time.perf_counter() - inicio
+
+    print(f"\n📐 Gramática: {argumentos[1]} ({len(comprimida.simbolos)} símbolos, "
+          f"{len(comprimida.producciones[0])} producciones)")
+    print(f"  Tabla de diccionarios:   {memoria_dict / 1024:12.1f} KiB "
+          f"(construcción {segundos_construccion * 1000:.1f} ms)")
+    print(f"  Tabla comprimida:        {comprimida.bytes_ocupados() / 1024:12.1f} KiB "
+          f"(carga {segundos_carga * 1000:.1f} ms)")
+    print(f"  Archivo serializado:     {len(datos) / 1024:12.1f} KiB")
+
+    if opciones.get('salida'):
+        comprimida.guardar(opciones['salida'])
+        print(f"\n💾 Tabla guardada en {opciones['salida']}")
+    print("="*80)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
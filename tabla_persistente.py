@@ -0,0 +1,364 @@
+# tabla_persistente.py
+"""
+Tabla de símbolos persistente (inmutable) con instantáneas O(1)
+
+Cada alcance es un mapa persistente (HAMT: trie de hash con mapas de bits y
+copia de camino). Una declaración o asignación produce una nueva versión de la
+tabla copiando solo O(log n) nodos, y las versiones anteriores siguen siendo
+válidas. Una instantánea es simplemente la versión actual, por lo que puede
+guardarse, restaurarse o compartirse entre hilos sin copias ni bloqueos.
+"""
+
+from tabla_simbolos import TablaSimbolos, Simbolo
+from diagnosticos import Diagnostico, LimiteErroresAlcanzado
+
+_BITS = 5
+_MASCARA = (1 << _BITS) - 1
+_MASCARA_HASH = (1 << 64) - 1
+_AUSENTE = object()
+
+
+class _Hoja:
+    __slots__ = ('hash', 'clave', 'valor')
+
+    def __init__(self, h, clave, valor):
+        self.hash = h
+        self.clave = clave
+        self.valor = valor
+
+
+class _Colision:
+    """Claves distintas con el mismo hash"""
+    __slots__ = ('hash', 'pares')
+
+    def __init__(self, h, pares):
+        self.hash = h
+        self.pares = pares    # tupla de (clave, valor)
+
+
+class _Nodo:
+    """Nodo interno: mapa de bits de 32 posiciones y tupla compacta de hijos"""
+    __slots__ = ('mapa_bits', 'hijos')
+
+    def __init__(self, mapa_bits, hijos):
+        self.mapa_bits = mapa_bits
+        self.hijos = hijos
+
+
+def _nodo_con(entrada, desplazamiento):
+    """Nodo interno que contiene una única hoja o colisión"""
+    bit = 1 << ((entrada.hash >> desplazamiento) & _MASCARA)
+    return _Nodo(bit, (entrada,))
+
+
+def _asociar(nodo, desplazamiento, h, clave, valor):
+    """Inserta o reemplaza clave; retorna (nuevo_nodo, se_agregó)"""
+    if nodo is None:
+        return _Hoja(h, clave, valor), True
+
+    if type(nodo) is _Hoja:
+        if nodo.hash == h:
+            if nodo.clave == clave:
+                if nodo.valor is valor:
+                    return nodo, False
+                return _Hoja(h, clave, valor), False
+            return _Colision(h, ((nodo.clave, nodo.valor), (clave, valor))), True
+        # Hashes distintos: separar en un nodo interno
+        return _asociar(_nodo_con(nodo, desplazamiento), desplazamiento, h, clave, valor)
+
+    if type(nodo) is _Colision:
+        if nodo.hash == h:
+            for i, (k, _) in enumerate(nodo.pares):
+                if k == clave:
+                    pares = nodo.pares[:i] + ((clave, valor),) + nodo.pares[i + 1:]
+                    return _Colision(h, pares), False
+            return _Colision(h, nodo.pares + ((clave, valor),)), True
+        return _asociar(_nodo_con(nodo, desplazamiento), desplazamiento, h, clave, valor)
+
+    bit = 1 << ((h >> desplazamiento) & _MASCARA)
+    indice = (nodo.mapa_bits & (bit - 1)).bit_count()
+    if not nodo.mapa_bits & bit:
+        hijos = nodo.hijos[:indice] + (_Hoja(h, clave, valor),) + nodo.hijos[indice:]
+        return _Nodo(nodo.mapa_bits | bit, hijos), True
+
+    hijo, agregado = _asociar(nodo.hijos[indice], desplazamiento + _BITS, h, clave, valor)
+    if hijo is nodo.hijos[indice]:
+        return nodo, False
+    hijos = nodo.hijos[:indice] + (hijo,) + nodo.hijos[indice + 1:]
+    return _Nodo(nodo.mapa_bits, hijos), agregado
+
+
+class MapaPersistente:
+    """Mapa inmutable: asociar() retorna un mapa nuevo que comparte estructura"""
+    __slots__ = ('_raiz', '_tamano')
+
+    def __init__(self, raiz=None, tamano=0):
+        self._raiz = raiz
+        self._tamano = tamano
+
+    def asociar(self, clave, valor):
+        """Nuevo mapa con clave → valor"""
+        raiz, agregado = _asociar(self._raiz, 0, hash(clave) & _MASCARA_HASH, clave, valor)
+        if raiz is self._raiz:
+            return self
+        return MapaPersistente(raiz, self._tamano + agregado)
+
+    def obtener(self, clave, defecto=None):
+        """Valor asociado a clave, o defecto"""
+        h = hash(clave) & _MASCARA_HASH
+        nodo = self._raiz
+        desplazamiento = 0
+        while nodo is not None:
+            tipo = type(nodo)
+            if tipo is _Nodo:
+                bit = 1 << ((h >> desplazamiento) & _MASCARA)
+                if not nodo.mapa_bits & bit:
+                    return defecto
+                nodo = nodo.hijos[(nodo.mapa_bits & (bit - 1)).bit_count()]
+                desplazamiento += _BITS
+            elif tipo is _Hoja:
+                return nodo.valor if nodo.hash == h and nodo.clave == clave else defecto
+            else:
+                if nodo.hash == h:
+                    for k, v in nodo.pares:
+                        if k == clave:
+                            return v
+                return defecto
+        return defecto
+
+    def __contains__(self, clave):
+        return self.obtener(clave, _AUSENTE) is not _AUSENTE
+
+    def __len__(self):
+        return self._tamano
+
+    def items(self):
+        """Recorre los pares (clave, valor) sin recursión"""
+        pila = [self._raiz] if self._raiz is not None else []
+        while pila:
+            nodo = pila.pop()
+            tipo = type(nodo)
+            if tipo is _Nodo:
+                pila.extend(reversed(nodo.hijos))
+            elif tipo is _Hoja:
+                yield nodo.clave, nodo.valor
+            else:
+                yield from nodo.pares
+
+    def __iter__(self):
+        for clave, _ in self.items():
+            yield clave
+
+
+MAPA_VACIO = MapaPersistente()
+
+
+class VersionTabla:
+    """Versión inmutable de la tabla de símbolos"""
+    __slots__ = ('alcances', 'nivel', 'errores', 'n_errores', 'warnings', 'declaraciones')
+
+    def __init__(self, alcances, nivel, errores, n_errores, warnings, declaraciones):
+        self.alcances = alcances            # lista enlazada (mapa, resto) desde el actual
+        self.nivel = nivel                  # alcance actual (0 = global)
+        self.errores = errores              # lista enlazada (Diagnostico, resto)
+        self.n_errores = n_errores
+        self.warnings = warnings            # lista enlazada (Diagnostico, resto)
+        self.declaraciones = declaraciones  # lista enlazada (Simbolo, resto)
+
+    def reemplazar(self, **cambios):
+        """Nueva versión con algunos campos cambiados"""
+        campos = {campo: getattr(self, campo) for campo in self.__slots__}
+        campos.update(cambios)
+        return VersionTabla(**campos)
+
+
+def _lista(enlazada):
+    """Convierte una lista enlazada (último primero) en una lista en orden"""
+    elementos = []
+    while enlazada is not None:
+        elementos.append(enlazada[0])
+        enlazada = enlazada[1]
+    elementos.reverse()
+    return elementos
+
+
+def _copiar_simbolo(simbolo, **cambios):
+    """Copia de un símbolo con campos cambiados (los símbolos no se mutan)"""
+    nuevo = Simbolo(simbolo.nombre, simbolo.tipo, simbolo.alcance, simbolo.linea, simbolo.valor)
+    nuevo.usado = simbolo.usado
+    for campo, valor in cambios.items():
+        setattr(nuevo, campo, valor)
+    return nuevo
+
+
+class TablaSimbolosPersistente(TablaSimbolos):
+    """TablaSimbolos respaldada por mapas persistentes, con instantáneas O(1)"""
+
+    def __init__(self, max_errores=None):
+        self.version = VersionTabla((MAPA_VACIO, None), 0, None, 0, None, None)
+        self.max_errores = max_errores
+
+        # Contadores de operaciones (no forman parte de la versión)
+        self.busquedas = 0
+        self.fallos_busqueda = 0
+        self.entradas_alcance = 0
+        self.salidas_alcance = 0
+
+    # Instantáneas
+
+    def instantanea(self):
+        """Versión actual de la tabla (O(1), inmutable)"""
+        return self.version
+
+    def restaurar(self, version):
+        """Vuelve a una versión anterior (O(1))"""
+        self.version = version
+
+    # Vistas compatibles con TablaSimbolos
+
+    @property
+    def alcance_actual(self):
+        return self.version.nivel
+
+    @property
+    def pila_alcances(self):
+        mapas = []
+        alcances = self.version.alcances
+        while alcances is not None:
+            mapas.append(alcances[0])
+            alcances = alcances[1]
+        mapas.reverse()
+        
+        # Diccionarios en orden de declaración, como en TablaSimbolos
+        pila = [{} for _ in mapas]
+        for simbolo in _lista(self.version.declaraciones):
+            if simbolo.alcance < len(mapas):
+                actual = mapas[simbolo.alcance].obtener(simbolo.nombre)
+                if actual is not None and actual.linea == simbolo.linea:
+                    pila[simbolo.alcance][simbolo.nombre] = actual
+        return pila
+
+    @property
+    def tabla(self):
+        tabla = {}
+        for simbolo in _lista(self.version.declaraciones):
+            actual = self._buscar_declaracion(simbolo)
+            tabla.setdefault(simbolo.nombre, []).append(actual or simbolo)
+        return tabla
+
+    @property
+    def errores(self):
+        return _lista(self.version.errores)
+
+    @property
+    def warnings(self):
+        return _lista(self.version.warnings)
+
+    def _buscar_declaracion(self, simbolo):
+        """Versión vigente de una declaración si su alcance sigue activo"""
+        alcances = self.version.alcances
+        nivel = self.version.nivel
+        while alcances is not None:
+            if nivel == simbolo.alcance:
+                actual = alcances[0].obtener(simbolo.nombre)
+                if actual is not None and actual.linea == simbolo.linea:
+                    return actual
+                return None
+            alcances = alcances[1]
+            nivel -= 1
+        return None
+
+    # Operaciones
+
+    def reportar_error(self, codigo, linea, *args, columna=0):
+        """Registra un error; lanza LimiteErroresAlcanzado al llegar al máximo"""
+        v = self.version
+        self.version = v.reemplazar(errores=(Diagnostico(codigo, linea, columna, args), v.errores),
+                                    n_errores=v.n_errores + 1)
+        if self.max_errores is not None and self.version.n_errores >= self.max_errores:
+            raise LimiteErroresAlcanzado(self.max_errores)
+
+    def reportar_advertencia(self, codigo, linea, *args, columna=0):
+        v = self.version
+        self.version = v.reemplazar(warnings=(Diagnostico(codigo, linea, columna, args), v.warnings))
+
+    def limite_alcanzado(self):
+        return self.max_errores is not None and self.version.n_errores >= self.max_errores
+
+    def tiene_errores(self):
+        return self.version.n_errores > 0
+
+    def entrar_alcance(self):
+        """Crea un nuevo nivel de alcance"""
+        self.entradas_alcance += 1
+        v = self.version
+        self.version = v.reemplazar(alcances=(MAPA_VACIO, v.alcances), nivel=v.nivel + 1)
+
+    def salir_alcance(self):
+        """Sale del alcance actual y verifica variables no usadas"""
+        v = self.version
+        if v.nivel > 0:
+            self.salidas_alcance += 1
+            warnings = v.warnings
+            for nombre, simbolo in v.alcances[0].items():
+                if not simbolo.usado:
+                    warnings = (Diagnostico('W001', simbolo.linea, args=(nombre,)), warnings)
+            self.version = v.reemplazar(alcances=v.alcances[1], nivel=v.nivel - 1,
+                                        warnings=warnings)
+
+    def insertar(self, nombre, tipo, linea, valor=None, columna=0):
+        """Inserta un símbolo en el alcance actual"""
+        v = self.version
+        mapa, resto = v.alcances
+        anterior = mapa.obtener(nombre)
+        if anterior is not None:
+            self.reportar_error('E002', linea, nombre, anterior.linea, columna=columna)
+            return False
+
+        simbolo = Simbolo(nombre, tipo, v.nivel, linea, valor)
+        self.version = v.reemplazar(alcances=(mapa.asociar(nombre, simbolo), resto),
+                                    declaraciones=(simbolo, v.declaraciones))
+        return True
+
+    def buscar(self, nombre):
+        """Busca un símbolo desde el alcance actual hacia arriba"""
+        self.busquedas += 1
+        alcances = self.version.alcances
+        while alcances is not None:
+            simbolo = alcances[0].obtener(nombre)
+            if simbolo is not None:
+                return simbolo
+            alcances = alcances[1]
+        self.fallos_busqueda += 1
+        return None
+
+    def existe_en_alcance_actual(self, nombre):
+        return nombre in self.version.alcances[0]
+
+    def _actualizar(self, nombre, **cambios):
+        """Nueva versión con el símbolo visible de nombre modificado"""
+        # La búsqueda pasa por buscar (contadores y trazado)
+        simbolo = self.buscar(nombre)
+        if simbolo is None:
+            return False
+        if all(getattr(simbolo, c) is v for c, v in cambios.items()):
+            return True
+        # Copiar el camino de alcances hasta el que contiene el símbolo
+        visitados = []
+        alcances = self.version.alcances
+        while alcances[0].obtener(nombre) is not simbolo:
+            visitados.append(alcances[0])
+            alcances = alcances[1]
+        nuevo = (alcances[0].asociar(nombre, _copiar_simbolo(simbolo, **cambios)), alcances[1])
+        for mapa_superior in reversed(visitados):
+            nuevo = (mapa_superior, nuevo)
+        self.version = self.version.reemplazar(alcances=nuevo)
+        return True
+
+    def actualizar_valor(self, nombre, valor):
+        """Actualiza el valor de una variable (nueva versión)"""
+        return self._actualizar(nombre, valor=valor)
+
+    def marcar_usado(self, nombre):
+        """Marca una variable como usada (nueva versión)"""
+        self._actualizar(nombre, usado=True)
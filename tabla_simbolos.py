@@ -3,6 +3,8 @@
 Gestión de la tabla de símbolos con soporte para alcances anidados
 """
 
+from diagnosticos import Diagnostico, LimiteErroresAlcanzado
+
 class Simbolo:
     """Representa un símbolo en la tabla"""
     def __init__(self, nombre, tipo, alcance, linea, valor=None):
@@ -18,38 +20,59 @@ class Simbolo:
 
 class TablaSimbolos:
     """Tabla de símbolos con manejo de alcances"""
-    def __init__(self):
+    def __init__(self, max_errores=None):
         self.tabla = {}           # {nombre: [Simbolo]} - lista para múltiples alcances
         self.alcance_actual = 0   # nivel de alcance actual
         self.pila_alcances = [{}] # pila de diccionarios {nombre: Simbolo}
-        self.errores = []
-        self.warnings = []
+        self.errores = []         # [Diagnostico]
+        self.warnings = []        # [Diagnostico]
+        self.max_errores = max_errores  # None = sin límite
+        
+        # Contadores de operaciones
+        self.busquedas = 0
+        self.fallos_busqueda = 0
+        self.entradas_alcance = 0
+        self.salidas_alcance = 0
+    
+    def reportar_error(self, codigo, linea, *args, columna=0):
+        """Registra un error; lanza LimiteErroresAlcanzado al llegar al máximo"""
+        self.errores.append(Diagnostico(codigo, linea, columna, args))
+        if self.max_errores is not None and len(self.errores) >= self.max_errores:
+            raise LimiteErroresAlcanzado(self.max_errores)
+    
+    def reportar_advertencia(self, codigo, linea, *args, columna=0):
+        """Registra una advertencia"""
+        self.warnings.append(Diagnostico(codigo, linea, columna, args))
+    
+    def limite_alcanzado(self):
+        """Retorna True si se registró el número máximo de errores"""
+        return self.max_errores is not None and len(self.errores) >= self.max_errores
     
     def entrar_alcance(self):
         """Crea un nuevo nivel de alcance"""
+        self.entradas_alcance += 1
         self.alcance_actual += 1
         self.pila_alcances.append({})
     
     def salir_alcance(self):
         """Sale del alcance actual y verifica variables no usadas"""
         if self.alcance_actual > 0:
+            self.salidas_alcance += 1
             alcance_saliente = self.pila_alcances.pop()
             # Verificar variables no usadas
             for nombre, simbolo in alcance_saliente.items():
                 if not simbolo.usado:
                     self.warnings.append(
-                        f"Línea {simbolo.linea}: Variable '{nombre}' declarada pero no usada"
+                        Diagnostico('W001', simbolo.linea, args=(nombre,))
                     )
             self.alcance_actual -= 1
     
-    def insertar(self, nombre, tipo, linea, valor=None):
+    def insertar(self, nombre, tipo, linea, valor=None, columna=0):
         """Inserta un símbolo en el alcance actual"""
         # Verificar redeclaración en el mismo alcance
         if nombre in self.pila_alcances[self.alcance_actual]:
             simbolo_anterior = self.pila_alcances[self.alcance_actual][nombre]
-            self.errores.append(
-                f"Línea {linea}: Error semántico - Variable '{nombre}' ya declarada en línea {simbolo_anterior.linea}"
-            )
+            self.reportar_error('E002', linea, nombre, simbolo_anterior.linea, columna=columna)
             return False
         
         # Crear e insertar el símbolo
@@ -65,10 +88,12 @@ class TablaSimbolos:
     
     def buscar(self, nombre):
         """Busca un símbolo desde el alcance actual hacia arriba"""
+        self.busquedas += 1
         # Buscar desde el alcance actual hacia el global
         for i in range(self.alcance_actual, -1, -1):
             if nombre in self.pila_alcances[i]:
                 return self.pila_alcances[i][nombre]
+        self.fallos_busqueda += 1
         return None
     
     def existe(self, nombre):
@@ -103,12 +128,10 @@ class TablaSimbolos:
         if simbolo:
             simbolo.usado = True
     
-    def validar_declaracion(self, nombre, linea):
+    def validar_declaracion(self, nombre, linea, columna=0):
         """Valida que una variable esté declarada antes de usarse"""
         if not self.existe(nombre):
-            self.errores.append(
-                f"Línea {linea}: Error semántico - Variable '{nombre}' no declarada"
-            )
+            self.reportar_error('E001', linea, nombre, columna=columna)
             return False
         self.marcar_usado(nombre)
         return True
@@ -136,10 +159,12 @@ class TablaSimbolos:
         """Imprime los errores semánticos encontrados"""
         if self.errores:
             print("\n" + "="*80)
-            print(" ERRORES SEMÁNTICOS ".center(80, "="))
+            print(" ERRORES ".center(80, "="))
             print("="*80)
             for error in self.errores:
                 print(f"❌ {error}")
+            if self.limite_alcanzado():
+                print(f"⛔ Análisis detenido: se alcanzó el máximo de {self.max_errores} errores")
             print("="*80)
     
     def imprimir_warnings(self):
@@ -153,5 +178,5 @@ class TablaSimbolos:
             print("="*80)
     
     def tiene_errores(self):
-        """Retorna True si hay errores semánticos"""
+        """Retorna True si hay errores"""
         return len(self.errores) > 0
\ No newline at end of file
@@ -0,0 +1,127 @@
+# trazado.py
+"""
+Ganchos de trazado para las rutas críticas del analizador
+
+Eventos disponibles y argumentos que recibe cada suscriptor:
+- 'token':       (token)            emitido por AnalizadorLexico.siguiente_token
+- 'nodo':        (nodo)             creado por crear_nodo_operacion / crear_nodo_numero
+                                    (y sus variantes perezosas, antes de evaluar atributos)
+- 'busqueda':    (nombre, simbolo)  resultado de TablaSimbolos.buscar (None si falla),
+                                    también en TablaSimbolosPersistente
+- 'instruccion': (instruccion)      emitida por GeneradorCodigo.generar
+
+Sin suscriptores no hay ningún costo: las funciones originales están en su
+lugar. Al suscribir el primer oyente de un evento se reemplaza la función por
+una versión instrumentada, y al quitar el último se restaura la original.
+"""
+
+from contextlib import contextmanager
+
+import nodo_ast
+import analizador_completo
+from tabla_simbolos import TablaSimbolos
+from tabla_persistente import TablaSimbolosPersistente
+
+# Suscriptores activos por evento
+_suscriptores = {'token': [], 'nodo': [], 'busqueda': [], 'instruccion': []}
+
+# Funciones originales reemplazadas: {evento: [(objeto, atributo, original)]}
+_originales = {}
+
+
+def _notificar(evento, *args):
+    """Llama a todos los suscriptores de un evento"""
+    for funcion in _suscriptores[evento]:
+        funcion(*args)
+
+
+def _instrumentar_token(original):
+    def siguiente_token(self):
+        token = original(self)
+        if token is not None:
+            _notificar('token', token)
+        return token
+    return siguiente_token
+
+
+def _instrumentar_nodo(original):
+    def crear_nodo(*args, **kwargs):
+        nodo = original(*args, **kwargs)
+        _notificar('nodo', nodo)
+        return nodo
+    return crear_nodo
+
+
+def _instrumentar_busqueda(original):
+    def buscar(self, nombre):
+        simbolo = original(self, nombre)
+        _notificar('busqueda', nombre, simbolo)
+        return simbolo
+    return buscar
+
+
+def _instrumentar_instruccion(original):
+    def generar(self, instruccion):
+        original(self, instruccion)
+        _notificar('instruccion', instruccion)
+    return generar
+
+
+def _puntos(evento):
+    """Lugares donde se instala cada evento: [(objeto, atributo, instrumentador)]"""
+    if evento == 'token':
+        return [(analizador_completo.AnalizadorLexico, 'siguiente_token', _instrumentar_token)]
+    if evento == 'nodo':
+        # Importación diferida: analizador_perezoso importa también analizador_lr
+        import analizador_perezoso
+        # Las fábricas se importan por nombre: reemplazar también esas referencias
+        return [(modulo, nombre, _instrumentar_nodo)
+                for modulo in (nodo_ast, analizador_completo)
+                for nombre in ('crear_nodo_operacion', 'crear_nodo_numero')] + [
+            (analizador_perezoso, nombre, _instrumentar_nodo)
+            for nombre in ('crear_nodo_operacion_perezoso', 'crear_nodo_numero_perezoso')
+        ]
+    if evento == 'busqueda':
+        # La tabla persistente redefine buscar sin llamar a la de la base
+        return [(clase, 'buscar', _instrumentar_busqueda)
+                for clase in (TablaSimbolos, TablaSimbolosPersistente)]
+    if evento == 'instruccion':
+        return [(analizador_completo.GeneradorCodigo, 'generar', _instrumentar_instruccion)]
+    raise ValueError(f"Evento de trazado desconocido: '{evento}'")
+
+
+def suscribir(evento, funcion):
+    """Registra un suscriptor; instala la instrumentación si es el primero"""
+    puntos = _puntos(evento)
+    if not _suscriptores[evento]:
+        reemplazados = []
+        for objeto, atributo, instrumentar in puntos:
+            original = getattr(objeto, atributo)
+            setattr(objeto, atributo, instrumentar(original))
+            reemplazados.append((objeto, atributo, original))
+        _originales[evento] = reemplazados
+    _suscriptores[evento].append(funcion)
+
+
+def desuscribir(evento, funcion):
+    """Quita un suscriptor; restaura las funciones originales si era el último"""
+    _puntos(evento)
+    _suscriptores[evento].remove(funcion)
+    if not _suscriptores[evento]:
+        for objeto, atributo, original in _originales.pop(evento):
+            setattr(objeto, atributo, original)
+
+
+def activo(evento):
+    """Retorna True si el evento tiene suscriptores"""
+    return bool(_suscriptores[evento])
+
+
+@contextmanager
+def trazar(evento, funcion):
+    """Suscribe funcion a un evento durante un bloque with"""
+    suscribir(evento, funcion)
+    try:
+        yield
+    finally:
+        desuscribir(evento, funcion)
@@ -0,0 +1,284 @@
+#!/usr/bin/env python3
+# unidad_compilacion.py
+"""
+Unidades de compilación de varios archivos
+
+Cada archivo se analiza en un proceso del pool con su propia tabla de
+símbolos. Los nombres que el archivo no declara se difieren como referencias
+externas, con tipo y valor desconocidos (no se pliegan). El enlace construye
+la tabla global en el orden de los archivos. Allí reporta las redeclaraciones
+entre archivos (E004) y los usos que ninguna unidad declara (E001). El código
+enlazado empieza con las declaraciones de toda la unidad, seguidas del resto
+del código de cada archivo con sus temporales renumerados.
+
+Las declaraciones son globales a la unidad: un archivo puede usar variables
+declaradas en cualquier otro. Dentro de un mismo archivo, usar una variable
+antes de su declaración sigue siendo E001, como en el análisis de un solo
+archivo.
+"""
+
+import os
+import re
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+
+from analizador_completo import (AnalizadorLexico, AnalizadorSintactico,
+                                 reportar_errores_lexicos)
+from calculador_conjuntos import expandir_archivos
+from diagnosticos import Diagnostico, LimiteErroresAlcanzado
+from tabla_simbolos import TablaSimbolos, Simbolo
+
+_TEMPORAL = re.compile(r'\bt(\d+)\b')
+
+
+class TablaSimbolosArchivo(TablaSimbolos):
+    """Tabla de un archivo de la unidad: los nombres no declarados se difieren al enlace"""
+
+    def __init__(self, max_errores=None):
+        super().__init__(max_errores)
+        self.externas = {}        # {nombre: Simbolo} con tipo None
+        self.usos_externos = {}   # {nombre: [(linea, columna)]}
+        self.asignadas = {}       # {nombre: último valor asignado}
+
+    def buscar(self, nombre):
+        """Símbolo local visible o, si no hay, la referencia externa"""
+        simbolo = super().buscar(nombre)
+        return simbolo if simbolo is not None else self.externas.get(nombre)
+
+    def validar_declaracion(self, nombre, linea, columna=0):
+        """Marca el uso; un nombre sin declaración local queda como externo"""
+        simbolo = self.buscar(nombre)
+        if simbolo is None:
+            simbolo = self.externas[nombre] = Simbolo(nombre, None, 0, linea)
+        if simbolo.tipo is None:
+            self.usos_externos.setdefault(nombre, []).append((linea, columna))
+        simbolo.usado = True
+        return True
+
+    def actualizar_valor(self, nombre, valor):
+        self.asignadas[nombre] = valor
+        return super().actualizar_valor(nombre, valor)
+
+    def resolver_locales(self):
+        """E001 para los usos anteriores a una declaración del mismo archivo"""
+        for nombre in list(self.usos_externos):
+            if nombre in self.tabla:
+                for linea, columna in self.usos_externos.pop(nombre):
+                    self.reportar_error('E001', linea, nombre, columna=columna)
+
+
+class ResultadoArchivo:
+    """Resultado del análisis de un archivo (serializable entre procesos)"""
+
+    def __init__(self, ruta, codigo, temporales, declaraciones, externas, asignadas,
+                 errores, warnings, tokens, segundos):
+        self.ruta = ruta
+        self.codigo = codigo                # [instrucción] con temporales locales
+        self.temporales = temporales        # temporales usados (t1..tN)
+        self.declaraciones = declaraciones  # [(nombre, tipo, linea, usado)]
+        self.externas = externas            # {nombre: [(linea, columna)]}
+        self.asignadas = asignadas          # {nombre: último valor asignado}
+        self.errores = errores              # [Diagnostico]
+        self.warnings = warnings            # [Diagnostico]
+        self.tokens = tokens
+        self.segundos = segundos
+
+
+def analizar_archivo(ruta, opciones=None):
+    """Analiza un archivo de la unidad (se ejecuta en un proceso del pool)"""
+    inicio = time.perf_counter()
+    opciones = opciones or {}
+    with open(ruta, 'r', encoding='utf-8') as f:
+        entrada = f.read()
+
+    lexico = AnalizadorLexico(entrada)
+    tokens = lexico.tokenizar()
+    sintactico = AnalizadorSintactico(tokens, **opciones)
+    tabla = sintactico.tabla_simbolos = TablaSimbolosArchivo(opciones.get('max_errores'))
+    reportar_errores_lexicos(sintactico, lexico.errores)
+    sintactico.parsear()
+    try:
+        tabla.resolver_locales()
+    except LimiteErroresAlcanzado:
+        pass
+
+    return ResultadoArchivo(
+        ruta,
+        sintactico.generador.codigo_generado,
+        sintactico.generador.contador_temporal,
+        [(s.nombre, s.tipo, s.linea, s.usado)
+         for simbolos in tabla.tabla.values() for s in simbolos],
+        {nombre: usos for nombre, usos in tabla.usos_externos.items() if usos},
+        tabla.asignadas,
+        tabla.errores,
+        tabla.warnings,
+        len(tokens),
+        time.perf_counter() - inicio,
+    )
+
+
+class UnidadCompilacion:
+    """Resultado del enlace: tabla global, diagnósticos por archivo y código"""
+
+    def __init__(self, archivos):
+        self.archivos = archivos
+        self.tabla_simbolos = TablaSimbolos()
+        self.origen = {}          # {nombre: ruta del archivo que lo declara}
+        self.errores = []         # [(ruta, Diagnostico)]
+        self.warnings = []        # [(ruta, Diagnostico)]
+        self.codigo = []
+        self.procesos = 1
+        self.segundos = 0.0
+
+    def tiene_errores(self):
+        return bool(self.errores)
+
+    def obtener_codigo(self):
+        return "\n".join(self.codigo)
+
+    def imprimir_diagnosticos(self):
+        """Imprime errores y advertencias con el archivo de origen"""
+        for ruta, diagnostico in self.errores:
+            print(f"❌ {ruta}: {diagnostico}")
+        for ruta, diagnostico in self.warnings:
+            print(f"⚠️  {ruta}: {diagnostico}")
+
+
+def enlazar(resultados):
+    """Construye la tabla global, reporta conflictos entre archivos y concatena el código"""
+    unidad = UnidadCompilacion(resultados)
+    tabla = unidad.tabla_simbolos
+
+    # Declaraciones en el orden de los archivos
+    for resultado in resultados:
+        unidad.errores.extend((resultado.ruta, d) for d in resultado.errores)
+        unidad.warnings.extend((resultado.ruta, d) for d in resultado.warnings)
+        for nombre, tipo, linea, usado in resultado.declaraciones:
+            anterior = tabla.buscar(nombre)
+            if anterior is not None:
+                unidad.errores.append((resultado.ruta, Diagnostico(
+                    'E004', linea, args=(nombre, unidad.origen[nombre], anterior.linea)
+                )))
+                continue
+            tabla.insertar(nombre, tipo, linea)
+            tabla.buscar(nombre).usado = usado
+            unidad.origen[nombre] = resultado.ruta
+
+    # Usos externos y valor final (la última asignación en el orden de los archivos)
+    for resultado in resultados:
+        for nombre, usos in resultado.externas.items():
+            simbolo = tabla.buscar(nombre)
+            if simbolo is None:
+                unidad.errores.extend((resultado.ruta, Diagnostico('E001', linea, columna, (nombre,)))
+                                      for linea, columna in usos)
+            else:
+                simbolo.usado = True
+        for nombre, valor in resultado.asignadas.items():
+            tabla.actualizar_valor(nombre, valor)
+
+    # Diagnósticos del enlace junto a los de cada archivo, por archivo y línea
+    orden = {resultado.ruta: i for i, resultado in enumerate(resultados)}
+    unidad.errores.sort(key=lambda e: (orden[e[0]], e[1].linea, e[1].columna))
+
+    # Código: primero todas las declaraciones (un archivo puede usar variables de
+    # uno posterior), luego cada archivo con sus temporales desplazados
+    unidad.codigo = [f"declare {nombre} : {simbolos[0].tipo}"
+                     for nombre, simbolos in tabla.tabla.items()]
+    usuario = set(tabla.tabla)
+    desplazamiento = 0
+    for resultado in resultados:
+        codigo = [i for i in resultado.codigo if not i.startswith('declare ')]
+        unidad.codigo.extend(_renumerar(codigo, desplazamiento, usuario))
+        desplazamiento += resultado.temporales
+    return unidad
+
+
+def _renumerar(codigo, desplazamiento, usuario):
+    """Suma desplazamiento a los temporales (tN que no son variables del programa)"""
+    if not desplazamiento:
+        return codigo
+
+    def renombrar(match):
+        if match.group(0) in usuario:
+            return match.group(0)
+        return f"t{int(match.group(1)) + desplazamiento}"
+
+    return [_TEMPORAL.sub(renombrar, instruccion) for instruccion in codigo]
+
+
+def compilar_unidad(rutas, procesos=None, **opciones):
+    """
+    Analiza los archivos en un pool de procesos y los enlaza; opciones se pasan
+    a AnalizadorSintactico (max_errores, limites, dag).
+    """
+    inicio = time.perf_counter()
+    procesos = procesos or os.cpu_count() or 1
+    analizar = partial(analizar_archivo, opciones=opciones)
+
+    if procesos == 1 or len(rutas) <= 1:
+        resultados = [analizar(ruta) for ruta in rutas]
+    else:
+        # Lotes por tarea para amortizar la comunicación entre procesos
+        tamano_lote = max(1, len(rutas) // (procesos * 4))
+        with ProcessPoolExecutor(max_workers=procesos) as pool:
+            resultados = list(pool.map(analizar, rutas, chunksize=tamano_lote))
+
+    unidad = enlazar(resultados)
+    unidad.procesos = procesos
+    unidad.segundos = time.perf_counter() - inicio
+    return unidad
+
+
+def main():
+    """Función principal"""
+    opciones = {}
+    patrones = []
+    for argumento in sys.argv[1:]:
+        if argumento.startswith('--'):
+            nombre, _, valor = argumento[2:].partition('=')
+            opciones[nombre] = valor
+        else:
+            patrones.append(argumento)
+
+    rutas = expandir_archivos(patrones)
+    if not rutas:
+        print("Uso: python unidad_compilacion.py archivo|glob ... [--salida=programa.tac] "
+              "[--procesos=N] [--max-errores=N]")
+        return 1
+
+    procesos = int(opciones['procesos']) if opciones.get('procesos') else None
+    max_errores = int(opciones['max-errores']) if opciones.get('max-errores') else None
+
+    print("="*80)
+    print(" UNIDAD DE COMPILACIÓN ".center(80, "="))
+    print("="*80)
+    try:
+        unidad = compilar_unidad(rutas, procesos, max_errores=max_errores)
+    except (OSError, ValueError) as e:
+        print(f"\n❌ ERROR: {e}")
+        return 1
+
+    print(f"📄 Archivos: {len(rutas)} ({unidad.procesos} procesos, {unidad.segundos:.3f} s)")
+    for resultado in unidad.archivos:
+        print(f"   - {resultado.ruta}: {resultado.tokens} tokens, "
+              f"{len(resultado.codigo)} instrucciones, {resultado.segundos:.3f} s")
+    unidad.tabla_simbolos.imprimir()
+    unidad.imprimir_diagnosticos()
+
+    if opciones.get('salida'):
+        with open(opciones['salida'], 'w', encoding='utf-8') as f:
+            f.write(unidad.obtener_codigo() + "\n")
+        print(f"\n📄 Código escrito en {opciones['salida']}")
+
+    if unidad.tiene_errores():
+        print("\n❌ COMPILACIÓN FALLIDA")
+        return 1
+    print("\n✅ COMPILACIÓN EXITOSA")
+    print("="*80)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())